@@ -7,8 +7,12 @@ Autor: Sistema desarrollado para totama76
 
 import sys
 import os
+import time
 from pathlib import Path
 
+# Referencia del informe de arranque: lo más cerca posible del inicio del proceso
+BOOT_TIME = time.perf_counter()
+
 def main():
     """Función principal de la aplicación"""
     try:
@@ -17,6 +21,13 @@ def main():
         src_path = project_root / "src"
         sys.path.insert(0, str(src_path))
         
+        # Línea de tiempo de importaciones (como python -X importtime) hasta terminar el arranque
+        import_timeline = None
+        if '--profile-startup' in sys.argv:
+            from utils.import_timeline import ImportTimeline
+            import_timeline = ImportTimeline()
+            import_timeline.install()
+        
         # Verificar PyQt6 de forma correcta
         try:
             from PyQt6.QtCore import PYQT_VERSION_STR
@@ -26,11 +37,16 @@ def main():
             print("Ejecute: pip install PyQt6")
             return 1
         
+        # Precompilar la caché QML (paso de instalación) sin abrir la interfaz
+        if '--precompile-qml' in sys.argv:
+            from presentation.main_app import precompile_qml_cache
+            return precompile_qml_cache(sys.argv)
+        
         # Importar y ejecutar la aplicación
         from presentation.main_app import PressureControlApp
         
         print("Iniciando Sistema de Control de Presión...")
-        app = PressureControlApp(sys.argv)
+        app = PressureControlApp(sys.argv, BOOT_TIME, import_timeline)
         return app.run()
         
     except Exception as e:
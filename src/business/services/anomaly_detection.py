@@ -0,0 +1,218 @@
+"""
+Detección de anomalías en línea
+CUSUM, carta de control EWMA, varianza móvil y oscilación sobre el residuo de presión
+"""
+
+import math
+from collections import deque
+from typing import Optional, Dict, Any, List, Tuple
+
+# Detectores en orden fijo (columnas de anomaly_scores)
+DETECTOR_NAMES = ('cusum', 'ewma', 'variance', 'oscillation')
+
+_DETECTOR_LABELS = {
+    'cusum': 'deriva sostenida (posible fuga)',
+    'ewma': 'desplazamiento de la media',
+    'variance': 'aumento de la variabilidad',
+    'oscillation': 'oscilación de la presión',
+}
+
+
+class _Baseline:
+    """Media y desviación del residuo en la fase de calentamiento (Welford)"""
+
+    __slots__ = ('count', 'mean', '_m2')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self._m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+
+class CusumDetector:
+    """CUSUM bilateral normalizado por la desviación de referencia"""
+
+    __slots__ = ('k', 'h', 'high', 'low')
+
+    def __init__(self, k: float = 0.75, h: float = 10.0):
+        self.k = k  # Holgura (en desviaciones)
+        self.h = h  # Umbral de decisión (en desviaciones)
+        self.high = 0.0
+        self.low = 0.0
+
+    def update(self, z: float) -> float:
+        high = self.high + z - self.k
+        low = self.low - z - self.k
+        self.high = high if high > 0.0 else 0.0
+        self.low = low if low > 0.0 else 0.0
+        return (self.high if self.high > self.low else self.low) / self.h
+
+
+class EWMAChartDetector:
+    """Carta de control EWMA sobre el residuo normalizado"""
+
+    __slots__ = ('lam', 'limit', 'value')
+
+    def __init__(self, lam: float = 0.05, width: float = 4.0):
+        self.lam = lam
+        # Límite asintótico: L·sqrt(λ / (2 - λ)) desviaciones
+        self.limit = width * math.sqrt(lam / (2.0 - lam))
+        self.value = 0.0
+
+    def update(self, z: float) -> float:
+        self.value += self.lam * (z - self.value)
+        return abs(self.value) / self.limit
+
+
+class RollingVarianceDetector:
+    """Varianza móvil (sumas acumuladas sobre un anillo) frente a la de referencia"""
+
+    __slots__ = ('window', 'ratio', '_ring', '_index', '_count', '_sum', '_sum_sq')
+
+    def __init__(self, window: int = 60, ratio: float = 2.5):
+        self.window = max(2, window)
+        self.ratio = ratio  # Desviación móvil máxima en múltiplos de la de referencia
+        self._ring = [0.0] * self.window
+        self._index = 0
+        self._count = 0
+        self._sum = 0.0
+        self._sum_sq = 0.0
+
+    def update(self, z: float) -> float:
+        old = self._ring[self._index]
+        if self._count == self.window:
+            self._sum -= old
+            self._sum_sq -= old * old
+        else:
+            self._count += 1
+        self._ring[self._index] = z
+        self._index = (self._index + 1) % self.window
+        self._sum += z
+        self._sum_sq += z * z
+
+        if self._count < self.window:
+            return 0.0
+        mean = self._sum / self._count
+        variance = max(0.0, self._sum_sq / self._count - mean * mean)
+        return math.sqrt(variance) / self.ratio
+
+
+class OscillationDetector:
+    """Cruces completos (banda ±1 desviación) del residuo suavizado en una ventana"""
+
+    __slots__ = ('window', 'min_crossings', 'lam', '_smoothed', '_state', '_crossings', '_tick')
+
+    def __init__(self, window: int = 120, min_crossings: int = 6, lam: float = 0.3):
+        self.window = window
+        self.min_crossings = max(1, min_crossings)
+        self.lam = lam  # Suavizado previo: el ruido blanco no llega a cruzar la banda
+        self._smoothed = 0.0
+        self._state = 0  # +1 por encima de la banda, -1 por debajo
+        self._crossings: deque = deque()
+        self._tick = 0
+
+    def update(self, z: float) -> float:
+        self._tick += 1
+        self._smoothed += self.lam * (z - self._smoothed)
+
+        # Histéresis (disparador de Schmitt)
+        state = 1 if self._smoothed > 1.0 else (-1 if self._smoothed < -1.0 else 0)
+        if state and state != self._state:
+            if self._state:
+                self._crossings.append(self._tick)
+            self._state = state
+
+        crossings = self._crossings
+        while crossings and crossings[0] <= self._tick - self.window:
+            crossings.popleft()
+        return len(crossings) / self.min_crossings
+
+
+class AnomalyMonitor:
+    """Detectores de una ejecución con calentamiento, histéresis y diezmado
+
+    Cada muestra cuesta un número fijo de operaciones. Un detector dispara un
+    aviso al alcanzar puntuación 1 y se rearma al bajar de 'rearm', con un
+    mínimo de 'cooldown_s' muestras entre avisos del mismo detector.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        config = config or {}
+        cusum = config.get('cusum', {}) or {}
+        ewma = config.get('ewma', {}) or {}
+        variance = config.get('variance', {}) or {}
+        oscillation = config.get('oscillation', {}) or {}
+
+        self.warmup = int(config.get('warmup_s', 120))
+        self.rearm = float(config.get('rearm', 0.5))
+        self.cooldown = int(config.get('cooldown_s', 300))
+        self.min_std = float(config.get('min_std', 0.05))  # Evita dividir por un ruido nulo
+        self.detectors = (
+            CusumDetector(float(cusum.get('k', 0.75)), float(cusum.get('h', 10.0))),
+            EWMAChartDetector(float(ewma.get('lambda', 0.05)), float(ewma.get('width', 4.0))),
+            RollingVarianceDetector(int(variance.get('window', 60)), float(variance.get('ratio', 2.5))),
+            OscillationDetector(int(oscillation.get('window', 120)), int(oscillation.get('min_crossings', 6))),
+        )
+        self.scores = [0.0] * len(self.detectors)
+        self.max_scores = [0.0] * len(self.detectors)
+        self._armed = [True] * len(self.detectors)
+        self._last_warning = [-self.cooldown] * len(self.detectors)
+        self.samples = 0
+        self._baseline = _Baseline()
+        self._mean = 0.0
+        self._std = 1.0
+
+    @property
+    def ready(self) -> bool:
+        """True una vez terminada la fase de calentamiento"""
+        return self._baseline.count >= self.warmup
+
+    def update(self, residual: float) -> List[Tuple[str, float]]:
+        """Procesa un residuo (presión - consigna); devuelve los avisos nuevos"""
+        baseline = self._baseline
+        if baseline.count < self.warmup:
+            baseline.add(residual)
+            if baseline.count == self.warmup:
+                self._mean = baseline.mean
+                self._std = max(baseline.std, self.min_std)
+            return []
+
+        self.samples += 1
+        z = (residual - self._mean) / self._std
+        warnings = []
+        scores = self.scores
+        for position, detector in enumerate(self.detectors):
+            score = detector.update(z)
+            scores[position] = score
+            if score > self.max_scores[position]:
+                self.max_scores[position] = score
+            if self._armed[position]:
+                if score >= 1.0 and self.samples - self._last_warning[position] >= self.cooldown:
+                    self._armed[position] = False
+                    self._last_warning[position] = self.samples
+                    warnings.append((DETECTOR_NAMES[position], score))
+            elif score < self.rearm:
+                self._armed[position] = True
+        return warnings
+
+    def get_scores(self) -> Dict[str, Any]:
+        """Puntuaciones actuales y máximas por detector"""
+        return {
+            'ready': self.ready,
+            'scores': dict(zip(DETECTOR_NAMES, (round(score, 3) for score in self.scores))),
+            'max_scores': dict(zip(DETECTOR_NAMES, (round(score, 3) for score in self.max_scores)))
+        }
+
+    @staticmethod
+    def describe(detector_name: str) -> str:
+        return _DETECTOR_LABELS.get(detector_name, detector_name)
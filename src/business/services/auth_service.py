@@ -16,19 +16,28 @@ class AuthService:
     
     def login(self, username: str, password: str) -> bool:
         """Autentica un usuario"""
+        user = self.authenticate(username, password)
+        if user:
+            self.start_session(user)
+            return True
+        return False
+    
+    def authenticate(self, username: str, password: str) -> Optional[UserEntity]:
+        """Verifica las credenciales sin abrir sesión (apto para hilos de trabajo)"""
         try:
             user = self.user_repository.verify_password(username, password)
-            if user:
-                self.current_user = user
-                print(f"Usuario autenticado: {user.username} ({user.role})")
-                return True
-            
-            print("Credenciales incorrectas")
-            return False
+            if not user:
+                print("Credenciales incorrectas")
+            return user
             
         except Exception as e:
             print(f"Error en login: {e}")
-            return False
+            return None
+    
+    def start_session(self, user: UserEntity):
+        """Abre la sesión de un usuario ya verificado"""
+        self.current_user = user
+        print(f"Usuario autenticado: {user.username} ({user.role})")
     
     def logout(self):
         """Cierra la sesión del usuario actual"""
@@ -0,0 +1,366 @@
+"""
+Ejecución de programa en una cámara
+Máquina de estados independiente (setup/running) sin dependencias de Qt
+"""
+
+import random
+from datetime import datetime
+from typing import Optional, Dict, Any, Callable
+
+from data.entities.execution_entity import ExecutionEntity
+from data.entities.program_entity import ProgramEntity
+from hardware.pressure_sources import PressureSource, SimulatedPressureSource
+from .program_profile import CompiledProfile, compile_profile
+
+
+class ChamberEventListener:
+    """Receptor de eventos de una cámara (implementación vacía por defecto)"""
+
+    def on_phase_changed(self, chamber: 'ChamberExecution', phase: str):
+        pass
+
+    def on_status(self, chamber: 'ChamberExecution', message: str):
+        pass
+
+    def on_progress(self, chamber: 'ChamberExecution', elapsed: int, remaining: int, percentage: int):
+        pass
+
+    def on_alarm(self, chamber: 'ChamberExecution', alarm_type: str, message: str):
+        pass
+
+    def on_pressure(self, chamber: 'ChamberExecution', pressure: float):
+        pass
+
+    def on_completed(self, chamber: 'ChamberExecution'):
+        pass
+
+
+class ChamberExecution:
+    """Estado y lógica de control de una ejecución en una cámara"""
+
+    def __init__(self, chamber_id: int, sensor_channel: Optional[int] = None,
+                 listener: Optional[ChamberEventListener] = None,
+                 clock: Optional[Callable[[], datetime]] = None,
+                 rng: Optional[random.Random] = None, seed: Optional[int] = None,
+                 pressure_source: Optional[PressureSource] = None):
+        self.chamber_id = chamber_id
+        # Canal del sensor de presión asociado (por defecto, el número de cámara)
+        self.sensor_channel = sensor_channel if sensor_channel is not None else chamber_id
+        self.listener = listener or ChamberEventListener()
+        # Reloj y generador inyectables (reloj virtual y semilla en simulación)
+        self.clock = clock or datetime.now
+        self.rng = rng or random.Random()
+        # Semilla fija: cada ejecución reproduce la misma secuencia
+        self.seed = seed
+        # Los mensajes de estado por tick se pueden omitir si nadie los muestra
+        self.status_messages = True
+        # Adquisición de presión (modelo simulado, sensor real o repetición grabada)
+        self.pressure_source = pressure_source or SimulatedPressureSource()
+
+        self.current_execution: Optional[ExecutionEntity] = None
+        self.current_program: Optional[ProgramEntity] = None
+        self.profile: Optional[CompiledProfile] = None
+        self.reset()
+
+    def reset(self):
+        """Reinicia el estado de ejecución de la cámara"""
+        self.current_execution = None
+        self.current_program = None
+        self.profile = None
+        self.is_running = False
+        self.start_time: Optional[datetime] = None
+        self.elapsed_seconds = 0
+        self.program_elapsed_seconds = 0
+        self.current_pressure = 0.0
+        self.target_pressure = 0.0
+        # Banda de alarma del segundo actual (del perfil compilado)
+        self.band_low = 0.0
+        self.band_high = 0.0
+        self.pressure_increment = 0.0
+        self.execution_phase = "setup"  # 'setup', 'running', 'completed'
+        self.min_pressure_reached = False
+        self.program_start_time: Optional[datetime] = None
+        # Estado de alarma propio de la cámara
+        self.alarm_active = False
+        self.alarm_count = 0
+        self._completed = False
+
+    def start(self, execution: ExecutionEntity, program: ProgramEntity,
+              profile: Optional[CompiledProfile] = None):
+        """Configura la cámara para una nueva ejecución (perfil precompilado opcional)"""
+        self.reset()
+        self.current_execution = execution
+        self.current_program = program
+        self.profile = profile or compile_profile(program)
+        self.is_running = True
+        self.start_time = self.clock()
+        self.target_pressure = program.min_pressure
+        if self.seed is not None:
+            self.rng.seed(self.seed)
+
+        # Incremento de presión para alcanzar la presión mínima en el tiempo especificado
+        if program.time_to_min_pressure > 0:
+            self.pressure_increment = program.min_pressure / (program.time_to_min_pressure * 60)  # PSI por segundo
+        else:
+            self.pressure_increment = 1.0
+
+        self.execution_phase = "setup"
+        self.listener.on_phase_changed(self, "setup")
+        self.listener.on_status(self, f"Iniciando programa: {program.name} - Subiendo a presión mínima...")
+
+    def attach(self, execution: ExecutionEntity, program: ProgramEntity,
+               profile: Optional[CompiledProfile] = None):
+        """Asocia una ejecución sin arrancar el control local (cámara espejo de un proceso externo)"""
+        self.reset()
+        self.current_execution = execution
+        self.current_program = program
+        self.profile = profile or compile_profile(program)
+        self.is_running = True
+        self.start_time = execution.start_time or self.clock()
+        self.min_pressure_reached = execution.min_pressure_reached
+        self.execution_phase = "running" if execution.min_pressure_reached else "setup"
+        if self.min_pressure_reached:
+            self.sync_setpoint()
+
+    def resume(self, execution: ExecutionEntity, program: ProgramEntity):
+        """Restaura el estado de una ejecución interrumpida"""
+        self.reset()
+        self.current_execution = execution
+        self.current_program = program
+        self.profile = compile_profile(program)
+        self.is_running = True
+        self.start_time = execution.start_time
+
+        elapsed_time = self.clock() - execution.start_time
+        self.elapsed_seconds = int(elapsed_time.total_seconds())
+
+        if program.time_to_min_pressure > 0:
+            self.pressure_increment = program.min_pressure / (program.time_to_min_pressure * 60)
+        else:
+            self.pressure_increment = 1.0
+
+        # Configurar estado según el progreso
+        if execution.min_pressure_reached:
+            self.execution_phase = "running"
+            self.min_pressure_reached = True
+            self.program_start_time = execution.start_time  # Aproximación
+            self.program_elapsed_seconds = max(0, self.elapsed_seconds - self.profile.setup_seconds)
+            # Presión aproximada: la consigna del perfil en ese punto
+            self.sync_setpoint()
+            self.current_pressure = self.target_pressure
+        else:
+            self.execution_phase = "setup"
+            progress = min(1.0, self.elapsed_seconds / self.profile.setup_seconds)
+            self.current_pressure = program.min_pressure * progress
+
+        self.listener.on_phase_changed(self, self.execution_phase)
+        self.listener.on_status(self, f"Resumiendo ejecución del programa: {program.name}")
+
+    def current_profile_second(self) -> int:
+        """Segundo de ejecución (base 0) de la última muestra evaluada"""
+        return max(0, self.program_elapsed_seconds - 1)
+
+    def sync_setpoint(self):
+        """Fija consigna y banda del segundo de perfil actual (reanudación y cámaras espejo)"""
+        index = self.profile.index(self.current_profile_second())
+        self.target_pressure = self.profile.setpoint[index]
+        self.band_low = self.profile.low[index]
+        self.band_high = self.profile.high[index]
+
+    def step(self, pressure: Optional[float] = None):
+        """Avanza un tick de control (1 segundo)
+
+        Sin presión se lee de la fuente; el canal de telemetría la pasa ya
+        adquirida y acondicionada para medir cada etapa por separado.
+        """
+        if not self.is_running or not self.current_program or not self.current_execution:
+            return
+
+        if pressure is None:
+            pressure = self.pressure_source.read(self)
+            if pressure is None:
+                return
+
+        self.elapsed_seconds += 1
+        self.current_pressure = pressure
+
+        if self.execution_phase == "setup":
+            self._handle_setup_phase()
+        elif self.execution_phase == "running":
+            self._handle_running_phase()
+
+        self.listener.on_pressure(self, self.current_pressure)
+
+        if self._completed:
+            self._completed = False
+            self.listener.on_completed(self)
+
+    def _raise_alarm(self, message: str):
+        """Activa la alarma roja de la cámara"""
+        self.alarm_active = True
+        self.alarm_count += 1
+        self.listener.on_alarm(self, "red", message)
+
+    def _handle_setup_phase(self):
+        """Maneja la fase de setup (subida a presión mínima)"""
+        program = self.current_program
+        time_to_min_seconds = self.profile.setup_seconds
+
+        # Verificar si se alcanzó la presión mínima
+        if self.current_pressure >= program.min_pressure and not self.min_pressure_reached:
+            self.min_pressure_reached = True
+            self.current_execution.min_pressure_reached = True
+            self.program_start_time = self.clock()
+            self.target_pressure = self.profile.setpoint[0]
+            self.band_low = self.profile.low[0]
+            self.band_high = self.profile.high[0]
+            self.execution_phase = "running"
+            self.alarm_active = False
+            self.listener.on_phase_changed(self, "running")
+            self.listener.on_status(self, "Presión mínima alcanzada - Iniciando programa...")
+            return
+
+        # Verificar timeout para alcanzar presión mínima
+        if self.elapsed_seconds >= time_to_min_seconds:
+            alarm_msg = f"ALARMA: No se alcanzó presión mínima ({program.min_pressure} PSI) en {program.time_to_min_pressure} min"
+            self._raise_alarm(alarm_msg)
+            self.listener.on_status(self, alarm_msg)
+
+        # Actualizar progreso en fase setup
+        progress_percentage = min(100, int((self.current_pressure / program.min_pressure) * 100)) if program.min_pressure > 0 else 100
+        remaining_setup = max(0, time_to_min_seconds - self.elapsed_seconds)
+
+        self.listener.on_progress(self, self.elapsed_seconds, remaining_setup, progress_percentage)
+
+        if not self.status_messages:
+            return
+
+        setup_msg = f"Subiendo presión: {self.current_pressure:.1f}/{program.min_pressure} PSI"
+        setup_msg += f" | Tiempo: {self.elapsed_seconds//60:02d}:{self.elapsed_seconds%60:02d}"
+        setup_msg += f" | Restante: {remaining_setup//60:02d}:{remaining_setup%60:02d}"
+        self.listener.on_status(self, setup_msg)
+
+    def _handle_running_phase(self):
+        """Maneja la fase de running (programa en ejecución)"""
+        if not self.program_start_time:
+            return
+
+        profile = self.profile
+
+        # Un tick = un segundo de programa; este tick evalúa el segundo
+        # program_elapsed_seconds (base 0) y después lo cuenta como transcurrido
+        index = profile.index(self.program_elapsed_seconds)
+        self.program_elapsed_seconds += 1
+        self.target_pressure = profile.setpoint[index]
+        self.band_low = low = profile.low[index]
+        self.band_high = high = profile.high[index]
+
+        remaining_seconds = profile.remaining(self.program_elapsed_seconds)
+        progress_percentage = profile.progress(self.program_elapsed_seconds)
+
+        pressure_ok = True
+
+        if self.current_pressure < low:
+            alarm_msg = f"ALARMA: Presión por debajo del mínimo ({self.current_pressure:.1f} < {low} PSI)"
+            self._raise_alarm(alarm_msg)
+            pressure_ok = False
+
+        elif self.current_pressure > high:
+            alarm_msg = f"ALARMA: Presión por encima del máximo ({self.current_pressure:.1f} > {high} PSI)"
+            self._raise_alarm(alarm_msg)
+            self.current_execution.max_pressure_exceeded = True
+            pressure_ok = False
+
+        if pressure_ok:
+            self.alarm_active = False
+
+        self.listener.on_progress(self, self.program_elapsed_seconds, remaining_seconds, progress_percentage)
+
+        # Verificar fin de programa (se notifica al final del tick)
+        if self.program_elapsed_seconds >= profile.running_seconds:
+            self._completed = True
+
+        if not self.status_messages:
+            return
+
+        # Actualizar mensaje de estado
+        minutes_elapsed = self.program_elapsed_seconds // 60
+        seconds_elapsed = self.program_elapsed_seconds % 60
+        minutes_remaining = remaining_seconds // 60
+        seconds_remaining = remaining_seconds % 60
+
+        status_msg = f"EJECUTANDO: {minutes_elapsed:02d}:{seconds_elapsed:02d} / "
+        status_msg += f"Restante: {minutes_remaining:02d}:{seconds_remaining:02d} / "
+        status_msg += f"Presión: {self.current_pressure:.1f} PSI"
+
+        if not pressure_ok:
+            status_msg += " ⚠️ ALARMA"
+
+        self.listener.on_status(self, status_msg)
+
+    def get_info(self) -> Dict[str, Any]:
+        """Obtiene información de la ejecución de la cámara"""
+        if not self.is_running or not self.current_execution or not self.current_program:
+            return {
+                'chamber_id': self.chamber_id,
+                'is_running': False,
+                'execution_id': None,
+                'program_name': None,
+                'elapsed_seconds': 0,
+                'current_pressure': 0.0,
+                'phase': 'setup'
+            }
+
+        return {
+            'chamber_id': self.chamber_id,
+            'is_running': True,
+            'execution_id': self.current_execution.id,
+            'program_name': self.current_program.name,
+            'elapsed_seconds': self.program_elapsed_seconds if self.execution_phase == "running" else self.elapsed_seconds,
+            'current_pressure': self.current_pressure,
+            'program_duration': self.profile.running_seconds,
+            'min_pressure': self.current_program.min_pressure,
+            'max_pressure': self.current_program.max_pressure,
+            'target_pressure': self.target_pressure,
+            'band_low': self.band_low,
+            'band_high': self.band_high,
+            'segment': self.profile.segment_at(self.current_profile_second()),
+            'segment_count': len(self.current_program.segments),
+            'phase': self.execution_phase,
+            'min_pressure_reached': self.min_pressure_reached,
+            'alarm_active': self.alarm_active
+        }
+
+    def get_telemetry(self) -> Dict[str, Any]:
+        """Instantánea numérica para la interfaz (el formato de texto lo aplica QML)"""
+        if not self.is_running or not self.profile or not self.current_program:
+            return {'chamber_id': self.chamber_id, 'is_running': False}
+
+        profile = self.profile
+        if self.execution_phase == "running":
+            elapsed = self.program_elapsed_seconds
+            remaining = profile.remaining(elapsed)
+            percentage = profile.progress(elapsed)
+            index = profile.index(self.current_profile_second())
+        else:
+            min_pressure = self.current_program.min_pressure
+            elapsed = self.elapsed_seconds
+            remaining = max(0, profile.setup_seconds - elapsed)
+            percentage = min(100, int(self.current_pressure / min_pressure * 100)) if min_pressure > 0 else 100
+            index = 0
+
+        return {
+            'chamber_id': self.chamber_id,
+            'is_running': True,
+            'phase': self.execution_phase,
+            'pressure': self.current_pressure,
+            'target_pressure': profile.setpoint[index],
+            'band_low': profile.low[index],
+            'band_high': profile.high[index],
+            'min_pressure': self.current_program.min_pressure,
+            'elapsed_seconds': elapsed,
+            'remaining_seconds': remaining,
+            'progress': percentage,
+            'segment': profile.segment_at(self.current_profile_second()),
+            'alarm_active': self.alarm_active
+        }
@@ -0,0 +1,251 @@
+"""
+Reducción de series de presión para gráficas de historial
+LTTB y mínimo/máximo por columna sobre la serie grabada, con caché por ejecución
+"""
+
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Sequence, Tuple
+from data.repositories.execution_repository import ExecutionRepository
+from .event_bus import EventBus, EXECUTION_UPDATED, EXECUTION_FINISHED
+
+# NumPy es opcional: sin él, las series se reducen con bucles de Python
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+METHOD_LTTB = 'lttb'
+METHOD_MINMAX = 'minmax'
+
+
+def _bucket_edges(start: int, stop: int, buckets: int) -> List[int]:
+    """Límites de 'buckets' tramos casi iguales en [start, stop)"""
+    size = (stop - start) / buckets
+    return [start + int(i * size) for i in range(buckets)] + [stop]
+
+
+def lttb_indices(values: Sequence[float], threshold: int) -> List[int]:
+    """Índices elegidos por Largest-Triangle-Three-Buckets (eje x = índice de muestra)
+
+    Conserva el primer y el último punto y, en cada tramo intermedio, el
+    punto que forma el triángulo de mayor área con el punto elegido en el
+    tramo anterior y la media del tramo siguiente.
+    """
+    count = len(values)
+    if threshold >= count or threshold < 3:
+        return list(range(count))
+
+    edges = _bucket_edges(1, count - 1, threshold - 2)
+    if np is not None:
+        return _lttb_numpy(np.asarray(values, dtype=float), edges)
+
+    # Medias de cada tramo a partir de sumas acumuladas
+    prefix = [0.0]
+    for value in values:
+        prefix.append(prefix[-1] + value)
+
+    selected = [0]
+    anchor = 0
+    for bucket in range(len(edges) - 1):
+        low, high = edges[bucket], edges[bucket + 1]
+        next_low = high
+        next_high = edges[bucket + 2] if bucket + 2 < len(edges) else count
+        avg_x = (next_low + next_high - 1) / 2.0
+        avg_y = (prefix[next_high] - prefix[next_low]) / (next_high - next_low)
+        anchor_y = values[anchor]
+
+        best, best_area = low, -1.0
+        for index in range(low, high):
+            area = abs((anchor - avg_x) * (values[index] - anchor_y) - (anchor - index) * (avg_y - anchor_y))
+            if area > best_area:
+                best, best_area = index, area
+        selected.append(best)
+        anchor = best
+
+    selected.append(count - 1)
+    return selected
+
+
+def _lttb_numpy(values, edges: List[int]) -> List[int]:
+    count = len(values)
+    prefix = np.concatenate(([0.0], np.cumsum(values)))
+    positions = np.arange(count, dtype=float)
+
+    selected = [0]
+    anchor = 0
+    for bucket in range(len(edges) - 1):
+        low, high = edges[bucket], edges[bucket + 1]
+        next_low = high
+        next_high = edges[bucket + 2] if bucket + 2 < len(edges) else count
+        avg_x = (next_low + next_high - 1) / 2.0
+        avg_y = (prefix[next_high] - prefix[next_low]) / (next_high - next_low)
+        anchor_y = values[anchor]
+
+        areas = np.abs((anchor - avg_x) * (values[low:high] - anchor_y)
+                       - (anchor - positions[low:high]) * (avg_y - anchor_y))
+        anchor = low + int(areas.argmax())
+        selected.append(anchor)
+
+    selected.append(count - 1)
+    return selected
+
+
+def minmax_indices(values: Sequence[float], buckets: int) -> List[int]:
+    """Índices del mínimo y el máximo de cada tramo, en orden temporal"""
+    count = len(values)
+    if buckets * 2 >= count or buckets < 1:
+        return list(range(count))
+
+    edges = _bucket_edges(0, count, buckets)
+    if np is not None:
+        # Mismos tramos que el bucle de Python (buckets*2 < count: ninguno vacío)
+        block = np.asarray(values, dtype=float)
+        starts = np.asarray(edges[:-1])
+        bucket_of = np.repeat(np.arange(buckets), np.diff(edges))
+        # Primera muestra de cada tramo que iguala su mínimo / máximo (como el bucle)
+        lows = np.flatnonzero(block == np.minimum.reduceat(block, starts)[bucket_of])
+        highs = np.flatnonzero(block == np.maximum.reduceat(block, starts)[bucket_of])
+        lows = lows[np.unique(bucket_of[lows], return_index=True)[1]]
+        highs = highs[np.unique(bucket_of[highs], return_index=True)[1]]
+        pairs = np.sort(np.stack((lows, highs), axis=1), axis=1).ravel()
+        # Tramos planos: mínimo y máximo son la misma muestra
+        keep = np.concatenate(([True], pairs[1:] != pairs[:-1]))
+        return pairs[keep].tolist()
+
+    selected = []
+    for bucket in range(buckets):
+        low, high = edges[bucket], edges[bucket + 1]
+        if low >= high:
+            continue
+        lowest = highest = low
+        for index in range(low + 1, high):
+            if values[index] < values[lowest]:
+                lowest = index
+            elif values[index] > values[highest]:
+                highest = index
+        selected.extend(sorted({lowest, highest}))
+    return selected
+
+
+class DownsamplingService:
+    """Series de ejecuciones reducidas al ancho de la gráfica
+
+    La serie completa de cada ejecución se lee una vez (una lectura por
+    segundo: el índice es el segundo de ejecución) y se guarda en una caché
+    LRU; cada consulta recorta el intervalo visible y lo reduce a 'width'
+    puntos (LTTB) o 'width' columnas mínimo/máximo. Los resultados también
+    se guardan por (ejecución, intervalo, ancho, método), así que volver a
+    un zoom ya visto no recalcula nada. Las ejecuciones en curso no se
+    guardan en caché porque siguen recibiendo lecturas.
+
+    Puede llamarse desde los hilos de trabajo de la interfaz.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        config = config or {}
+        self.execution_repository = ExecutionRepository()
+        self.max_series = max(1, int(config.get('cache_series', 4)))
+        self.max_results = max(1, int(config.get('cache_results', 64)))
+        self.default_method = config.get('method', METHOD_LTTB)
+        self._lock = threading.Lock()
+        self._series: 'OrderedDict[int, array]' = OrderedDict()
+        self._results: 'OrderedDict[Tuple[int, int, int, int, str], Dict[str, Any]]' = OrderedDict()
+        self.series_loads = 0
+        self.result_hits = 0
+
+        bus = EventBus()
+        bus.subscribe(EXECUTION_UPDATED, self._on_execution_changed)
+        bus.subscribe(EXECUTION_FINISHED, self._on_execution_changed)
+
+    def _on_execution_changed(self, execution_id: int, **_):
+        self.invalidate(execution_id)
+
+    def invalidate(self, execution_id: int):
+        """Descarta la serie y los resultados de una ejecución"""
+        with self._lock:
+            self._series.pop(execution_id, None)
+            for key in [key for key in self._results if key[0] == execution_id]:
+                del self._results[key]
+
+    def _load_series(self, execution_id: int) -> Tuple[array, bool]:
+        """Serie completa de la ejecución y si puede guardarse en caché"""
+        with self._lock:
+            values = self._series.get(execution_id)
+            if values is not None:
+                self._series.move_to_end(execution_id)
+                return values, True
+
+        execution = self.execution_repository.get_execution_by_id(execution_id)
+        values = self.execution_repository.get_pressure_values(execution_id)
+        self.series_loads += 1
+        cacheable = execution is not None and execution.status != 'running'
+        if cacheable:
+            with self._lock:
+                self._series[execution_id] = values
+                while len(self._series) > self.max_series:
+                    self._series.popitem(last=False)
+        return values, cacheable
+
+    def get_series(self, execution_id: int, start: int = 0, end: int = 0,
+                   width: int = 800, method: Optional[str] = None) -> Dict[str, Any]:
+        """Puntos a dibujar del intervalo [start, end) en segundos (end <= 0 = hasta el final)"""
+        try:
+            method = method or self.default_method
+            if method not in (METHOD_LTTB, METHOD_MINMAX):
+                return {
+                    'success': False,
+                    'message': f"Método de reducción desconocido: {method}"
+                }
+            width = max(3, int(width))
+            key = (execution_id, int(start), int(end), width, method)
+            with self._lock:
+                cached = self._results.get(key)
+                if cached is not None:
+                    self._results.move_to_end(key)
+                    self.result_hits += 1
+                    return cached
+
+            values, cacheable = self._load_series(execution_id)
+            total = len(values)
+            first = max(0, min(int(start), total))
+            last = total if end <= 0 else max(first, min(int(end), total))
+            window = values[first:last]
+
+            if method == METHOD_LTTB:
+                indices = lttb_indices(window, width)
+            else:
+                indices = minmax_indices(window, width)
+
+            result = {
+                'success': True,
+                'execution_id': execution_id,
+                'method': method,
+                'start': first,
+                'end': last,
+                'total': total,
+                'x': [first + index for index in indices],
+                'y': [window[index] for index in indices]
+            }
+            if cacheable:
+                with self._lock:
+                    self._results[key] = result
+                    while len(self._results) > self.max_results:
+                        self._results.popitem(last=False)
+            return result
+
+        except Exception as e:
+            print(f"Error reduciendo la serie de la ejecución {execution_id}: {e}")
+            return {
+                'success': False,
+                'message': 'Error interno del sistema'
+            }
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            'cached_series': len(self._series),
+            'cached_results': len(self._results),
+            'series_loads': self.series_loads,
+            'result_hits': self.result_hits
+        }
@@ -0,0 +1,216 @@
+"""
+Servicio de envolvente de referencia
+Curva esperada por programa (mediana y percentiles de ejecuciones completadas)
+"""
+
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Sequence, Tuple
+
+from data.repositories.execution_repository import ExecutionRepository
+
+
+class ReferenceEnvelope:
+    """Percentiles por segundo de las ejecuciones de un programa
+
+    bands[k][i] es el cuantil quantiles[k] en el segundo i desde el inicio de la
+    ejecución. La desviación y el rango percentil de una muestra se obtienen por
+    índice, con un coste fijo que solo depende del número de cuantiles.
+    """
+
+    __slots__ = ('quantiles', 'bands', 'length', 'run_count', '_median')
+
+    def __init__(self, quantiles: Sequence[float], bands: List[array], run_count: int):
+        self.quantiles = tuple(quantiles)
+        self.bands = bands
+        self.length = len(bands[0]) if bands else 0
+        self.run_count = run_count
+        # Cuantil más cercano a la mediana
+        self._median = min(range(len(self.quantiles)), key=lambda k: abs(self.quantiles[k] - 0.5))
+
+    def covers(self, index: int) -> bool:
+        """Indica si la envolvente tiene datos para ese segundo"""
+        return 0 <= index < self.length
+
+    def median(self, index: int) -> float:
+        return self.bands[self._median][index]
+
+    def deviation(self, index: int, pressure: float) -> float:
+        """Desviación respecto a la mediana histórica"""
+        return pressure - self.bands[self._median][index]
+
+    def percentile_rank(self, index: int, pressure: float) -> float:
+        """Rango percentil aproximado (0-100) interpolando entre cuantiles"""
+        bands = self.bands
+        quantiles = self.quantiles
+        lower = bands[0][index]
+        if pressure <= lower:
+            return 0.0 if pressure < lower else quantiles[0] * 100.0
+
+        for k in range(1, len(quantiles)):
+            upper = bands[k][index]
+            if pressure <= upper:
+                if upper == lower:
+                    return quantiles[k] * 100.0
+                fraction = (pressure - lower) / (upper - lower)
+                return (quantiles[k - 1] + (quantiles[k] - quantiles[k - 1]) * fraction) * 100.0
+            lower = upper
+
+        return 100.0
+
+    def is_outside(self, index: int, pressure: float) -> bool:
+        """True si la muestra queda fuera de los cuantiles extremos"""
+        return pressure < self.bands[0][index] or pressure > self.bands[-1][index]
+
+    def to_dict(self, step: int = 1) -> Dict[str, Any]:
+        """Convierte la envolvente a diccionario (submuestreada cada 'step' segundos)"""
+        step = max(1, step)
+        return {
+            'quantiles': list(self.quantiles),
+            'run_count': self.run_count,
+            'length': self.length,
+            'step': step,
+            'bands': [list(band[::step]) for band in self.bands]
+        }
+
+
+def _quantile(sorted_values: List[float], quantile: float) -> float:
+    """Cuantil con interpolación lineal sobre valores ordenados"""
+    position = (len(sorted_values) - 1) * quantile
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    fraction = position - lower
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction
+
+
+def build_envelope(runs: Sequence[array], quantiles: Sequence[float]) -> Optional[ReferenceEnvelope]:
+    """Calcula la envolvente de un conjunto de series alineadas por segundo"""
+    if not runs:
+        return None
+
+    length = max(len(run) for run in runs)
+    bands = [array('d', bytes(8 * length)) for _ in quantiles]
+    column: List[float] = []
+
+    for index in range(length):
+        column.clear()
+        for run in runs:
+            if index < len(run):
+                column.append(run[index])
+        column.sort()
+        for k, quantile in enumerate(quantiles):
+            bands[k][index] = _quantile(column, quantile)
+
+    return ReferenceEnvelope(quantiles, bands, len(runs))
+
+
+class EnvelopeService:
+    """Caché de envolventes por programa con actualización incremental
+
+    La carga de las series y el cálculo de cuantiles son lentos (decenas de
+    ejecuciones de horas de duración): get_envelope y on_execution_completed
+    están pensados para los hilos de trabajo. La caché se protege con un
+    cerrojo que solo se toma para leerla o sustituir entradas, nunca durante
+    la carga o el cálculo; cached() no bloquea y sirve al hilo de control.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        config = config or {}
+        self.execution_repository = ExecutionRepository()
+        self.max_runs = max(1, int(config.get('max_runs', 20)))
+        self.min_runs = max(1, int(config.get('min_runs', 3)))
+        self.quantiles = tuple(sorted(float(q) for q in config.get('quantiles', (0.1, 0.5, 0.9))))
+        self.max_programs = int(config.get('cache_programs', 16))
+        # program_id -> (series por ejecución, envolvente); orden LRU
+        self._cache: 'OrderedDict[int, Tuple[OrderedDict, Optional[ReferenceEnvelope]]]' = OrderedDict()
+        self._lock = threading.Lock()
+        # Se incrementa al invalidar: un cálculo iniciado antes no se guarda
+        self._generation: Dict[int, int] = {}
+
+    def _load_runs(self, program_id: int) -> OrderedDict:
+        """Carga las series de las últimas ejecuciones completadas"""
+        runs = OrderedDict()
+        execution_ids = self.execution_repository.get_completed_execution_ids(program_id, self.max_runs)
+        for execution_id in reversed(execution_ids):  # De la más antigua a la más reciente
+            values = self.execution_repository.get_pressure_values(execution_id)
+            if values:
+                runs[execution_id] = values
+        return runs
+
+    def _build(self, runs: OrderedDict) -> Optional[ReferenceEnvelope]:
+        return build_envelope(list(runs.values()), self.quantiles) if len(runs) >= self.min_runs else None
+
+    def _store(self, program_id: int, runs: OrderedDict, envelope: Optional[ReferenceEnvelope],
+               generation: int) -> bool:
+        """Guarda la envolvente en la caché si el programa no se invalidó entretanto"""
+        with self._lock:
+            if self._generation.get(program_id, 0) != generation:
+                return False
+            self._cache[program_id] = (runs, envelope)
+            self._cache.move_to_end(program_id)
+            while len(self._cache) > self.max_programs:
+                self._cache.popitem(last=False)
+            return True
+
+    def cached(self, program_id: int) -> Tuple[bool, Optional[ReferenceEnvelope]]:
+        """(está en caché, envolvente) sin cargar nada; apto para el hilo de control"""
+        with self._lock:
+            entry = self._cache.get(program_id)
+            if entry is None:
+                return False, None
+            self._cache.move_to_end(program_id)
+            return True, entry[1]
+
+    def get_envelope(self, program_id: int) -> Optional[ReferenceEnvelope]:
+        """Obtiene la envolvente de un programa (None si no hay historial suficiente)
+
+        Sin caché carga y calcula en el hilo llamante: usar desde un hilo de trabajo.
+        """
+        try:
+            found, envelope = self.cached(program_id)
+            if found:
+                return envelope
+
+            with self._lock:
+                generation = self._generation.get(program_id, 0)
+            runs = self._load_runs(program_id)
+            envelope = self._build(runs)
+            self._store(program_id, runs, envelope, generation)
+            return envelope
+
+        except Exception as e:
+            print(f"Error calculando envolvente del programa {program_id}: {e}")
+            return None
+
+    def on_execution_completed(self, program_id: int, execution_id: int):
+        """Incorpora una ejecución completada leyendo solo sus lecturas (hilo de trabajo)"""
+        try:
+            with self._lock:
+                cached = self._cache.get(program_id)
+                if cached is None or execution_id in cached[0]:
+                    # Sin caché previa se construirá completa en la próxima consulta
+                    return
+                generation = self._generation.get(program_id, 0)
+                runs = OrderedDict(cached[0])  # Copia: la caché sigue sirviendo la anterior
+
+            values = self.execution_repository.get_pressure_values(execution_id)
+            if not values:
+                return
+
+            runs[execution_id] = values
+            while len(runs) > self.max_runs:
+                runs.popitem(last=False)
+
+            envelope = self._build(runs)
+            if self._store(program_id, runs, envelope, generation) and envelope:
+                print(f"Envolvente del programa {program_id} actualizada ({envelope.run_count} ejecuciones)")
+
+        except Exception as e:
+            print(f"Error actualizando envolvente del programa {program_id}: {e}")
+
+    def invalidate(self, program_id: int):
+        """Descarta la envolvente de un programa (p. ej. al cambiar su perfil)"""
+        with self._lock:
+            self._cache.pop(program_id, None)
+            self._generation[program_id] = self._generation.get(program_id, 0) + 1
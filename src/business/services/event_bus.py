@@ -0,0 +1,73 @@
+"""
+Bus de eventos en proceso
+Notificaciones de cambios entre servicios (programas, ejecuciones, base de datos)
+"""
+
+import threading
+from typing import Callable, Dict, List, Optional
+
+# Temas publicados por los servicios
+PROGRAM_CREATED = 'program.created'
+PROGRAM_UPDATED = 'program.updated'
+PROGRAM_DELETED = 'program.deleted'
+PROGRAM_SEGMENTS_UPDATED = 'program.segments_updated'
+EXECUTION_STARTED = 'execution.started'
+EXECUTION_UPDATED = 'execution.updated'
+EXECUTION_FINISHED = 'execution.finished'
+DATABASE_CHANGED = 'database.changed'  # Escritura de otra conexión (data_version)
+
+
+class EventBus:
+    """Bus singleton de publicación/suscripción síncrona
+
+    Los suscriptores se invocan en orden de suscripción; un error en uno de
+    ellos no impide la entrega al resto. Los eventos publicados desde hilos
+    de trabajo se reenvían al hilo principal si hay un despachador instalado
+    (la interfaz lo instala); si no, se entregan en el hilo que publica.
+    """
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if not hasattr(self, 'initialized'):
+            self.initialized = True
+            self._subscribers: Dict[str, List[Callable[..., None]]] = {}
+            self._thread_dispatcher: Optional[Callable[[Callable[[], None]], None]] = None
+
+    def set_thread_dispatcher(self, dispatcher: Optional[Callable[[Callable[[], None]], None]]):
+        """Instala la función que ejecuta una entrega en el hilo principal"""
+        self._thread_dispatcher = dispatcher
+
+    def subscribe(self, topic: str, callback: Callable[..., None]):
+        """Registra un suscriptor para un tema"""
+        callbacks = self._subscribers.setdefault(topic, [])
+        if callback not in callbacks:
+            callbacks.append(callback)
+
+    def unsubscribe(self, topic: str, callback: Callable[..., None]):
+        """Elimina un suscriptor de un tema"""
+        callbacks = self._subscribers.get(topic)
+        if callbacks and callback in callbacks:
+            callbacks.remove(callback)
+
+    def publish(self, topic: str, **payload):
+        """Entrega el evento a los suscriptores del tema"""
+        if self._thread_dispatcher is not None and threading.current_thread() is not threading.main_thread():
+            self._thread_dispatcher(lambda: self._deliver(topic, payload))
+            return
+        self._deliver(topic, payload)
+
+    def _deliver(self, topic: str, payload: dict):
+        for callback in list(self._subscribers.get(topic, ())):
+            try:
+                callback(**payload)
+            except Exception as e:
+                print(f"Error entregando evento '{topic}': {e}")
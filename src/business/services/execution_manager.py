@@ -0,0 +1,773 @@
+"""
+Gestor de ejecuciones multi-cámara
+Ejecuta N programas independientes con un único planificador y un escritor por lotes
+"""
+
+import time
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Callable
+from PyQt6.QtCore import Qt, QObject, QTimer, pyqtSignal
+from PyQt6.QtCore import QUrl
+
+from data.repositories.execution_repository import ExecutionRepository
+from data.repositories.program_repository import ProgramRepository
+from data.repositories.reading_writer import PressureReadingWriter
+from data.entities.execution_entity import ExecutionEntity
+from data.entities.program_entity import ProgramEntity
+from data.database.change_watcher import DataVersionWatcher
+from hardware.pressure_sources import create_pressure_source
+from hardware.outputs import OutputDriver
+from .auth_service import AuthService
+from .chamber_execution import ChamberExecution, ChamberEventListener
+from .program_profile import CompiledProfile
+from .envelope_service import EnvelopeService, ReferenceEnvelope
+from .anomaly_detection import AnomalyMonitor
+from .sample_history import SampleHistory
+from .event_bus import (EventBus, EXECUTION_STARTED, EXECUTION_UPDATED, EXECUTION_FINISHED,
+                        PROGRAM_SEGMENTS_UPDATED, DATABASE_CHANGED)
+from .telemetry_pipeline import TelemetryPipeline
+from .execution_worker import ChamberWorkerProxy
+
+
+class _ManagerListener(ChamberEventListener):
+    """Adaptador que traduce eventos de cámara a señales del gestor
+
+    Fases, alarmas y finalización se emiten al momento; lecturas, progreso y
+    estado pasan por las colas de persistencia y publicación del canal.
+    """
+
+    def __init__(self, manager: 'ExecutionManager'):
+        self.manager = manager
+
+    def on_phase_changed(self, chamber, phase):
+        if phase == "running" and chamber.min_pressure_reached:
+            print(f"Cámara {chamber.chamber_id}: presión mínima alcanzada en {chamber.elapsed_seconds} segundos")
+        self.manager.chamberPhaseChanged.emit(chamber.chamber_id, phase)
+
+    def on_status(self, chamber, message):
+        self.manager.publish_stage.put(('status', chamber.chamber_id, (message,)))
+
+    def on_progress(self, chamber, elapsed, remaining, percentage):
+        self.manager.publish_stage.put(('progress', chamber.chamber_id, (elapsed, remaining, percentage)))
+
+    def on_alarm(self, chamber, alarm_type, message):
+        self.manager._play_alarm(alarm_type)
+        self.manager._signal_alarm_outputs(chamber, alarm_type)
+        self.manager.chamberAlarmTriggered.emit(chamber.chamber_id, alarm_type, message)
+        print(message)
+
+    def on_pressure(self, chamber, pressure):
+        self.manager.history[chamber.chamber_id].append(chamber.elapsed_seconds, pressure)
+        self.manager.persist_stage.put(('reading', chamber.current_execution.id, pressure, datetime.utcnow()))
+        self.manager.publish_stage.put(('pressure', chamber.chamber_id, (pressure,)))
+        self.manager._track_deviation(chamber, pressure)
+        self.manager._track_anomalies(chamber, pressure)
+
+    def on_completed(self, chamber):
+        self.manager.stop_execution(chamber.chamber_id, manual_stop=False)
+
+
+class ExecutionManager(QObject):
+    """Gestor de ejecuciones concurrentes en varias cámaras"""
+
+    # Señales por cámara (el primer argumento es siempre chamber_id)
+    chamberStarted = pyqtSignal(int, int)  # chamber_id, execution_id
+    chamberFinished = pyqtSignal(int, int, str)  # chamber_id, execution_id, status
+    chamberPressureUpdated = pyqtSignal(int, float)  # chamber_id, pressure
+    chamberProgressUpdated = pyqtSignal(int, int, int, int)  # chamber_id, elapsed, remaining, percentage
+    chamberStatusUpdated = pyqtSignal(int, str)  # chamber_id, message
+    chamberAlarmTriggered = pyqtSignal(int, str, str)  # chamber_id, alarm_type, message
+    chamberPhaseChanged = pyqtSignal(int, str)  # chamber_id, phase
+    chamberDeviationUpdated = pyqtSignal(int, float, float)  # chamber_id, desviación, rango percentil
+    chamberAnomalyDetected = pyqtSignal(int, str, float)  # chamber_id, detector, puntuación
+    chamberTelemetryUpdated = pyqtSignal(int, 'QVariant')  # chamber_id, instantánea numérica
+
+    DEFAULT_CHAMBER = 1
+
+    def __init__(self, auth_service: AuthService, config: Optional[Dict[str, Any]] = None,
+                 outputs: Optional[OutputDriver] = None):
+        super().__init__()
+        config = config or {}
+        self.auth_service = auth_service
+        # Luz y sirena (opcional); las órdenes se encolan y nunca bloquean el tick
+        self.outputs = outputs
+        self._warning_chambers = set()  # Cámaras con un aviso amarillo sin reconocer
+        self.execution_repository = ExecutionRepository()
+        self.program_repository = ProgramRepository()
+
+        # Escritor de lecturas compartido por todas las cámaras
+        self.reading_writer = PressureReadingWriter(
+            flush_interval=float(config.get('readings_flush_interval_s', 5.0)),
+            max_batch=int(config.get('readings_flush_max_batch', 500))
+        )
+        # Volcados en un hilo con su propia conexión: una BD lenta no retrasa el tick
+        if bool(config.get('readings_writer_thread', True)):
+            self.reading_writer.start()
+
+        # Cámaras configuradas (canal de sensor por cámara opcional)
+        self._listener = _ManagerListener(self)
+        chamber_count = max(1, int(config.get('chambers', 1)))
+        sensor_channels = config.get('sensor_channels', {}) or {}
+        random_seed = config.get('random_seed')
+        self.chambers: Dict[int, ChamberExecution] = {}
+        for chamber_id in range(1, chamber_count + 1):
+            self.chambers[chamber_id] = ChamberExecution(
+                chamber_id,
+                sensor_channel=sensor_channels.get(chamber_id),
+                listener=self._listener,
+                seed=int(random_seed) + chamber_id - 1 if random_seed is not None else None,
+                pressure_source=create_pressure_source(config, sensor_channels.get(chamber_id, chamber_id))
+            )
+            # El texto de estado por tick se sustituye por la instantánea de telemetría
+            self.chambers[chamber_id].status_messages = bool(config.get('status_messages', False))
+
+        # Historial en memoria por cámara para las gráficas de tendencia
+        history_capacity = int(config.get('history_capacity', 14400))
+        self.history: Dict[int, SampleHistory] = {
+            chamber_id: SampleHistory(history_capacity) for chamber_id in self.chambers
+        }
+
+        # Ruta de ejecución por etapas con colas acotadas hacia BD e interfaz
+        self.pipeline = TelemetryPipeline(self._persist_batch, self._publish_batch,
+                                          config.get('pipeline', {}) or {})
+        self.persist_stage = self.pipeline.stage('persist')
+        self.publish_stage = self.pipeline.stage('publish')
+        self._publish_signals = {
+            'pressure': self.chamberPressureUpdated,
+            'progress': self.chamberProgressUpdated,
+            'status': self.chamberStatusUpdated,
+            'deviation': self.chamberDeviationUpdated,
+        }
+
+        # Publicación hacia la interfaz a la frecuencia de refresco, no a la de muestreo
+        self.display_timer = QTimer()
+        self.display_timer.timeout.connect(self.publish_stage.drain)
+        self.ui_refresh_hz = float(config.get('ui_refresh_hz', 30))
+        self.set_ui_refresh_hz(self.ui_refresh_hz)
+
+        # Planificador único para todas las cámaras; temporizador preciso para
+        # que la carga de la interfaz no desplace el lazo de control
+        self.tick_interval_ms = int(config.get('tick_interval_ms', 1000))
+        self.scheduler_timer = QTimer()
+        self.scheduler_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.scheduler_timer.timeout.connect(self._scheduler_tick)
+        self.scheduler_timer.setInterval(self.tick_interval_ms)
+        self._last_tick_at: Optional[float] = None
+        self.tick_lateness_ms = 0.0
+        self._tick_lateness_peak_ms = 0.0
+
+        # Aislamiento opcional: cada cámara en su propio proceso de trabajo
+        self.process_isolation = bool(config.get('process_isolation', False))
+        self.telemetry_ring_capacity = int(config.get('telemetry_ring_capacity', 4096))
+        self.workers: Dict[int, ChamberWorkerProxy] = {}
+        self.telemetry_timer = QTimer()
+        self.telemetry_timer.timeout.connect(self._poll_workers)
+        self.telemetry_timer.setInterval(int(config.get('telemetry_poll_ms', 250)))
+
+        # Envolvente de referencia y aviso de desviación sostenida
+        envelope_config = config.get('envelope', {}) or {}
+        self.envelope_service = EnvelopeService(envelope_config)
+        self.deviation_alarm_seconds = int(envelope_config.get('alarm_seconds', 30))
+        # chamber_id -> [envolvente, segundos fuera, aviso emitido, desviación, rango percentil]
+        self._deviation: Dict[int, list] = {}
+        # Ejecutor de tareas lentas fuera del hilo de control: fn(tarea, *args, on_done=...).
+        # La interfaz instala su pool de comandos; sin él se ejecutan en el momento.
+        self.background_runner: Optional[Callable[..., Any]] = None
+
+        # Detectores de anomalías en línea (avisos previos a la alarma roja)
+        self.anomaly_config = config.get('anomaly', {}) or {}
+        self.anomaly_enabled = bool(self.anomaly_config.get('enabled', True))
+        self.anomaly_decimation = max(1, int(self.anomaly_config.get('decimation_s', 10)))
+        # chamber_id -> [monitor, muestras desde la última puntuación persistida]
+        self._anomaly: Dict[int, list] = {}
+
+        # Estado en memoria como referencia; se reconcilia con la BD solo ante cambios
+        self.event_bus = EventBus()
+        self.event_bus.subscribe(EXECUTION_UPDATED, self._on_execution_updated)
+        self.event_bus.subscribe(PROGRAM_SEGMENTS_UPDATED, self._on_program_segments_updated)
+        self.event_bus.subscribe(DATABASE_CHANGED, self._on_database_changed)
+        self.data_watcher = DataVersionWatcher()
+        self.data_watch_interval = float(config.get('data_watch_interval_s', 2.0))
+        self._last_data_check = 0.0
+
+        self._setup_alarms()
+
+        print(f"ExecutionManager inicializado con {chamber_count} cámara(s)")
+
+    def _setup_alarms(self):
+        """Configura el sonido de alarma compartido"""
+        try:
+            # QtMultimedia se carga aquí y no al importar el módulo
+            from PyQt6.QtMultimedia import QSoundEffect
+            self.alarm_sound = QSoundEffect()
+            self.alarm_sound.setSource(QUrl.fromLocalFile(""))  # Se configurará dinámicamente
+            self.alarm_sound.setVolume(0.7)
+            print("Sistema de alarmas configurado")
+        except Exception as e:
+            print(f"Warning: No se pudo configurar el sistema de sonido: {e}")
+            self.alarm_sound = None
+
+    def _play_alarm(self, alarm_type: str):
+        """Reproduce alarma según el tipo"""
+        try:
+            if self.alarm_sound:
+                if alarm_type == "red":
+                    self.alarm_sound.setLoopCount(3)
+                elif alarm_type in ("green", "yellow"):
+                    self.alarm_sound.setLoopCount(1)
+
+                self.alarm_sound.play()
+            else:
+                print(f"\a")  # Beep del sistema
+        except Exception as e:
+            print(f"Error reproduciendo alarma: {e}")
+            print(f"\a")
+
+    def _signal_alarm_outputs(self, chamber: ChamberExecution, alarm_type: str):
+        """Activa las salidas en cuanto se produce la alarma (la repetición se coalesce)"""
+        if not self.outputs:
+            return
+        if alarm_type == "red":
+            self.outputs.set('siren', True)
+            self.outputs.set('light', True)
+        elif alarm_type == "yellow":
+            self._warning_chambers.add(chamber.chamber_id)
+            self.outputs.set('light', True)
+
+    def _update_outputs(self):
+        """Estado enclavado de las salidas: sirena con alarma roja activa, luz con cualquier alarma"""
+        if not self.outputs:
+            return
+        red = any(chamber.alarm_active for chamber in self.chambers.values() if chamber.is_running)
+        self.outputs.set('siren', red)
+        self.outputs.set('light', red or bool(self._warning_chambers))
+
+    def acknowledge_alarms(self):
+        """Reconoce los avisos amarillos y apaga la luz si no queda ninguna alarma"""
+        self._warning_chambers.clear()
+        self._update_outputs()
+
+    def get_output_metrics(self) -> Optional[Dict[str, Any]]:
+        """Órdenes, coalescencia y latencia de las salidas"""
+        return self.outputs.get_metrics() if self.outputs else None
+
+    def set_background_runner(self, runner: Optional[Callable[..., Any]]):
+        """Instala el ejecutor de tareas lentas (p. ej. CommandDispatcher.submit)"""
+        self.background_runner = runner
+
+    def _run_in_background(self, task: Callable[..., Any], *args,
+                           on_done: Optional[Callable[[Any], None]] = None):
+        """Ejecuta una tarea lenta fuera del tick; on_done se llama en el hilo de la interfaz"""
+        if self.background_runner is not None:
+            self.background_runner(task, *args, on_done=on_done)
+            return
+        result = task(*args)
+        if on_done:
+            on_done(result)
+
+    def request_envelope(self, program_id: int):
+        """Carga en segundo plano la envolvente de un programa si no está en caché"""
+        if not self.envelope_service.cached(program_id)[0]:
+            self._run_in_background(self.envelope_service.get_envelope, program_id)
+
+    def _attach_envelope(self, chamber: ChamberExecution):
+        """Asocia a la cámara la envolvente histórica de su programa
+
+        Si no está en caché se carga en segundo plano y se asocia al llegar,
+        siempre que la cámara siga con la misma ejecución.
+        """
+        chamber_id = chamber.chamber_id
+        found, envelope = self.envelope_service.cached(chamber.current_program.id)
+        if found:
+            self._set_envelope(chamber_id, envelope)
+            return
+
+        self._deviation.pop(chamber_id, None)
+        execution_id = chamber.current_execution.id
+        self._run_in_background(self.envelope_service.get_envelope, chamber.current_program.id,
+                                on_done=lambda loaded: self._on_envelope_loaded(chamber_id, execution_id, loaded))
+
+    def _on_envelope_loaded(self, chamber_id: int, execution_id: int, envelope: Optional[ReferenceEnvelope]):
+        chamber = self.chambers.get(chamber_id)
+        if chamber and chamber.is_running and chamber.current_execution and chamber.current_execution.id == execution_id:
+            self._set_envelope(chamber_id, envelope)
+
+    def _set_envelope(self, chamber_id: int, envelope: Optional[ReferenceEnvelope]):
+        if envelope:
+            self._deviation[chamber_id] = [envelope, 0, False, 0.0, 50.0]
+        else:
+            self._deviation.pop(chamber_id, None)
+
+    def _track_deviation(self, chamber: ChamberExecution, pressure: float):
+        """Desviación y rango percentil de la muestra frente a la envolvente"""
+        state = self._deviation.get(chamber.chamber_id)
+        if state is None:
+            return
+
+        envelope = state[0]
+        index = chamber.elapsed_seconds - 1  # Las lecturas se alinean desde el inicio
+        if not envelope.covers(index):
+            return
+
+        deviation = envelope.deviation(index, pressure)
+        rank = envelope.percentile_rank(index, pressure)
+        state[3] = deviation
+        state[4] = rank
+        self.publish_stage.put(('deviation', chamber.chamber_id, (deviation, rank)))
+
+        # Aviso amarillo al salir de la envolvente de forma sostenida
+        if envelope.is_outside(index, pressure):
+            state[1] += 1
+            if state[1] >= self.deviation_alarm_seconds and not state[2]:
+                state[2] = True
+                message = (f"AVISO: Cámara {chamber.chamber_id} fuera de su curva habitual "
+                           f"({deviation:+.1f} PSI respecto a la mediana)")
+                self._listener.on_alarm(chamber, "yellow", message)
+        else:
+            state[1] = 0
+            state[2] = False
+
+    def _attach_anomaly_monitor(self, chamber: ChamberExecution):
+        """Crea los detectores de anomalías de la ejecución de la cámara"""
+        if self.anomaly_enabled:
+            self._anomaly[chamber.chamber_id] = [AnomalyMonitor(self.anomaly_config), 0]
+
+    def _track_anomalies(self, chamber: ChamberExecution, pressure: float):
+        """Actualiza los detectores con el residuo frente a la consigna (fase de ejecución)"""
+        state = self._anomaly.get(chamber.chamber_id)
+        if state is None or chamber.execution_phase != "running":
+            return
+
+        monitor = state[0]
+        profile = chamber.profile
+        residual = pressure - chamber.target_pressure  # Consigna del segundo recién evaluado
+        for detector, score in monitor.update(residual):
+            message = (f"AVISO: Cámara {chamber.chamber_id}: {AnomalyMonitor.describe(detector)} "
+                       f"(puntuación {score:.2f})")
+            self.chamberAnomalyDetected.emit(chamber.chamber_id, detector, score)
+            self._listener.on_alarm(chamber, "yellow", message)
+
+        # Puntuaciones diezmadas hacia la base de datos
+        if monitor.ready:
+            state[1] += 1
+            if state[1] >= self.anomaly_decimation:
+                state[1] = 0
+                self.persist_stage.put(('anomaly', chamber.current_execution.id, tuple(monitor.scores),
+                                        datetime.utcnow()))
+
+    def _persist_batch(self, items: List[tuple]):
+        """Etapa de persistencia: pasa lecturas y puntuaciones al escritor por lotes"""
+        writer = self.reading_writer
+        add = writer.add
+        for kind, execution_id, value, timestamp in items:
+            if kind == 'reading':
+                add(execution_id, value, timestamp)
+            else:
+                writer.add_anomaly_scores(execution_id, value, timestamp)
+
+    def _publish_batch(self, items: List[tuple]):
+        """Etapa de publicación: emite solo el último valor de cada tipo y cámara
+
+        Se vacía con el temporizador de refresco; además de las señales por
+        tipo, cada cámara actualizada recibe una única instantánea numérica.
+        """
+        latest = {}
+        for kind, chamber_id, args in items:
+            latest[(kind, chamber_id)] = args
+        touched = set()
+        for (kind, chamber_id), args in latest.items():
+            self._publish_signals[kind].emit(chamber_id, *args)
+            touched.add(chamber_id)
+        for chamber_id in touched:
+            self.chamberTelemetryUpdated.emit(chamber_id, self.get_telemetry(chamber_id))
+
+    def get_telemetry(self, chamber_id: int) -> Dict[str, Any]:
+        """Instantánea numérica de la cámara con la desviación frente a la envolvente"""
+        chamber = self.chambers.get(chamber_id)
+        if not chamber:
+            return {'chamber_id': chamber_id, 'is_running': False}
+
+        snapshot = chamber.get_telemetry()
+        deviation = self._deviation.get(chamber_id)
+        snapshot['deviation'] = deviation[3] if deviation else None
+        snapshot['percentile_rank'] = deviation[4] if deviation else None
+        return snapshot
+
+    def get_sample_history(self, chamber_id: int) -> Optional[SampleHistory]:
+        """Muestras recientes de la cámara (segundos de ejecución, presión)"""
+        return self.history.get(chamber_id)
+
+    def set_ui_refresh_hz(self, hz: float):
+        """Frecuencia de publicación hacia la interfaz (no afecta al lazo de control)"""
+        self.display_timer.setInterval(max(1, int(1000 / max(0.1, float(hz)))))
+
+    def take_tick_lateness_ms(self) -> float:
+        """Mayor retraso del tick de control desde la consulta anterior (ms)"""
+        peak = self._tick_lateness_peak_ms
+        self._tick_lateness_peak_ms = 0.0
+        return peak
+
+    def get_pipeline_metrics(self) -> List[Dict[str, Any]]:
+        """Latencia, profundidad de cola y descartes de cada etapa (y del escritor de lecturas)"""
+        metrics = self.pipeline.get_metrics()
+        metrics.append({'stage': 'write', **self.reading_writer.get_metrics()})
+        return metrics
+
+    def get_program_envelope(self, program_id: int, step: int = 1) -> Optional[Dict[str, Any]]:
+        """Envolvente de referencia de un programa como diccionario"""
+        envelope = self.envelope_service.get_envelope(program_id)
+        return envelope.to_dict(step) if envelope else None
+
+    def get_anomaly_scores(self, chamber_id: int) -> Optional[Dict[str, Any]]:
+        """Puntuaciones de anomalía en curso de una cámara"""
+        state = self._anomaly.get(chamber_id)
+        return state[0].get_scores() if state else None
+
+    def get_chamber(self, chamber_id: int) -> Optional[ChamberExecution]:
+        """Obtiene una cámara por su identificador"""
+        return self.chambers.get(chamber_id)
+
+    def get_chamber_ids(self) -> List[int]:
+        """Lista de cámaras configuradas"""
+        return list(self.chambers.keys())
+
+    def get_running_chambers(self) -> List[ChamberExecution]:
+        """Cámaras con una ejecución en curso"""
+        return [chamber for chamber in self.chambers.values() if chamber.is_running]
+
+    def has_running_executions(self) -> bool:
+        """Verifica si alguna cámara está ejecutando un programa"""
+        return any(chamber.is_running for chamber in self.chambers.values())
+
+    def _update_scheduler(self):
+        """Arranca o detiene los temporizadores según haya cámaras activas"""
+        local_running = any(chamber.is_running and chamber.chamber_id not in self.workers
+                            for chamber in self.chambers.values())
+        for timer, active in ((self.scheduler_timer, local_running),
+                              (self.telemetry_timer, bool(self.workers)),
+                              (self.display_timer, local_running or bool(self.workers))):
+            if active and not timer.isActive():
+                timer.start()
+                if timer is self.scheduler_timer:
+                    self._last_tick_at = None
+            elif not active and timer.isActive():
+                timer.stop()
+
+    def _start_worker(self, chamber: ChamberExecution, resume: bool):
+        """Lanza el lazo de control de la cámara en un proceso aislado"""
+        proxy = ChamberWorkerProxy(chamber, self.telemetry_ring_capacity, self.tick_interval_ms / 1000.0)
+        proxy.start(resume=resume)
+        self.workers[chamber.chamber_id] = proxy
+
+    def _stop_worker(self, chamber_id: int):
+        """Detiene el proceso de trabajo de una cámara, si existe"""
+        proxy = self.workers.pop(chamber_id, None)
+        if proxy:
+            proxy.stop()
+
+    def _check_external_changes(self, force: bool = False):
+        """Publica DATABASE_CHANGED si otra conexión escribió en la BD"""
+        now = time.monotonic()
+        if not force and now - self._last_data_check < self.data_watch_interval:
+            return
+        self._last_data_check = now
+        if self.data_watcher.check():
+            self.event_bus.publish(DATABASE_CHANGED)
+
+    def _on_database_changed(self):
+        """Reconcilia las cámaras activas tras una escritura externa"""
+        for chamber in self.get_running_chambers():
+            self.validate_chamber_state(chamber.chamber_id)
+
+    def _on_execution_updated(self, execution_id: int):
+        """Reconcilia la cámara que ejecuta el registro modificado, si la hay"""
+        for chamber in self.get_running_chambers():
+            if chamber.current_execution and chamber.current_execution.id == execution_id:
+                self.validate_chamber_state(chamber.chamber_id)
+
+    def _on_program_segments_updated(self, program_id: int):
+        """Un perfil nuevo invalida la envolvente histórica del programa"""
+        self.envelope_service.invalidate(program_id)
+
+    def validate_chamber_state(self, chamber_id: int) -> bool:
+        """Valida que el estado de la cámara coincida con la base de datos (ante cambios notificados)"""
+        chamber = self.chambers.get(chamber_id)
+        try:
+            if not chamber or not chamber.is_running or not chamber.current_execution:
+                return True
+
+            db_execution = self.execution_repository.get_execution_by_id(chamber.current_execution.id)
+
+            if not db_execution:
+                print(f"Cámara {chamber_id}: ejecución no encontrada en BD, limpiando estado interno")
+                chamber.reset()
+                self._update_scheduler()
+                return False
+
+            if db_execution.status != 'running':
+                print(f"Cámara {chamber_id}: ejecución en BD no está en running (estado: {db_execution.status}), limpiando estado interno")
+                chamber.reset()
+                self._update_scheduler()
+                return False
+
+            if not self.program_repository.get_program_by_id(db_execution.program_id):
+                print(f"Cámara {chamber_id}: programa asociado no existe, deteniendo ejecución")
+                self.stop_execution(chamber_id, manual_stop=True)
+                return False
+
+            return True
+
+        except Exception as e:
+            print(f"Error validando estado de ejecución: {e}")
+            if chamber:
+                chamber.reset()
+                self._update_scheduler()
+            return False
+
+    def start_execution(self, chamber_id: int, program_id: int, program: Optional[ProgramEntity] = None,
+                        profile: Optional[CompiledProfile] = None) -> Dict[str, Any]:
+        """Inicia la ejecución de un programa en una cámara
+
+        La cola de ejecución pasa el programa y su perfil ya cargados y
+        validados para que el arranque no espere a la base de datos.
+        """
+        try:
+            chamber = self.chambers.get(chamber_id)
+            if not chamber:
+                return {
+                    'success': False,
+                    'message': f'Cámara {chamber_id} no configurada'
+                }
+
+            self._check_external_changes(force=True)
+
+            if not self.auth_service.can_execute_programs():
+                return {
+                    'success': False,
+                    'message': 'No tiene permisos para ejecutar programas'
+                }
+
+            if chamber.is_running:
+                return {
+                    'success': False,
+                    'message': f'Ya hay un programa en ejecución en la cámara {chamber_id}'
+                }
+
+            if program is None or program.id != program_id:
+                program = self.program_repository.get_program_by_id(program_id)
+                profile = None
+            if not program:
+                return {
+                    'success': False,
+                    'message': 'Programa no encontrado'
+                }
+
+            current_user = self.auth_service.get_current_user()
+            execution = ExecutionEntity(
+                program_id=program.id,
+                user_id=current_user.id if current_user else 0,
+                status='running',
+                chamber_id=chamber_id
+            )
+
+            created_execution = self.execution_repository.create_execution(execution)
+            if not created_execution:
+                return {
+                    'success': False,
+                    'message': 'Error al crear registro de ejecución'
+                }
+
+            if self.process_isolation:
+                chamber.attach(created_execution, program, profile)
+                self._start_worker(chamber, resume=False)
+            else:
+                chamber.start(created_execution, program, profile)
+            self._attach_envelope(chamber)
+            self._attach_anomaly_monitor(chamber)
+            self.history[chamber.chamber_id].clear()
+            self._update_scheduler()
+
+            self.chamberStarted.emit(chamber_id, created_execution.id)
+            self.event_bus.publish(EXECUTION_STARTED, chamber_id=chamber_id, execution_id=created_execution.id)
+
+            print(f"Ejecución iniciada - Cámara: {chamber_id}, Programa: {program.name}, ID: {created_execution.id}")
+
+            return {
+                'success': True,
+                'message': f'Programa "{program.name}" iniciado correctamente',
+                'execution_id': created_execution.id
+            }
+
+        except Exception as e:
+            print(f"Error iniciando ejecución: {e}")
+            return {
+                'success': False,
+                'message': 'Error interno del sistema'
+            }
+
+    def stop_execution(self, chamber_id: int, manual_stop: bool = True) -> Dict[str, Any]:
+        """Detiene la ejecución de una cámara"""
+        try:
+            chamber = self.chambers.get(chamber_id)
+            if not chamber or not chamber.is_running or not chamber.current_execution:
+                return {
+                    'success': False,
+                    'message': 'No hay ninguna ejecución en curso'
+                }
+
+            self._stop_worker(chamber_id)
+
+            # Persistir las lecturas pendientes antes de cerrar el registro
+            self.pipeline.drain()
+            self.reading_writer.flush()
+
+            execution = chamber.current_execution
+            execution.end_time = datetime.now()
+            execution.status = 'stopped' if manual_stop else 'completed'
+            execution.stopped_manually = manual_stop
+
+            self.execution_repository.update_execution(execution)
+
+            execution_id = execution.id
+            program_name = chamber.current_program.name if chamber.current_program else "Programa"
+
+            # Las ejecuciones completadas alimentan la envolvente de su programa
+            self._deviation.pop(chamber_id, None)
+            self._anomaly.pop(chamber_id, None)
+            self._warning_chambers.discard(chamber_id)
+            if not manual_stop:
+                self._run_in_background(self.envelope_service.on_execution_completed,
+                                        execution.program_id, execution_id)
+
+            chamber.reset()
+            self._update_scheduler()
+            self._update_outputs()
+
+            status = 'stopped' if manual_stop else 'completed'
+            self.chamberFinished.emit(chamber_id, execution_id, status)
+            self.event_bus.publish(EXECUTION_FINISHED, chamber_id=chamber_id, execution_id=execution_id, status=status)
+
+            if not manual_stop:
+                # Programa completado - alarma verde
+                self._play_alarm("green")
+                self.chamberAlarmTriggered.emit(chamber_id, "green", f"Programa {program_name} completado exitosamente")
+                self.chamberPhaseChanged.emit(chamber_id, "completed")
+
+            message = f"Programa {program_name} "
+            message += "detenido manualmente" if manual_stop else "completado"
+            self.chamberStatusUpdated.emit(chamber_id, message)
+
+            print(f"Ejecución {status} - Cámara: {chamber_id}, ID: {execution_id}")
+
+            return {
+                'success': True,
+                'message': message
+            }
+
+        except Exception as e:
+            print(f"Error deteniendo ejecución: {e}")
+            return {
+                'success': False,
+                'message': 'Error interno del sistema'
+            }
+
+    def resume_execution(self, execution: ExecutionEntity, program: ProgramEntity) -> bool:
+        """Resume una ejecución interrumpida en su cámara"""
+        try:
+            chamber = self.chambers.get(execution.chamber_id) or self.chambers[self.DEFAULT_CHAMBER]
+            if chamber.is_running:
+                print(f"Cámara {chamber.chamber_id} ocupada, no se puede resumir la ejecución {execution.id}")
+                return False
+
+            if self.process_isolation:
+                chamber.attach(execution, program)
+                self._start_worker(chamber, resume=True)
+            else:
+                chamber.resume(execution, program)
+            self._attach_envelope(chamber)
+            self._attach_anomaly_monitor(chamber)
+            self.history[chamber.chamber_id].clear()
+            self._update_scheduler()
+
+            self.chamberStarted.emit(chamber.chamber_id, execution.id)
+            self.event_bus.publish(EXECUTION_STARTED, chamber_id=chamber.chamber_id, execution_id=execution.id)
+
+            print(f"Ejecución resumida - Cámara: {chamber.chamber_id}, Programa: {program.name}, Fase: {chamber.execution_phase}")
+            return True
+
+        except Exception as e:
+            print(f"Error resumiendo ejecución: {e}")
+            return False
+
+    def _scheduler_tick(self):
+        """Tick único del planificador: avanza todas las cámaras activas"""
+        now = time.monotonic()
+        if self._last_tick_at is not None:
+            lateness = max(0.0, (now - self._last_tick_at) * 1000.0 - self.tick_interval_ms)
+            self.tick_lateness_ms = lateness
+            if lateness > self._tick_lateness_peak_ms:
+                self._tick_lateness_peak_ms = lateness
+        self._last_tick_at = now
+        self._check_external_changes()
+        for chamber in self.get_running_chambers():
+            if chamber.chamber_id in self.workers:
+                continue
+            try:
+                self.pipeline.run_tick(chamber)
+
+            except Exception as e:
+                print(f"Error en paso de ejecución (cámara {chamber.chamber_id}): {e}")
+                self.stop_execution(chamber.chamber_id, manual_stop=True)
+
+        # Las lecturas pasan al buffer del escritor (su hilo las vuelca); la publicación la vacía el refresco
+        self.persist_stage.drain()
+        self.reading_writer.flush_if_due()
+        self._update_outputs()
+
+    def _poll_workers(self):
+        """Vuelca la telemetría de los procesos de trabajo (independiente del lazo de control)"""
+        self._check_external_changes()
+        for chamber_id, proxy in list(self.workers.items()):
+            chamber = self.chambers[chamber_id]
+            try:
+                proxy.poll(self._listener)
+
+                if chamber_id in self.workers and not proxy.is_alive():
+                    # Un último volcado: la finalización normal puede estar aún en la tubería
+                    if proxy.drain_exited(self._listener) or chamber_id not in self.workers:
+                        continue
+                    print(f"Proceso de la cámara {chamber_id} finalizó inesperadamente")
+                    if chamber.current_execution:
+                        chamber.current_execution.notes = 'Proceso de control finalizado inesperadamente'
+                    self.stop_execution(chamber_id, manual_stop=True)
+
+            except Exception as e:
+                print(f"Error leyendo telemetría (cámara {chamber_id}): {e}")
+                self.stop_execution(chamber_id, manual_stop=True)
+
+        self.persist_stage.drain()
+        self.reading_writer.flush_if_due()
+        self._update_outputs()
+
+    def get_execution_info(self, chamber_id: int) -> Dict[str, Any]:
+        """Obtiene información de la ejecución de una cámara"""
+        chamber = self.chambers.get(chamber_id)
+        if not chamber:
+            return {'chamber_id': chamber_id, 'is_running': False}
+        return chamber.get_info()
+
+    def get_all_execution_info(self) -> List[Dict[str, Any]]:
+        """Obtiene información de todas las cámaras"""
+        return [chamber.get_info() for chamber in self.chambers.values()]
+
+    def shutdown(self):
+        """Detiene el planificador y persiste las lecturas pendientes"""
+        self.scheduler_timer.stop()
+        self.telemetry_timer.stop()
+        self.display_timer.stop()
+        for chamber_id in list(self.workers.keys()):
+            self._stop_worker(chamber_id)
+        self.pipeline.drain()
+        self.reading_writer.stop()
+        if self.outputs:
+            self.outputs.close()
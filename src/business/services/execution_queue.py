@@ -0,0 +1,420 @@
+"""
+Cola de ejecución persistente
+Encadena programas por cámara con hora de inicio y dependencias opcionales
+"""
+
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, List, Tuple
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from data.repositories.execution_queue_repository import ExecutionQueueRepository
+from data.repositories.execution_repository import ExecutionRepository
+from data.repositories.program_repository import ProgramRepository
+from data.entities.queue_entry_entity import QueueEntryEntity
+from data.entities.program_entity import ProgramEntity
+from .auth_service import AuthService
+from .execution_manager import ExecutionManager
+from .program_profile import CompiledProfile, compile_profile
+from .event_bus import (EventBus, EXECUTION_FINISHED, PROGRAM_UPDATED, PROGRAM_DELETED,
+                        PROGRAM_SEGMENTS_UPDATED)
+
+
+class ExecutionQueue(QObject):
+    """Planificador de la cola de ejecución
+
+    Las entradas pendientes se mantienen en memoria (la base de datos solo se
+    escribe al cambiar su estado). Cada cámara ejecuta sus entradas en orden:
+    la siguiente se carga, valida y compila durante los últimos segundos de la
+    actual y arranca en cuanto ésta termina.
+    """
+
+    queueChanged = pyqtSignal()
+    entryFailed = pyqtSignal(int, str)  # entry_id, motivo
+
+    def __init__(self, execution_manager: ExecutionManager, auth_service: AuthService,
+                 config: Optional[Dict[str, Any]] = None):
+        super().__init__()
+        config = config or {}
+        self.execution_manager = execution_manager
+        self.auth_service = auth_service
+        self.repository = ExecutionQueueRepository()
+        self.execution_repository = ExecutionRepository()
+        self.program_repository = ProgramRepository()
+
+        self.preload_seconds = int(config.get('preload_s', 60))
+        self.pause_on_manual_stop = bool(config.get('pause_on_manual_stop', True))
+        self.paused = False
+        self.pause_reason = ''
+        # La cola no arranca programas hasta que se resuelven las ejecuciones interrumpidas
+        self.active = False
+
+        self._entries: List[QueueEntryEntity] = self.repository.get_entries()
+        # entry_id -> (programa, perfil compilado) listos para arrancar
+        self._preloaded: Dict[int, Tuple[ProgramEntity, CompiledProfile]] = {}
+
+        self.timer = QTimer()
+        self.timer.timeout.connect(self._on_timer)
+        self.timer.setInterval(int(config.get('check_interval_ms', 1000)))
+
+        event_bus = EventBus()
+        event_bus.subscribe(EXECUTION_FINISHED, self._on_execution_finished)
+        for topic in (PROGRAM_UPDATED, PROGRAM_DELETED, PROGRAM_SEGMENTS_UPDATED):
+            event_bus.subscribe(topic, self._on_program_changed)
+
+        print(f"Cola de ejecución cargada ({len(self._entries)} entradas pendientes)")
+
+    # --- Gestión de la cola ---
+
+    def enqueue(self, program_id: int, chamber_id: int = ExecutionManager.DEFAULT_CHAMBER,
+                start_after: Optional[datetime] = None, depends_on: Optional[int] = None) -> Dict[str, Any]:
+        """Añade un programa al final de la cola"""
+        try:
+            if not self.auth_service.can_execute_programs():
+                return {
+                    'success': False,
+                    'message': 'No tiene permisos para ejecutar programas'
+                }
+
+            if not self.execution_manager.get_chamber(chamber_id):
+                return {
+                    'success': False,
+                    'message': f'Cámara {chamber_id} no configurada'
+                }
+
+            program = self.program_repository.get_program_by_id(program_id)
+            if not program or not program.is_active:
+                return {
+                    'success': False,
+                    'message': 'Programa no encontrado'
+                }
+
+            if depends_on is not None and not self.repository.get_entry_by_id(depends_on):
+                return {
+                    'success': False,
+                    'message': 'La entrada de la que depende no existe'
+                }
+
+            entry = self.repository.create_entry(QueueEntryEntity(
+                program_id=program_id,
+                chamber_id=chamber_id,
+                start_after=start_after,
+                depends_on=depends_on
+            ))
+            if not entry:
+                return {
+                    'success': False,
+                    'message': 'Error al guardar la entrada en la cola'
+                }
+
+            self._entries.append(entry)
+            self._changed()
+            return {
+                'success': True,
+                'message': f"Programa '{program.name}' añadido a la cola (cámara {chamber_id})",
+                'entry': entry
+            }
+
+        except Exception as e:
+            print(f"Error añadiendo programa a la cola: {e}")
+            return {
+                'success': False,
+                'message': 'Error interno del sistema'
+            }
+
+    def remove(self, entry_id: int) -> Dict[str, Any]:
+        """Quita una entrada pendiente de la cola"""
+        entry = self._find(entry_id)
+        if not entry or entry.status != 'pending':
+            return {
+                'success': False,
+                'message': 'Solo se pueden quitar entradas pendientes'
+            }
+
+        if not self.repository.delete_entry(entry_id):
+            return {
+                'success': False,
+                'message': 'Error al quitar la entrada de la cola'
+            }
+
+        self._entries.remove(entry)
+        self._preloaded.pop(entry_id, None)
+        self._changed()
+        return {
+            'success': True,
+            'message': 'Entrada quitada de la cola'
+        }
+
+    def move(self, entry_id: int, new_index: int) -> Dict[str, Any]:
+        """Cambia la posición de una entrada entre las pendientes"""
+        entry = self._find(entry_id)
+        if not entry or entry.status != 'pending':
+            return {
+                'success': False,
+                'message': 'Solo se pueden mover entradas pendientes'
+            }
+
+        entries = list(self._entries)
+        entries.remove(entry)
+        entries.insert(max(0, min(new_index, len(entries))), entry)
+        if self._breaks_dependency_order(entries):
+            # La cámara solo mira su primera entrada: si ésta espera a otra posterior, se atasca
+            return {
+                'success': False,
+                'message': 'Una entrada no puede ir delante de la entrada de la que depende en la misma cámara'
+            }
+
+        if not self.repository.update_positions([item.id for item in entries]):
+            return {
+                'success': False,
+                'message': 'Error al reordenar la cola'
+            }
+
+        for position, item in enumerate(entries):
+            item.position = position
+        self._entries = entries
+        # La siguiente entrada de la cámara puede haber cambiado
+        self._preloaded.clear()
+        self._changed()
+        return {
+            'success': True,
+            'message': 'Cola reordenada'
+        }
+
+    @staticmethod
+    def _breaks_dependency_order(entries: List[QueueEntryEntity]) -> bool:
+        """True si alguna entrada queda delante de su dependencia en la misma cámara"""
+        positions = {entry.id: index for index, entry in enumerate(entries)}
+        for index, entry in enumerate(entries):
+            if entry.depends_on not in positions:
+                continue
+            dependency = entries[positions[entry.depends_on]]
+            if dependency.chamber_id == entry.chamber_id and positions[entry.depends_on] > index:
+                return True
+        return False
+
+    def pause(self, reason: str = ''):
+        """Detiene el arranque automático (la ejecución en curso continúa)"""
+        self.paused = True
+        self.pause_reason = reason
+        self._changed()
+        print(f"Cola de ejecución pausada{': ' + reason if reason else ''}")
+
+    def resume(self):
+        """Reanuda el arranque automático"""
+        self.paused = False
+        self.pause_reason = ''
+        self._changed()
+        print("Cola de ejecución reanudada")
+        self.dispatch()
+
+    def get_entries(self, include_finished: bool = False) -> List[Dict[str, Any]]:
+        """Entradas de la cola como diccionarios (con el nombre del programa)"""
+        entries = self.repository.get_entries(include_finished) if include_finished else self._entries
+        names: Dict[int, str] = {}
+        result = []
+        for entry in entries:
+            if entry.program_id not in names:
+                program = self.program_repository.get_program_by_id(entry.program_id)
+                names[entry.program_id] = program.name if program else ''
+            data = entry.to_dict()
+            data['program_name'] = names[entry.program_id]
+            data['preloaded'] = entry.id in self._preloaded
+            result.append(data)
+        return result
+
+    # --- Planificación ---
+
+    def activate(self):
+        """Concilia las entradas en curso con la base de datos y empieza a planificar"""
+        try:
+            for entry in list(self._entries):
+                if entry.status != 'running':
+                    continue
+                chamber = self.execution_manager.get_chamber(entry.chamber_id)
+                if (chamber and chamber.is_running and chamber.current_execution
+                        and chamber.current_execution.id == entry.execution_id):
+                    continue  # Ejecución reanudada tras el reinicio
+
+                execution = self.execution_repository.get_execution_by_id(entry.execution_id) if entry.execution_id else None
+                status = execution.status if execution and execution.status in ('completed', 'stopped') else 'failed'
+                self._finish(entry, status, None if execution else 'Ejecución no encontrada tras el reinicio')
+
+        except Exception as e:
+            print(f"Error conciliando la cola de ejecución: {e}")
+
+        self.active = True
+        self._changed()
+        self.dispatch()
+
+    def _update_timer(self):
+        """El temporizador solo corre mientras haya entradas por planificar"""
+        should_run = self.active and bool(self._entries)
+        if should_run and not self.timer.isActive():
+            self.timer.start()
+        elif not should_run and self.timer.isActive():
+            self.timer.stop()
+
+    def _on_timer(self):
+        self._preload_next()
+        self.dispatch()
+
+    def _next_entry(self, chamber_id: int) -> Optional[QueueEntryEntity]:
+        """Primera entrada pendiente de la cámara (las posteriores esperan su turno)"""
+        for entry in self._entries:
+            if entry.chamber_id == chamber_id and entry.status == 'pending':
+                return entry
+        return None
+
+    def _chamber_busy(self, chamber_id: int) -> bool:
+        chamber = self.execution_manager.get_chamber(chamber_id)
+        if not chamber or chamber.is_running:
+            return True
+        return any(entry.chamber_id == chamber_id and entry.status == 'running' for entry in self._entries)
+
+    def _dependency_state(self, entry: QueueEntryEntity) -> str:
+        """'ready', 'waiting' o 'broken' según la entrada de la que depende"""
+        if entry.depends_on is None:
+            return 'ready'
+        dependency = self._find(entry.depends_on)
+        if dependency:
+            return 'waiting'
+        dependency = self.repository.get_entry_by_id(entry.depends_on)
+        return 'ready' if dependency and dependency.status == 'completed' else 'broken'
+
+    def dispatch(self):
+        """Arranca la siguiente entrada en cada cámara libre"""
+        if not self.active or self.paused:
+            self._update_timer()
+            return
+
+        now = datetime.now()
+        for chamber_id in self.execution_manager.get_chamber_ids():
+            while not self._chamber_busy(chamber_id):
+                entry = self._next_entry(chamber_id)
+                if not entry or (entry.start_after and entry.start_after > now):
+                    break
+
+                dependency = self._dependency_state(entry)
+                if dependency == 'waiting':
+                    break
+                if dependency == 'broken':
+                    self._finish(entry, 'cancelled', 'La entrada de la que depende no se completó')
+                    continue
+
+                # Sin permisos la cola se pausa con la entrada pendiente: no es culpa del programa
+                if not self.auth_service.can_execute_programs():
+                    self.pause('No hay un usuario con permisos para ejecutar programas')
+                    return
+
+                # Un fallo deja la cámara sin arrancar hasta el siguiente evento o tick
+                if not self._start(entry):
+                    break
+
+        self._update_timer()
+
+    def _start(self, entry: QueueEntryEntity) -> bool:
+        """Arranca una entrada con el programa precargado (o lo carga en el momento)"""
+        preloaded = self._preloaded.pop(entry.id, None) or self._prepare(entry)
+        if not preloaded:
+            return False
+
+        program, profile = preloaded
+        result = self.execution_manager.start_execution(entry.chamber_id, program.id, program, profile)
+        if not result['success']:
+            chamber = self.execution_manager.get_chamber(entry.chamber_id)
+            if not self.auth_service.can_execute_programs() or not chamber or chamber.is_running:
+                # Permisos o cámara: no es culpa del programa, la entrada sigue pendiente
+                self._preloaded[entry.id] = preloaded
+                self.pause(result['message'])
+                return False
+            self._finish(entry, 'failed', result['message'])
+            return False
+
+        entry.status = 'running'
+        entry.execution_id = result['execution_id']
+        self.repository.update_entry(entry)
+        self._changed()
+        print(f"Cola: iniciado '{program.name}' en la cámara {entry.chamber_id} (entrada {entry.id})")
+        return True
+
+    def _prepare(self, entry: QueueEntryEntity) -> Optional[Tuple[ProgramEntity, CompiledProfile]]:
+        """Carga, valida y compila el programa de una entrada"""
+        try:
+            program = self.program_repository.get_program_by_id(entry.program_id)
+            if not program or not program.is_active:
+                self._finish(entry, 'failed', 'Programa no encontrado o desactivado')
+                return None
+
+            profile = compile_profile(program)
+            if profile.running_seconds <= 0:
+                self._finish(entry, 'failed', 'El programa no tiene duración')
+                return None
+
+            # Calienta en segundo plano la caché de la envolvente para que el arranque no la calcule
+            self.execution_manager.request_envelope(program.id)
+            return program, profile
+
+        except Exception as e:
+            print(f"Error preparando entrada {entry.id} de la cola: {e}")
+            self._finish(entry, 'failed', 'Error preparando el programa')
+            return None
+
+    def _preload_next(self):
+        """Prepara la siguiente entrada de las cámaras que están a punto de terminar"""
+        horizon = datetime.now() + timedelta(seconds=self.preload_seconds)
+        for chamber in self.execution_manager.get_running_chambers():
+            if chamber.execution_phase != "running" or not chamber.profile:
+                continue
+            if chamber.profile.remaining(chamber.program_elapsed_seconds) > self.preload_seconds:
+                continue
+
+            entry = self._next_entry(chamber.chamber_id)
+            if entry and entry.start_after and entry.start_after > horizon:
+                continue  # Aún falta para su hora de inicio
+            if entry and entry.id not in self._preloaded:
+                preloaded = self._prepare(entry)
+                if preloaded:
+                    self._preloaded[entry.id] = preloaded
+                    print(f"Cola: entrada {entry.id} precargada para la cámara {chamber.chamber_id}")
+
+    def _on_execution_finished(self, chamber_id: int, execution_id: int, status: str):
+        """Cierra la entrada de la ejecución terminada y planifica la siguiente"""
+        for entry in self._entries:
+            if entry.execution_id == execution_id and entry.status == 'running':
+                self._finish(entry, status)
+                if status == 'stopped' and self.pause_on_manual_stop:
+                    self.pause()
+                break
+
+        # Se arranca fuera de stop_execution, cuando termine de notificar el final
+        QTimer.singleShot(0, self.dispatch)
+
+    def _on_program_changed(self, program_id: int):
+        """Descarta los programas precargados que ya no están al día"""
+        for entry_id, (program, _profile) in list(self._preloaded.items()):
+            if program.id == program_id:
+                del self._preloaded[entry_id]
+
+    def _finish(self, entry: QueueEntryEntity, status: str, notes: Optional[str] = None):
+        """Marca una entrada como terminada y la retira de la cola en memoria"""
+        entry.status = status
+        if notes:
+            entry.notes = notes
+        self.repository.update_entry(entry)
+        if entry in self._entries:
+            self._entries.remove(entry)
+        self._preloaded.pop(entry.id, None)
+        if status in ('failed', 'cancelled'):
+            print(f"Cola: entrada {entry.id} {status}: {notes}")
+            self.entryFailed.emit(entry.id, notes or status)
+        self._changed()
+
+    def _find(self, entry_id: int) -> Optional[QueueEntryEntity]:
+        for entry in self._entries:
+            if entry.id == entry_id:
+                return entry
+        return None
+
+    def _changed(self):
+        self._update_timer()
+        self.queueChanged.emit()
@@ -0,0 +1,306 @@
+"""
+Ejecución aislada en procesos de trabajo
+Cada cámara ejecuta su lazo de control en un proceso propio y publica
+la telemetría en un buffer circular de memoria compartida
+"""
+
+import time
+import struct
+import multiprocessing
+from multiprocessing import shared_memory
+from typing import Optional, List, Tuple
+
+from data.entities.execution_entity import ExecutionEntity
+from data.entities.program_entity import ProgramEntity
+from hardware.pressure_sources import PressureSource
+from .chamber_execution import ChamberExecution, ChamberEventListener
+
+# Campos de cada muestra: instante (monotonic), presión, tiempo total,
+# tiempo de programa y banderas de estado
+SAMPLE_FIELDS = 5
+FLAG_MIN_REACHED = 1
+FLAG_MAX_EXCEEDED = 2
+FLAG_ALARM_ACTIVE = 4
+
+_HEADER = struct.Struct('<QQ')  # contador de escritura, capacidad
+_SAMPLE = struct.Struct('<' + 'd' * SAMPLE_FIELDS)
+
+
+class TelemetryRing:
+    """Buffer circular de muestras sobre multiprocessing.shared_memory"""
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self.shm = shm
+        self.owner = owner
+        _, self.capacity = _HEADER.unpack_from(shm.buf, 0)
+        # Vista sin copia de la zona de muestras (float64)
+        self._samples = shm.buf[_HEADER.size:_HEADER.size + self.capacity * _SAMPLE.size].cast('d')
+        self._read_count = 0
+        self.overruns = 0
+
+    @classmethod
+    def create(cls, capacity: int = 4096) -> 'TelemetryRing':
+        """Crea un nuevo buffer (lado del proceso principal)"""
+        shm = shared_memory.SharedMemory(create=True, size=_HEADER.size + capacity * _SAMPLE.size)
+        _HEADER.pack_into(shm.buf, 0, 0, capacity)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> 'TelemetryRing':
+        """Se conecta a un buffer existente (lado del proceso de trabajo)"""
+        return cls(shared_memory.SharedMemory(name=name), owner=False)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def _write_count(self) -> int:
+        return _HEADER.unpack_from(self.shm.buf, 0)[0]
+
+    def write(self, sample: Tuple[float, ...]):
+        """Escribe una muestra y publica el nuevo contador"""
+        count = self._write_count()
+        _SAMPLE.pack_into(self.shm.buf, _HEADER.size + (count % self.capacity) * _SAMPLE.size, *sample)
+        # El contador se publica después de la muestra
+        struct.pack_into('<Q', self.shm.buf, 0, count + 1)
+
+    def samples_view(self) -> memoryview:
+        """Vista float64 sin copia de todas las ranuras (capacity * SAMPLE_FIELDS)"""
+        return self._samples
+
+    def read_new(self) -> List[Tuple[float, ...]]:
+        """Devuelve las muestras escritas desde la última lectura"""
+        count = self._write_count()
+        if count - self._read_count > self.capacity:
+            # El lector se quedó atrás: se descartan las muestras sobrescritas
+            self.overruns += count - self._read_count - self.capacity
+            self._read_count = count - self.capacity
+
+        samples = []
+        for index in range(self._read_count, count):
+            offset = (index % self.capacity) * SAMPLE_FIELDS
+            samples.append(tuple(self._samples[offset:offset + SAMPLE_FIELDS]))
+
+        # Si el escritor dio la vuelta mientras se copiaba, descartar lo sobrescrito
+        latest = self._write_count()
+        if latest - self.capacity > self._read_count:
+            lost = latest - self.capacity - self._read_count
+            self.overruns += lost
+            samples = samples[lost:]
+
+        self._read_count = count
+        return samples
+
+    def close(self):
+        """Libera la vista y, si es el propietario, elimina el segmento"""
+        try:
+            self._samples.release()
+            self.shm.close()
+            if self.owner:
+                self.shm.unlink()
+        except Exception as e:
+            print(f"Error liberando memoria compartida de telemetría: {e}")
+
+
+class _WorkerListener(ChamberEventListener):
+    """Publica los eventos de la cámara en la tubería y las muestras en el buffer"""
+
+    def __init__(self, conn, ring: TelemetryRing):
+        self.conn = conn
+        self.ring = ring
+        self.detached = False  # El proceso principal ya no escucha
+        self.completed = False
+
+    def _send(self, *event):
+        if self.detached:
+            return
+        try:
+            self.conn.send(event)
+        except (BrokenPipeError, EOFError, OSError):
+            self.detached = True
+
+    def on_phase_changed(self, chamber, phase):
+        self._send('phase', phase)
+
+    def on_status(self, chamber, message):
+        self._send('status', message)
+
+    def on_progress(self, chamber, elapsed, remaining, percentage):
+        self._send('progress', elapsed, remaining, percentage)
+
+    def on_alarm(self, chamber, alarm_type, message):
+        self._send('alarm', alarm_type, message)
+
+    def on_pressure(self, chamber, pressure):
+        flags = 0
+        if chamber.min_pressure_reached:
+            flags |= FLAG_MIN_REACHED
+        if chamber.current_execution.max_pressure_exceeded:
+            flags |= FLAG_MAX_EXCEEDED
+        if chamber.alarm_active:
+            flags |= FLAG_ALARM_ACTIVE
+        self.ring.write((time.monotonic(), pressure, chamber.elapsed_seconds,
+                         chamber.program_elapsed_seconds, flags))
+
+    def on_completed(self, chamber):
+        self.completed = True
+        self._send('completed')
+
+
+def run_chamber_worker(chamber_id: int, execution: ExecutionEntity, program: ProgramEntity,
+                       resume: bool, ring_name: str, conn, tick_interval: float,
+                       seed: Optional[int] = None, pressure_source: Optional[PressureSource] = None):
+    """Punto de entrada del proceso de trabajo de una cámara"""
+    ring = TelemetryRing.attach(ring_name)
+    listener = _WorkerListener(conn, ring)
+    chamber = ChamberExecution(chamber_id, listener=listener, seed=seed, pressure_source=pressure_source)
+    # El proceso principal publica instantáneas numéricas: sin texto por tick
+    chamber.status_messages = False
+
+    try:
+        if resume:
+            chamber.resume(execution, program)
+        else:
+            chamber.start(execution, program)
+
+        # Planificación por tiempo absoluto: sin deriva acumulada
+        next_tick = time.monotonic() + tick_interval
+        while chamber.is_running and not listener.completed:
+            timeout = max(0.0, next_tick - time.monotonic())
+            if not listener.detached and conn.poll(timeout):
+                try:
+                    command = conn.recv()
+                except (EOFError, OSError):
+                    # El proceso principal desapareció: el lazo de control continúa
+                    listener.detached = True
+                    continue
+                if command and command[0] == 'stop':
+                    break
+                continue
+            elif listener.detached:
+                time.sleep(timeout)
+
+            chamber.step()
+            next_tick += tick_interval
+
+    except Exception as e:
+        listener._send('error', str(e))
+    finally:
+        ring.close()
+
+
+class ChamberWorkerProxy:
+    """Representante en el proceso principal de una cámara aislada"""
+
+    def __init__(self, chamber: ChamberExecution, ring_capacity: int = 4096, tick_interval: float = 1.0):
+        self.chamber = chamber
+        self.ring_capacity = ring_capacity
+        self.tick_interval = tick_interval
+        self.ring: Optional[TelemetryRing] = None
+        self.process = None
+        self.conn = None
+        self._finished = False
+
+    def start(self, resume: bool = False):
+        """Lanza el proceso de trabajo"""
+        # 'spawn' evita heredar el estado de Qt del proceso principal
+        context = multiprocessing.get_context('spawn')
+        self.ring = TelemetryRing.create(self.ring_capacity)
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=run_chamber_worker,
+            args=(self.chamber.chamber_id, self.chamber.current_execution, self.chamber.current_program,
+                  resume, self.ring.name, child_conn, self.tick_interval, self.chamber.seed,
+                  self.chamber.pressure_source),
+            name=f"chamber-{self.chamber.chamber_id}",
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self._finished = False
+
+    def poll(self, listener: ChamberEventListener):
+        """Vuelca eventos y muestras del proceso de trabajo sobre la cámara espejo"""
+        if not self.process:
+            return
+
+        events = []
+        try:
+            while self.conn.poll():
+                events.append(self.conn.recv())
+        except (EOFError, OSError):
+            pass
+
+        chamber = self.chamber
+        for sample in self.ring.read_new():
+            _, pressure, elapsed, program_elapsed, flags = sample
+            flags = int(flags)
+            chamber.current_pressure = pressure
+            chamber.elapsed_seconds = int(elapsed)
+            chamber.program_elapsed_seconds = int(program_elapsed)
+            chamber.min_pressure_reached = bool(flags & FLAG_MIN_REACHED)
+            chamber.alarm_active = bool(flags & FLAG_ALARM_ACTIVE)
+            chamber.current_execution.min_pressure_reached = chamber.min_pressure_reached
+            if flags & FLAG_MAX_EXCEEDED:
+                chamber.current_execution.max_pressure_exceeded = True
+            # Consigna y banda del segundo de la muestra (residuo de los detectores y telemetría)
+            if chamber.min_pressure_reached:
+                chamber.sync_setpoint()
+            listener.on_pressure(chamber, pressure)
+
+        completed = False
+        for event in events:
+            kind = event[0]
+            if kind == 'phase':
+                chamber.execution_phase = event[1]
+                listener.on_phase_changed(chamber, event[1])
+            elif kind == 'status':
+                listener.on_status(chamber, event[1])
+            elif kind == 'progress':
+                listener.on_progress(chamber, event[1], event[2], event[3])
+            elif kind == 'alarm':
+                chamber.alarm_count += 1
+                listener.on_alarm(chamber, event[1], event[2])
+            elif kind == 'completed':
+                completed = True
+            elif kind == 'error':
+                print(f"Error en proceso de la cámara {chamber.chamber_id}: {event[1]}")
+
+        # La finalización se notifica tras volcar todas las muestras
+        if completed and not self._finished:
+            self._finished = True
+            listener.on_completed(chamber)
+
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    @property
+    def finished(self) -> bool:
+        """True si el proceso notificó la finalización normal del programa"""
+        return self._finished
+
+    def drain_exited(self, listener: ChamberEventListener) -> bool:
+        """Vuelca lo que dejó un proceso ya terminado; True si terminó normalmente
+
+        El proceso envía 'completed' y sale: un sondeo anterior pudo vaciar la
+        tubería justo antes de ese mensaje, que sigue pendiente de leer.
+        """
+        self.poll(listener)
+        return self._finished
+
+    def stop(self, timeout: float = 2.0):
+        """Detiene el proceso de trabajo y libera la memoria compartida"""
+        if not self.process:
+            return
+        try:
+            self.conn.send(('stop',))
+        except (BrokenPipeError, EOFError, OSError):
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            print(f"Proceso de la cámara {self.chamber.chamber_id} no responde, terminando")
+            self.process.terminate()
+            self.process.join(timeout)
+        self.conn.close()
+        self.ring.close()
+        self.process = None
@@ -0,0 +1,104 @@
+"""
+Perfil compilado de un programa
+Convierte los segmentos rampa/mantenimiento en tablas densas de consigna y banda
+"""
+
+from array import array
+
+from data.entities.program_entity import ProgramEntity
+
+
+class CompiledProfile:
+    """Tablas por segundo de la fase de ejecución: consigna y banda de alarma
+
+    Cada tick obtiene su objetivo por índice (O(1)), sin aritmética de fechas.
+    """
+
+    __slots__ = ('setpoint', 'low', 'high', 'setup_seconds', 'running_seconds', 'segment_starts')
+
+    def __init__(self, setup_seconds: int, running_seconds: int):
+        self.setup_seconds = setup_seconds
+        self.running_seconds = running_seconds
+        size = max(1, running_seconds)
+        self.setpoint = array('d', bytes(8 * size))
+        self.low = array('d', bytes(8 * size))
+        self.high = array('d', bytes(8 * size))
+        self.segment_starts = array('l')  # Segundo de inicio de cada segmento
+
+    @property
+    def total_seconds(self) -> int:
+        """Duración nominal completa (setup + ejecución)"""
+        return self.setup_seconds + self.running_seconds
+
+    def index(self, program_elapsed_seconds: int) -> int:
+        """Índice de tabla para un segundo de ejecución (acotado al último)"""
+        if program_elapsed_seconds >= self.running_seconds:
+            return self.running_seconds - 1 if self.running_seconds else 0
+        return program_elapsed_seconds if program_elapsed_seconds > 0 else 0
+
+    def progress(self, program_elapsed_seconds: int) -> int:
+        """Porcentaje completado de la fase de ejecución"""
+        if self.running_seconds <= 0:
+            return 100
+        return min(100, program_elapsed_seconds * 100 // self.running_seconds)
+
+    def remaining(self, program_elapsed_seconds: int) -> int:
+        """Segundos restantes de la fase de ejecución"""
+        return max(0, self.running_seconds - program_elapsed_seconds)
+
+    def segment_at(self, program_elapsed_seconds: int) -> int:
+        """Número de segmento activo (0 si el programa no tiene segmentos)"""
+        current = 0
+        for position, start in enumerate(self.segment_starts):
+            if start > program_elapsed_seconds:
+                break
+            current = position
+        return current
+
+
+def compile_profile(program: ProgramEntity) -> CompiledProfile:
+    """Compila el perfil de un programa
+
+    Sin segmentos, el programa es una banda única [mín, máx] durante
+    program_duration con la consigna en el centro. Con segmentos, cada rampa
+    parte de la consigna anterior (la primera, de la presión mínima, que es
+    donde el setup entrega el control) y cada mantenimiento fija el
+    objetivo; la banda es consigna ± tolerancia.
+    """
+    setup_seconds = program.time_to_min_pressure * 60
+    center = (program.min_pressure + program.max_pressure) / 2.0
+
+    if not program.segments:
+        profile = CompiledProfile(setup_seconds, program.program_duration * 60)
+        for second in range(len(profile.setpoint)):
+            profile.setpoint[second] = center
+            profile.low[second] = program.min_pressure
+            profile.high[second] = program.max_pressure
+        profile.segment_starts.append(0)
+        return profile
+
+    running_seconds = sum(segment.duration_minutes * 60 for segment in program.segments)
+    profile = CompiledProfile(setup_seconds, running_seconds)
+    setpoint_table, low_table, high_table = profile.setpoint, profile.low, profile.high
+
+    second = 0
+    previous = program.min_pressure
+    for segment in program.segments:
+        duration = segment.duration_minutes * 60
+        profile.segment_starts.append(second)
+        target = segment.target_pressure
+        tolerance = segment.tolerance
+
+        for offset in range(duration):
+            if segment.segment_type == 'ramp':
+                value = previous + (target - previous) * (offset + 1) / duration
+            else:
+                value = target
+            setpoint_table[second] = value
+            low_table[second] = value - tolerance
+            high_table[second] = value + tolerance
+            second += 1
+
+        previous = target
+
+    return profile
@@ -5,15 +5,20 @@ Implementa las reglas de negocio para programas
 
 from typing import Optional, List, Dict, Any
 from data.repositories.program_repository import ProgramRepository
+from data.repositories.program_segment_repository import ProgramSegmentRepository
 from data.entities.program_entity import ProgramEntity
+from data.entities.program_segment_entity import ProgramSegmentEntity
 from .auth_service import AuthService
+from .event_bus import EventBus, PROGRAM_CREATED, PROGRAM_UPDATED, PROGRAM_DELETED, PROGRAM_SEGMENTS_UPDATED
 
 class ProgramService:
     """Servicio de gestión de programas con validaciones de negocio"""
     
     def __init__(self, auth_service: AuthService):
         self.program_repository = ProgramRepository()
+        self.segment_repository = ProgramSegmentRepository()
         self.auth_service = auth_service
+        self.event_bus = EventBus()
     
     def create_program(self, program_data: Dict[str, Any]) -> Dict[str, Any]:
         """Crea un nuevo programa con validaciones"""
@@ -60,6 +65,7 @@ class ProgramService:
             created_program = self.program_repository.create_program(program)
             
             if created_program:
+                self.event_bus.publish(PROGRAM_CREATED, program_id=created_program.id)
                 return {
                     'success': True,
                     'message': f"Programa '{created_program.name}' creado exitosamente",
@@ -127,11 +133,24 @@ class ProgramService:
             existing_program.time_to_min_pressure = int(program_data['time_to_min_pressure'])
             existing_program.program_duration = int(program_data['program_duration'])
             
+            # Los segmentos existentes deben seguir dentro de la nueva banda [mín, máx]
+            if existing_program.segments:
+                segments_validation = self._validate_segments(
+                    existing_program, [segment.to_dict() for segment in existing_program.segments]
+                )
+                if not segments_validation['valid']:
+                    return {
+                        'success': False,
+                        'message': f"{segments_validation['message']}. Ajuste el perfil antes de cambiar la banda",
+                        'program': None
+                    }
+            
             # Guardar cambios
             success = self.program_repository.update_program(existing_program)
             
             if success:
                 updated_program = self.program_repository.get_program_by_id(program_id)
+                self.event_bus.publish(PROGRAM_UPDATED, program_id=program_id)
                 return {
                     'success': True,
                     'message': f"Programa '{updated_program.name}' actualizado exitosamente",
@@ -174,6 +193,7 @@ class ProgramService:
             success = self.program_repository.delete_program(program_id)
             
             if success:
+                self.event_bus.publish(PROGRAM_DELETED, program_id=program_id)
                 return {
                     'success': True,
                     'message': f"Programa '{existing_program.name}' eliminado exitosamente"
@@ -191,6 +211,75 @@ class ProgramService:
                 'message': 'Error interno del sistema'
             }
     
+    def update_program_segments(self, program_id: int, segments_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Sustituye el perfil multi-segmento de un programa (lista vacía = banda única)"""
+        try:
+            # Verificar permisos
+            if not self.auth_service.can_manage_programs():
+                return {
+                    'success': False,
+                    'message': 'No tiene permisos para modificar programas',
+                    'program': None
+                }
+            
+            # Verificar que el programa existe
+            existing_program = self.program_repository.get_program_by_id(program_id)
+            if not existing_program:
+                return {
+                    'success': False,
+                    'message': 'Programa no encontrado',
+                    'program': None
+                }
+            
+            # Validar segmentos
+            validation_result = self._validate_segments(existing_program, segments_data)
+            if not validation_result['valid']:
+                return {
+                    'success': False,
+                    'message': validation_result['message'],
+                    'program': None
+                }
+            
+            segments = [
+                ProgramSegmentEntity(
+                    program_id=program_id,
+                    position=position,
+                    segment_type=str(data.get('segment_type', 'soak')),
+                    target_pressure=float(data['target_pressure']),
+                    duration_minutes=int(data['duration_minutes']),
+                    tolerance=float(data.get('tolerance', 1.0))
+                )
+                for position, data in enumerate(segments_data)
+            ]
+            
+            if not self.segment_repository.replace_segments(program_id, segments):
+                return {
+                    'success': False,
+                    'message': 'Error al guardar los segmentos del programa',
+                    'program': None
+                }
+            
+            # La duración del programa pasa a ser la suma de sus segmentos
+            if segments:
+                existing_program.program_duration = sum(segment.duration_minutes for segment in segments)
+                self.program_repository.update_program(existing_program)
+            
+            updated_program = self.program_repository.get_program_by_id(program_id)
+            self.event_bus.publish(PROGRAM_SEGMENTS_UPDATED, program_id=program_id)
+            return {
+                'success': True,
+                'message': f"Perfil de '{updated_program.name}' actualizado ({len(segments)} segmentos)",
+                'program': updated_program
+            }
+            
+        except Exception as e:
+            print(f"Error en update_program_segments: {e}")
+            return {
+                'success': False,
+                'message': 'Error interno del sistema',
+                'program': None
+            }
+    
     def get_all_programs(self) -> List[ProgramEntity]:
         """Obtiene todos los programas disponibles"""
         try:
@@ -213,6 +302,18 @@ class ProgramService:
             print(f"Error obteniendo programa: {e}")
             return None
     
+    def get_programs_page(self, before_id: Optional[int] = None, limit: int = 50,
+                          search_term: str = "") -> List[ProgramEntity]:
+        """Obtiene una página de programas (opcionalmente filtrada por término)"""
+        try:
+            if self.auth_service.is_authenticated():
+                return self.program_repository.get_programs_page(before_id, limit, search_term)
+            return []
+            
+        except Exception as e:
+            print(f"Error obteniendo página de programas: {e}")
+            return []
+    
     def search_programs(self, search_term: str) -> List[ProgramEntity]:
         """Busca programas por término"""
         try:
@@ -314,4 +415,62 @@ class ProgramService:
             return {
                 'valid': False,
                 'message': 'Error validando los datos del programa'
+            }
+    
+    def _validate_segments(self, program: ProgramEntity, segments_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Valida los segmentos de un perfil"""
+        try:
+            total_minutes = 0
+            for position, data in enumerate(segments_data, start=1):
+                if data.get('segment_type', 'soak') not in ('ramp', 'soak'):
+                    return {
+                        'valid': False,
+                        'message': f'Segmento {position}: el tipo debe ser rampa o mantenimiento'
+                    }
+                
+                try:
+                    target = float(data['target_pressure'])
+                    duration = int(data['duration_minutes'])
+                    tolerance = float(data.get('tolerance', 1.0))
+                except (KeyError, ValueError, TypeError):
+                    return {
+                        'valid': False,
+                        'message': f'Segmento {position}: presión, duración y tolerancia deben ser números válidos'
+                    }
+                
+                # La consigna de cada segmento debe quedar dentro de la banda de seguridad
+                if target < program.min_pressure or target > program.max_pressure:
+                    return {
+                        'valid': False,
+                        'message': f'Segmento {position}: la presión objetivo debe estar entre '
+                                   f'{program.min_pressure} y {program.max_pressure} PSI'
+                    }
+                
+                if duration < 1:
+                    return {
+                        'valid': False,
+                        'message': f'Segmento {position}: la duración debe ser al menos 1 minuto'
+                    }
+                
+                if tolerance <= 0:
+                    return {
+                        'valid': False,
+                        'message': f'Segmento {position}: la tolerancia debe ser mayor que cero'
+                    }
+                
+                total_minutes += duration
+            
+            if total_minutes > 1440:  # 24 horas máximo
+                return {
+                    'valid': False,
+                    'message': 'La duración total de los segmentos no puede exceder 24 horas (1440 minutos)'
+                }
+            
+            return {'valid': True, 'message': 'Segmentos válidos'}
+            
+        except Exception as e:
+            print(f"Error validando segmentos: {e}")
+            return {
+                'valid': False,
+                'message': 'Error validando los segmentos del programa'
             }
\ No newline at end of file
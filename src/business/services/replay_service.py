@@ -0,0 +1,283 @@
+"""
+Servicio de repetición de ejecuciones grabadas
+Reproduce las lecturas de pressure_readings a través de la misma lógica de
+fases y alarmas, de 1x a 1000x, con posibilidad de saltar a cualquier punto
+"""
+
+from typing import Optional, Dict, Any
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from data.repositories.execution_repository import ExecutionRepository
+from data.repositories.program_repository import ProgramRepository
+from data.repositories.reading_stream import PressureReadingStream
+from data.entities.execution_entity import ExecutionEntity
+from data.entities.program_entity import ProgramEntity
+from hardware.pressure_sources import PressureSource
+from .chamber_execution import ChamberExecution, ChamberEventListener
+from .simulation_service import SimulationService, SimulationResult, VirtualClock
+
+
+class RecordedPressureSource(PressureSource):
+    """Fuente de presión que entrega las lecturas grabadas de una ejecución"""
+
+    def __init__(self, stream: PressureReadingStream):
+        self.stream = stream
+        self.exhausted = False
+
+    def read(self, chamber) -> Optional[float]:
+        sample = self.stream.next()
+        if sample is None:
+            self.exhausted = True
+            return None
+        return sample[0]
+
+
+class _ReplayListener(ChamberEventListener):
+    """Acumula los eventos de un lote para emitir solo el último de cada tipo"""
+
+    def __init__(self):
+        self.muted = False
+        self.clear()
+
+    def clear(self):
+        self.pressure = None
+        self.progress = None
+        self.status = None
+        self.alarm = None
+        self.phases = []
+        self.completed = False
+
+    def on_phase_changed(self, chamber, phase):
+        if not self.muted:
+            self.phases.append(phase)
+
+    def on_status(self, chamber, message):
+        self.status = message
+
+    def on_progress(self, chamber, elapsed, remaining, percentage):
+        self.progress = (elapsed, remaining, percentage)
+
+    def on_alarm(self, chamber, alarm_type, message):
+        self.alarm = (alarm_type, message)
+
+    def on_pressure(self, chamber, pressure):
+        self.pressure = pressure
+
+    def on_completed(self, chamber):
+        self.completed = True
+
+
+class ReplayService(QObject):
+    """Repetición acelerada de una ejecución grabada"""
+
+    replayStarted = pyqtSignal(int, int)  # execution_id, total_seconds
+    replayFinished = pyqtSignal(int, str)  # execution_id, status
+    positionChanged = pyqtSignal(int, int)  # position_seconds, total_seconds
+    pressureUpdated = pyqtSignal(float)
+    progressUpdated = pyqtSignal(int, int, int)  # elapsed, remaining, percentage
+    statusUpdated = pyqtSignal(str)
+    alarmTriggered = pyqtSignal(str, str)  # alarm_type, message
+    phaseChanged = pyqtSignal(str)
+
+    MIN_SPEED = 1.0
+    MAX_SPEED = 1000.0
+    TIMER_INTERVAL_MS = 20
+
+    def __init__(self):
+        super().__init__()
+        self.execution_repository = ExecutionRepository()
+        self.program_repository = ProgramRepository()
+
+        self.execution: Optional[ExecutionEntity] = None
+        self.program: Optional[ProgramEntity] = None
+        self.stream: Optional[PressureReadingStream] = None
+        self.chamber: Optional[ChamberExecution] = None
+        self.clock: Optional[VirtualClock] = None
+        self._listener = _ReplayListener()
+        self.speed = 1.0
+        self._budget = 0.0  # Muestras pendientes (fraccionarias) según la velocidad
+        self._last_position: Optional[int] = None  # Última posición emitida
+
+        # Un único temporizador; la velocidad decide cuántas muestras procesa cada disparo
+        self.replay_timer = QTimer()
+        self.replay_timer.timeout.connect(self._on_timer)
+        self.replay_timer.setInterval(self.TIMER_INTERVAL_MS)
+
+    def load(self, execution_id: int) -> Dict[str, Any]:
+        """Prepara la repetición de una ejecución grabada"""
+        return self.open(self.fetch(execution_id))
+
+    def fetch(self, execution_id: int) -> Dict[str, Any]:
+        """Consulta ejecución, programa y lecturas sin tocar el estado (apto para un hilo de trabajo)"""
+        try:
+            execution = self.execution_repository.get_execution_by_id(execution_id)
+            if not execution:
+                return {'success': False, 'message': 'Ejecución no encontrada'}
+
+            program = self.program_repository.get_program_by_id(execution.program_id)
+            if not program:
+                return {'success': False, 'message': 'Programa asociado no encontrado'}
+
+            stream = PressureReadingStream(execution_id)
+            if stream.total() == 0:
+                return {'success': False, 'message': 'La ejecución no tiene lecturas grabadas'}
+
+            return {
+                'success': True,
+                'execution': execution,
+                'program': program,
+                'stream': stream
+            }
+
+        except Exception as e:
+            print(f"Error preparando repetición: {e}")
+            return {'success': False, 'message': 'Error interno del sistema'}
+
+    def open(self, fetched: Dict[str, Any]) -> Dict[str, Any]:
+        """Arranca la repetición con lo consultado por fetch() (hilo de la interfaz)"""
+        if not fetched.get('success'):
+            return fetched
+        try:
+            self.stop()
+
+            self.execution = fetched['execution']
+            self.program = fetched['program']
+            self.stream = fetched['stream']
+
+            self._rewind()
+            self.replayStarted.emit(self.execution.id, self.stream.total())
+
+            return {
+                'success': True,
+                'message': f"Repetición de '{self.program.name}' preparada ({self.stream.total()} s)",
+                'total_seconds': self.stream.total()
+            }
+
+        except Exception as e:
+            print(f"Error preparando repetición: {e}")
+            return {'success': False, 'message': 'Error interno del sistema'}
+
+    def _rewind(self):
+        """Reinicia la cámara de repetición al principio de la grabación"""
+        self.stream.seek(0)
+        self.clock = VirtualClock(self.execution.start_time)
+        # Copia de la ejecución: la repetición no modifica el registro original
+        replay_execution = ExecutionEntity(id=self.execution.id, program_id=self.execution.program_id,
+                                           start_time=self.execution.start_time,
+                                           chamber_id=self.execution.chamber_id)
+        self.chamber = ChamberExecution(self.execution.chamber_id, listener=self._listener,
+                                        clock=self.clock,
+                                        pressure_source=RecordedPressureSource(self.stream))
+        self._listener.muted = True
+        self.chamber.start(replay_execution, self.program)
+        self._listener.muted = False
+        self._listener.clear()
+        self._budget = 0.0
+        self._last_position = None
+
+    def play(self, speed: Optional[float] = None):
+        """Inicia o reanuda la repetición"""
+        if not self.chamber:
+            return
+        if speed is not None:
+            self.set_speed(speed)
+        self.replay_timer.start()
+
+    def pause(self):
+        """Pausa la repetición"""
+        self.replay_timer.stop()
+
+    def set_speed(self, speed: float):
+        """Cambia la velocidad (1x a 1000x)"""
+        self.speed = max(self.MIN_SPEED, min(self.MAX_SPEED, float(speed)))
+
+    def seek(self, seconds: int):
+        """Salta al segundo indicado reevaluando fases y alarmas hasta ese punto"""
+        if not self.chamber:
+            return
+        seconds = max(0, min(int(seconds), self.stream.total()))
+
+        if seconds < self.chamber.elapsed_seconds:
+            self._rewind()
+
+        # Avance rápido sin emitir señales: el estado de alarma queda coherente
+        self.chamber.status_messages = False
+        self._listener.muted = True
+        while self.chamber.elapsed_seconds < seconds and not self._listener.completed:
+            self._advance()
+            if self.chamber.pressure_source.exhausted:
+                break
+        self._listener.muted = False
+        self.chamber.status_messages = True
+
+        self._publish()
+
+    def stop(self):
+        """Detiene la repetición y libera el estado"""
+        self.replay_timer.stop()
+        self.chamber = None
+
+    def _advance(self):
+        """Procesa una muestra grabada (un segundo de ejecución)"""
+        self.clock.advance(1)
+        self.chamber.step()
+
+    def _on_timer(self):
+        """Procesa las muestras que corresponden a la velocidad actual"""
+        self._budget += self.speed * self.TIMER_INTERVAL_MS / 1000.0
+        samples = int(self._budget)
+        self._budget -= samples
+        if samples == 0:
+            return  # A baja velocidad la mayoría de disparos no llegan a una muestra
+
+        # Solo el último mensaje de estado del lote se formatea
+        self.chamber.status_messages = False
+        for index in range(samples):
+            if index == samples - 1:
+                self.chamber.status_messages = True
+            self._advance()
+            if self._listener.completed or self.chamber.pressure_source.exhausted:
+                break
+
+        self._publish()
+
+        if self._listener.completed or self.chamber.pressure_source.exhausted:
+            status = 'completed' if self._listener.completed else self.execution.status
+            self.replay_timer.stop()
+            self.replayFinished.emit(self.execution.id, status)
+
+    def _publish(self):
+        """Emite el estado acumulado del lote (coalescido)"""
+        listener = self._listener
+        for phase in listener.phases:
+            self.phaseChanged.emit(phase)
+        if listener.alarm:
+            self.alarmTriggered.emit(*listener.alarm)
+        if listener.progress:
+            self.progressUpdated.emit(*listener.progress)
+        if listener.status:
+            self.statusUpdated.emit(listener.status)
+        if listener.pressure is not None:
+            self.pressureUpdated.emit(listener.pressure)
+        if self.chamber.elapsed_seconds != self._last_position:
+            self._last_position = self.chamber.elapsed_seconds
+            self.positionChanged.emit(self._last_position, self.stream.total())
+        completed = listener.completed
+        listener.clear()
+        listener.completed = completed
+
+    def replay_headless(self, execution_id: int) -> Optional[SimulationResult]:
+        """Repite una ejecución sin interfaz (pruebas de regresión de alarmas)"""
+        try:
+            execution = self.execution_repository.get_execution_by_id(execution_id)
+            program = self.program_repository.get_program_by_id(execution.program_id) if execution else None
+            if not program:
+                return None
+
+            source = RecordedPressureSource(PressureReadingStream(execution_id))
+            return SimulationService().simulate(program, seed=None, record_readings=True,
+                                                pressure_source=source)
+
+        except Exception as e:
+            print(f"Error repitiendo ejecución {execution_id}: {e}")
+            return None
@@ -0,0 +1,46 @@
+"""
+Historial de muestras en memoria
+Anillo de capacidad fija (tiempo, presión) que alimenta las gráficas de tendencia
+"""
+
+from array import array
+from typing import List, Tuple
+
+
+class SampleHistory:
+    """Últimas 'capacity' muestras de una cámara en dos arrays de dobles
+
+    append() no reserva memoria. Los consumidores leen de forma incremental:
+    guardan 'total' tras cada lectura y piden solo lo nuevo con
+    get_since(); si 'generation' cambia (nueva ejecución) deben reconstruir.
+    """
+
+    def __init__(self, capacity: int = 14400):
+        self.capacity = max(1, capacity)
+        self._times = array('d', bytes(8 * self.capacity))
+        self._values = array('d', bytes(8 * self.capacity))
+        self.total = 0  # Muestras añadidas desde el último clear()
+        self.generation = 0
+
+    def clear(self):
+        self.total = 0
+        self.generation += 1
+
+    def append(self, timestamp: float, value: float):
+        index = self.total % self.capacity
+        self._times[index] = timestamp
+        self._values[index] = value
+        self.total += 1
+
+    def __len__(self) -> int:
+        return min(self.total, self.capacity)
+
+    def get_since(self, total: int) -> List[Tuple[float, float]]:
+        """Muestras añadidas desde que el consumidor vio 'total' (las que sigan en el anillo)"""
+        start = max(total, self.total - self.capacity, 0)
+        times, values, capacity = self._times, self._values, self.capacity
+        return [(times[i % capacity], values[i % capacity]) for i in range(start, self.total)]
+
+    def get_all(self) -> List[Tuple[float, float]]:
+        """Todas las muestras retenidas, de la más antigua a la más reciente"""
+        return self.get_since(0)
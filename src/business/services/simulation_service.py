@@ -0,0 +1,159 @@
+"""
+Servicio de simulación de programas
+Ejecuta programas sin interfaz sobre un reloj virtual, más rápido que el tiempo real
+"""
+
+import random
+from array import array
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Optional, List, Tuple, Dict, Any
+
+from data.entities.execution_entity import ExecutionEntity
+from data.entities.program_entity import ProgramEntity
+from hardware.pressure_sources import PressureSource, create_pressure_source
+from .chamber_execution import ChamberExecution, ChamberEventListener
+
+
+class VirtualClock:
+    """Reloj virtual que solo avanza cuando se le indica"""
+
+    def __init__(self, start: Optional[datetime] = None):
+        self._now = start or datetime(2000, 1, 1)
+
+    def __call__(self) -> datetime:
+        return self._now
+
+    def advance(self, seconds: float):
+        """Avanza el reloj los segundos indicados"""
+        self._now += timedelta(seconds=seconds)
+
+
+@dataclass
+class SimulationResult:
+    """Resultado de una ejecución simulada"""
+
+    program_name: str
+    seed: Optional[int]
+    final_status: str = "running"  # 'completed' o 'stopped' (límite de tiempo alcanzado)
+    total_seconds: int = 0
+    setup_seconds: Optional[int] = None  # None si no se alcanzó la presión mínima
+    readings: array = field(default_factory=lambda: array('d'))
+    alarms: List[Tuple[int, str, str]] = field(default_factory=list)  # (segundo, tipo, mensaje)
+    phases: List[Tuple[int, str]] = field(default_factory=list)  # (segundo, fase)
+    red_alarm_count: int = 0
+    time_in_band_seconds: int = 0
+    running_seconds: int = 0
+    max_pressure_exceeded: bool = False
+
+    def to_dict(self) -> dict:
+        """Convierte el resultado a diccionario (sin la serie de lecturas)"""
+        return {
+            'program_name': self.program_name,
+            'seed': self.seed,
+            'final_status': self.final_status,
+            'total_seconds': self.total_seconds,
+            'setup_seconds': self.setup_seconds,
+            'red_alarm_count': self.red_alarm_count,
+            'time_in_band_seconds': self.time_in_band_seconds,
+            'running_seconds': self.running_seconds,
+            'time_in_band_ratio': (self.time_in_band_seconds / self.running_seconds
+                                   if self.running_seconds else 0.0),
+            'max_pressure_exceeded': self.max_pressure_exceeded,
+            'reading_count': len(self.readings)
+        }
+
+
+class _RecordingListener(ChamberEventListener):
+    """Registra los eventos de la cámara simulada"""
+
+    def __init__(self, result: SimulationResult, record_readings: bool):
+        self.result = result
+        self.record_readings = record_readings
+        self.completed = False
+
+    def on_phase_changed(self, chamber, phase):
+        self.result.phases.append((chamber.elapsed_seconds, phase))
+        if phase == "running" and self.result.setup_seconds is None:
+            self.result.setup_seconds = chamber.elapsed_seconds
+
+    def on_alarm(self, chamber, alarm_type, message):
+        self.result.alarms.append((chamber.elapsed_seconds, alarm_type, message))
+        if alarm_type == "red":
+            self.result.red_alarm_count += 1
+
+    def on_pressure(self, chamber, pressure):
+        if self.record_readings:
+            self.result.readings.append(pressure)
+        # El tick que pasa de setup a running aún pertenece al setup
+        if chamber.execution_phase == "running" and chamber.elapsed_seconds > self.result.setup_seconds:
+            self.result.running_seconds += 1
+            if chamber.band_low <= pressure <= chamber.band_high:
+                self.result.time_in_band_seconds += 1
+
+    def on_completed(self, chamber):
+        self.completed = True
+
+
+class SimulationService:
+    """Simulador determinista de programas con la misma lógica que la ejecución real"""
+
+    # Margen sobre la duración nominal antes de abandonar la simulación
+    EXTRA_SECONDS = 3600
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        # Configuración de ejecución: decide el modelo de presión por defecto
+        self.config = config or {}
+
+    def simulate(self, program: ProgramEntity, seed: Optional[int] = 0,
+                 max_seconds: Optional[int] = None, record_readings: bool = True,
+                 pressure_source: Optional[PressureSource] = None) -> SimulationResult:
+        """Simula un programa completo y devuelve lecturas, alarmas y estado final
+
+        Con pressure_source se sustituye el modelo simulado (p. ej. por una
+        ejecución grabada); la simulación termina cuando la fuente se agota.
+        """
+        if pressure_source is None:
+            pressure_source = create_pressure_source(self.config)
+
+        result = SimulationResult(program_name=program.name, seed=seed)
+        listener = _RecordingListener(result, record_readings)
+        clock = VirtualClock()
+        chamber = ChamberExecution(0, listener=listener, clock=clock,
+                                   rng=random.Random(), seed=seed,
+                                   pressure_source=pressure_source)
+        chamber.status_messages = False
+
+        execution = ExecutionEntity(id=0, program_id=program.id or 0, start_time=clock())
+        chamber.start(execution, program)
+
+        if max_seconds is None:
+            max_seconds = (program.time_to_min_pressure + program.program_duration) * 60 + self.EXTRA_SECONDS
+
+        # El mismo paso de 1 s que el planificador real, sin esperas
+        source = chamber.pressure_source
+        while not listener.completed and chamber.elapsed_seconds < max_seconds and not source.exhausted:
+            clock.advance(1)
+            chamber.step()
+
+        result.total_seconds = chamber.elapsed_seconds
+        result.max_pressure_exceeded = execution.max_pressure_exceeded
+
+        if listener.completed:
+            result.final_status = 'completed'
+            # Igual que ExecutionManager.stop_execution al completar
+            result.alarms.append((chamber.elapsed_seconds, "green",
+                                  f"Programa {program.name} completado exitosamente"))
+            result.phases.append((chamber.elapsed_seconds, "completed"))
+        else:
+            result.final_status = 'stopped'
+
+        return result
+
+    def simulate_to_dict(self, program: ProgramEntity, seed: Optional[int] = 0) -> Dict[str, Any]:
+        """Simula un programa y devuelve el resumen como diccionario"""
+        try:
+            return self.simulate(program, seed, record_readings=False).to_dict()
+        except Exception as e:
+            print(f"Error simulando programa: {e}")
+            return {'program_name': program.name, 'final_status': 'error'}
@@ -0,0 +1,131 @@
+"""
+Servicio de barrido de parámetros
+Valida variantes de programas simulándolas en paralelo en todos los núcleos
+"""
+
+import os
+import itertools
+import multiprocessing
+from dataclasses import replace
+from typing import Dict, Any, List, Iterable, Optional, Sequence, Tuple
+
+from data.entities.program_entity import ProgramEntity
+from .simulation_service import SimulationService
+
+# Parámetros de programa que se pueden barrer
+SWEEP_FIELDS = ('min_pressure', 'max_pressure', 'time_to_min_pressure', 'program_duration')
+_INTEGER_FIELDS = ('time_to_min_pressure', 'program_duration')
+# Con segmentos el perfil sale de ellos: estos campos no cambian la simulación
+_UNSEGMENTED_FIELDS = ('max_pressure', 'program_duration')
+
+
+def _expand_range(field_name: str, spec) -> List:
+    """Convierte una especificación (lista o {start, stop, step}) en valores"""
+    if isinstance(spec, dict):
+        start, stop = spec['start'], spec['stop']
+        step = spec.get('step', 1)
+        if step <= 0:
+            raise ValueError(f"El paso de '{field_name}' debe ser positivo")
+        values = []
+        index = 0
+        while start + index * step <= stop + 1e-9:
+            values.append(start + index * step)
+            index += 1
+    else:
+        values = list(spec)
+
+    if field_name in _INTEGER_FIELDS:
+        return [int(round(value)) for value in values]
+    return [float(value) for value in values]
+
+
+def _validate_variant(program: ProgramEntity) -> Optional[str]:
+    """Reglas básicas de ProgramService; devuelve el motivo si la variante no es válida"""
+    if program.min_pressure < 0:
+        return 'presión mínima negativa'
+    if program.max_pressure <= program.min_pressure:
+        return 'presión máxima no mayor que la mínima'
+    if program.time_to_min_pressure < 1:
+        return 'tiempo a presión mínima menor de 1 minuto'
+    if program.program_duration < program.time_to_min_pressure:
+        return 'duración menor que el tiempo a presión mínima'
+    # Como al guardar segmentos: cada consigna dentro de la banda de la variante
+    for position, segment in enumerate(program.segments or [], start=1):
+        if not program.min_pressure <= segment.target_pressure <= program.max_pressure:
+            return f'segmento {position} fuera de la banda de presión'
+    return None
+
+
+def _simulate_variant(task: Tuple[ProgramEntity, int, Dict[str, Any]]) -> Dict[str, Any]:
+    """Tarea del pool: simula una variante (debe ser de nivel de módulo para poder serializarse)"""
+    program, seed, config = task
+    summary = SimulationService(config).simulate_to_dict(program, seed)
+    summary.update({field_name: getattr(program, field_name) for field_name in SWEEP_FIELDS})
+    summary['program_id'] = program.id
+    return summary
+
+
+class ParameterSweepService:
+    """Barrido paralelo de parámetros sobre el simulador determinista"""
+
+    def __init__(self, processes: Optional[int] = None, config: Optional[Dict[str, Any]] = None):
+        # Por defecto, todos los núcleos disponibles
+        self.processes = processes or os.cpu_count() or 1
+        # Configuración de ejecución (modelo de presión y parámetros del lazo)
+        self.config = config or {}
+
+    def build_variants(self, program: ProgramEntity,
+                       ranges: Dict[str, Any]) -> Tuple[List[ProgramEntity], List[Dict[str, Any]]]:
+        """Genera el producto cartesiano de rangos; devuelve (válidas, descartadas)"""
+        unknown = set(ranges) - set(SWEEP_FIELDS)
+        if unknown:
+            raise ValueError(f"Parámetros no soportados: {', '.join(sorted(unknown))}")
+        if program.segments:
+            ignored = [name for name in _UNSEGMENTED_FIELDS if name in ranges]
+            if ignored:
+                raise ValueError(f"Parámetros sin efecto en un programa con segmentos: {', '.join(ignored)}")
+
+        names = [name for name in SWEEP_FIELDS if name in ranges]
+        value_lists = [_expand_range(name, ranges[name]) for name in names]
+
+        variants, rejected = [], []
+        for combination in itertools.product(*value_lists):
+            variant = replace(program, **dict(zip(names, combination)))
+            reason = _validate_variant(variant)
+            if reason:
+                rejected.append({**dict(zip(names, combination)), 'reason': reason})
+            else:
+                variants.append(variant)
+        return variants, rejected
+
+    def run_variants(self, programs: Iterable[ProgramEntity],
+                     seeds: Sequence[int] = (0,)) -> List[Dict[str, Any]]:
+        """Simula cada programa con cada semilla en un pool de procesos"""
+        tasks = [(program, seed, self.config) for program in programs for seed in seeds]
+        if not tasks:
+            return []
+
+        if self.processes <= 1 or len(tasks) == 1:
+            return [_simulate_variant(task) for task in tasks]
+
+        # Lotes grandes para amortizar la serialización entre procesos
+        chunksize = max(1, len(tasks) // (self.processes * 4))
+        context = multiprocessing.get_context('spawn')
+        with context.Pool(self.processes) as pool:
+            return pool.map(_simulate_variant, tasks, chunksize=chunksize)
+
+    def sweep(self, program: ProgramEntity, ranges: Dict[str, Any],
+              seeds: Sequence[int] = (0,)) -> Dict[str, Any]:
+        """Barre los rangos indicados sobre un programa base"""
+        variants, rejected = self.build_variants(program, ranges)
+        print(f"Barrido de '{program.name}': {len(variants)} variantes válidas, "
+              f"{len(rejected)} descartadas, {self.processes} procesos")
+        return {
+            'results': self.run_variants(variants, seeds),
+            'rejected': rejected
+        }
+
+    def sweep_catalog(self, programs: Iterable[ProgramEntity],
+                      seeds: Sequence[int] = (0,)) -> List[Dict[str, Any]]:
+        """Valida un catálogo completo de programas"""
+        return self.run_variants(list(programs), seeds)
@@ -0,0 +1,166 @@
+"""
+Canal de telemetría por etapas
+adquisición → acondicionamiento → evaluación → persistencia → publicación,
+con colas acotadas y métricas de latencia, profundidad y descartes por etapa
+"""
+
+import time
+from collections import deque
+from typing import Optional, Dict, Any, Callable, List
+
+from hardware.pressure_sources import ConditionedPressureSource
+from .chamber_execution import ChamberExecution
+
+STAGE_NAMES = ('acquire', 'condition', 'evaluate', 'persist', 'publish')
+
+
+class PipelineStage:
+    """Etapa con cola acotada opcional y contadores propios
+
+    Las etapas síncronas (sin cola) solo registran su latencia; las etapas con
+    cola se vacían por lotes con drain() y descartan según su política.
+    """
+
+    def __init__(self, name: str, handler: Optional[Callable[[List[Any]], None]] = None,
+                 capacity: int = 0, drop_policy: str = 'drop_oldest', batch_size: Optional[int] = None):
+        if drop_policy not in ('drop_oldest', 'drop_newest'):
+            raise ValueError(f"Política de descarte no soportada: {drop_policy}")
+        self.name = name
+        self.handler = handler
+        self.capacity = capacity
+        self.drop_policy = drop_policy
+        self.batch_size = batch_size  # Máximo por vaciado (None = todo)
+        self.enabled = True
+        self.queue: deque = deque()
+        self.processed = 0
+        self.dropped = 0
+        self.max_depth = 0
+        self.last_latency_us = 0.0
+        self.avg_latency_us = 0.0  # Media exponencial por elemento
+        self._total_ns = 0
+
+    def record(self, elapsed_ns: int, count: int = 1):
+        """Registra el tiempo empleado en procesar 'count' elementos"""
+        self.processed += count
+        self._total_ns += elapsed_ns
+        latency = elapsed_ns / 1000.0 / count
+        self.last_latency_us = latency
+        self.avg_latency_us += 0.1 * (latency - self.avg_latency_us) if self.avg_latency_us else latency
+
+    def put(self, item) -> bool:
+        """Encola un elemento; False si se descartó"""
+        queue = self.queue
+        if self.capacity and len(queue) >= self.capacity:
+            self.dropped += 1
+            if self.drop_policy == 'drop_newest':
+                return False
+            queue.popleft()
+        queue.append(item)
+        if len(queue) > self.max_depth:
+            self.max_depth = len(queue)
+        return True
+
+    def drain(self) -> int:
+        """Procesa los elementos pendientes en un lote"""
+        queue = self.queue
+        if not queue or not self.enabled:
+            return 0
+
+        if self.batch_size is None or len(queue) <= self.batch_size:
+            batch = list(queue)
+            queue.clear()
+        else:
+            batch = [queue.popleft() for _ in range(self.batch_size)]
+
+        start = time.perf_counter_ns()
+        self.handler(batch)
+        self.record(time.perf_counter_ns() - start, len(batch))
+        return len(batch)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            'stage': self.name,
+            'processed': self.processed,
+            'dropped': self.dropped,
+            'depth': len(self.queue),
+            'max_depth': self.max_depth,
+            'capacity': self.capacity,
+            'enabled': self.enabled,
+            'last_latency_us': round(self.last_latency_us, 2),
+            'avg_latency_us': round(self.avg_latency_us, 2),
+            'total_ms': round(self._total_ns / 1e6, 3)
+        }
+
+
+class TelemetryPipeline:
+    """Ruta de ejecución por etapas compartida por todas las cámaras
+
+    La adquisición, el acondicionamiento y la evaluación se ejecutan en el tick
+    de control; la persistencia y la publicación reciben los resultados por
+    colas acotadas. La cola de persistencia se vacía al final del tick hacia
+    el buffer en memoria del escritor de lecturas, que escribe en la base de
+    datos desde su propio hilo; la de publicación la vacía el refresco de
+    pantalla. Así una base de datos lenta no retrasa el lazo de control.
+    """
+
+    def __init__(self, persist_handler: Callable[[List[Any]], None],
+                 publish_handler: Callable[[List[Any]], None],
+                 config: Optional[Dict[str, Any]] = None):
+        config = config or {}
+        persist_config = config.get('persist', {}) or {}
+        publish_config = config.get('publish', {}) or {}
+
+        self.stages: Dict[str, PipelineStage] = {
+            'acquire': PipelineStage('acquire'),
+            'condition': PipelineStage('condition'),
+            'evaluate': PipelineStage('evaluate'),
+            'persist': PipelineStage('persist', persist_handler,
+                                     capacity=int(persist_config.get('capacity', 10000)),
+                                     drop_policy=persist_config.get('drop_policy', 'drop_oldest'),
+                                     batch_size=persist_config.get('batch_size')),
+            'publish': PipelineStage('publish', publish_handler,
+                                     capacity=int(publish_config.get('capacity', 256)),
+                                     drop_policy=publish_config.get('drop_policy', 'drop_oldest'),
+                                     batch_size=publish_config.get('batch_size')),
+        }
+
+    def stage(self, name: str) -> PipelineStage:
+        return self.stages[name]
+
+    def run_tick(self, chamber: ChamberExecution):
+        """Adquiere, acondiciona y evalúa una muestra de la cámara"""
+        if not chamber.is_running or not chamber.current_program or not chamber.current_execution:
+            return
+
+        stages = self.stages
+        source = chamber.pressure_source
+        clock = time.perf_counter_ns
+
+        start = clock()
+        if isinstance(source, ConditionedPressureSource):
+            samples = source.source.read_block(chamber)
+            acquired = clock()
+            stages['acquire'].record(acquired - start)
+            if not samples:
+                return
+            pressure = source.condition(chamber, samples)
+            start = clock()
+            stages['condition'].record(start - acquired)
+        else:
+            pressure = source.read(chamber)
+            acquired = clock()
+            stages['acquire'].record(acquired - start)
+            if pressure is None:
+                return
+            start = acquired
+
+        chamber.step(pressure)
+        stages['evaluate'].record(clock() - start)
+
+    def drain(self):
+        """Vacía las etapas con cola (persistencia antes que publicación)"""
+        self.stages['persist'].drain()
+        self.stages['publish'].drain()
+
+    def get_metrics(self) -> List[Dict[str, Any]]:
+        return [self.stages[name].get_metrics() for name in STAGE_NAMES]
@@ -0,0 +1,71 @@
+"""
+Vigilante de cambios externos en la base de datos
+Detecta escrituras de otras conexiones mediante PRAGMA data_version
+"""
+
+from typing import Optional
+from data.database.connection import DatabaseConnection
+
+
+class DataVersionWatcher:
+    """Comprueba si otro proceso ha confirmado cambios desde la última consulta
+
+    PRAGMA data_version se lee en la conexión del hilo principal, así que no
+    cambia con sus propias escrituras pero sí con las de cualquier otra
+    conexión, incluidas las de los hilos de trabajo de la propia aplicación.
+    Esas se descuentan con el contador de confirmaciones del gestor: si en
+    el intervalo hubo escrituras propias, el cambio se atribuye a ellas (una
+    escritura externa que coincida en el mismo intervalo no se avisa).
+
+    El hilo de volcado de lecturas confirma cada pocos segundos durante toda
+    la ejecución, así que sus confirmaciones se cuentan aparte: cuando solo
+    escribió él, se compara una huella de lo que revisa la reconciliación
+    (ejecuciones en curso y programas activos), que sus inserciones no
+    alteran.
+    """
+
+    def __init__(self):
+        self.db = DatabaseConnection()
+        self._version: Optional[int] = None
+        self._worker_commits = 0
+        self._writer_commits = 0
+        self._fingerprint: Optional[tuple] = None
+
+    def _read_version(self) -> int:
+        cursor = self.db.get_connection().cursor()
+        cursor.execute('PRAGMA data_version')
+        return cursor.fetchone()[0]
+
+    def _read_fingerprint(self) -> tuple:
+        cursor = self.db.get_connection().cursor()
+        cursor.execute('''
+            SELECT (SELECT group_concat(id) FROM program_executions WHERE status = 'running'),
+                   (SELECT COUNT(*) FROM programs WHERE is_active = 1),
+                   (SELECT MAX(updated_at) FROM programs)
+        ''')
+        return tuple(cursor.fetchone())
+
+    def check(self) -> bool:
+        """True si la base de datos cambió externamente desde la última comprobación"""
+        try:
+            version = self._read_version()
+            worker_commits = self.db.worker_commits
+            writer_commits = self.db.writer_commits
+            changed = False
+            if self._version is None or version != self._version:
+                fingerprint = self._read_fingerprint()
+                if self._version is None or worker_commits != self._worker_commits:
+                    changed = False
+                elif writer_commits != self._writer_commits:
+                    changed = fingerprint != self._fingerprint
+                else:
+                    changed = True
+                self._fingerprint = fingerprint
+            self._version = version
+            self._worker_commits = worker_commits
+            self._writer_commits = writer_commits
+            return changed
+
+        except Exception as e:
+            print(f"Error comprobando versión de datos: {e}")
+            return False
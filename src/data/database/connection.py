@@ -8,6 +8,17 @@ import threading
 from pathlib import Path
 from typing import Optional
 
+class _WorkerConnection(sqlite3.Connection):
+    """Conexión de un hilo de trabajo que anota sus confirmaciones en el gestor"""
+    
+    readings_writer = False  # True en la conexión del hilo de volcado de lecturas
+    
+    def commit(self):
+        wrote = self.in_transaction
+        super().commit()
+        if wrote:
+            DatabaseConnection().note_worker_commit(self.readings_writer)
+
 class DatabaseConnection:
     """Gestor singleton de conexión a SQLite"""
     
@@ -26,6 +37,10 @@ class DatabaseConnection:
             self.initialized = True
             self.db_path = None
             self.connection = None
+            self._thread_local = threading.local()  # Conexiones de los hilos de trabajo
+            self._commit_lock = threading.Lock()
+            self.worker_commits = 0  # Transacciones confirmadas por los hilos de trabajo
+            self.writer_commits = 0  # Transacciones confirmadas por el hilo de volcado de lecturas
             self._setup_database()
     
     def _setup_database(self):
@@ -38,11 +53,28 @@ class DatabaseConnection:
         self.db_path = data_dir / "pressure_control.db"
         print(f"Base de datos configurada en: {self.db_path}")
         
+        # WAL: las lecturas no esperan a las escrituras de otras conexiones (persiste en el fichero)
+        try:
+            mode = self.get_connection().execute('PRAGMA journal_mode=WAL').fetchone()[0]
+            print(f"Modo de diario de la base de datos: {mode}")
+        except sqlite3.Error as e:
+            print(f"No se pudo activar el modo WAL: {e}")
+        
         # Crear las tablas si no existen
         self._initialize_tables()
     
-    def get_connection(self) -> sqlite3.Connection:
-        """Obtiene una conexión a la base de datos"""
+    def get_connection(self, readings_writer: bool = False) -> sqlite3.Connection:
+        """Obtiene la conexión a la base de datos del hilo llamante
+        
+        El hilo principal usa la conexión compartida; cada hilo de trabajo
+        (comandos asíncronos de la interfaz) abre la suya para que sus
+        transacciones no se intercalen con las del hilo principal.
+        readings_writer marca la conexión del hilo de volcado de lecturas,
+        cuyas confirmaciones se cuentan aparte.
+        """
+        if threading.current_thread() is not threading.main_thread():
+            return self._get_thread_connection(readings_writer)
+        
         if self.connection is None:
             self.connection = sqlite3.connect(
                 str(self.db_path), 
@@ -51,6 +83,24 @@ class DatabaseConnection:
             self.connection.row_factory = sqlite3.Row  # Para acceso por nombre de columna
         return self.connection
     
+    def _get_thread_connection(self, readings_writer: bool = False) -> sqlite3.Connection:
+        """Conexión propia de un hilo de trabajo"""
+        connection = getattr(self._thread_local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(str(self.db_path), timeout=5.0, factory=_WorkerConnection)
+            connection.row_factory = sqlite3.Row
+            connection.readings_writer = readings_writer
+            self._thread_local.connection = connection
+        return connection
+    
+    def note_worker_commit(self, readings_writer: bool = False):
+        """Cuenta una escritura propia hecha desde un hilo de trabajo"""
+        with self._commit_lock:
+            if readings_writer:
+                self.writer_commits += 1
+            else:
+                self.worker_commits += 1
+    
     def _initialize_tables(self):
         """Crea las tablas iniciales de la base de datos"""
         try:
@@ -103,6 +153,7 @@ class DatabaseConnection:
                     max_pressure_exceeded BOOLEAN DEFAULT 0,
                     stopped_manually BOOLEAN DEFAULT 0,
                     notes TEXT,
+                    chamber_id INTEGER DEFAULT 1,
                     FOREIGN KEY (program_id) REFERENCES programs (id),
                     FOREIGN KEY (user_id) REFERENCES users (id)
                 )
@@ -119,6 +170,56 @@ class DatabaseConnection:
                 )
             ''')
             
+            # Tabla de segmentos de programa (perfiles rampa/mantenimiento)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS program_segments (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    program_id INTEGER NOT NULL,
+                    position INTEGER NOT NULL,
+                    segment_type TEXT NOT NULL DEFAULT 'soak',
+                    target_pressure REAL NOT NULL,
+                    duration_minutes INTEGER NOT NULL,
+                    tolerance REAL NOT NULL DEFAULT 1.0,
+                    FOREIGN KEY (program_id) REFERENCES programs (id)
+                )
+            ''')
+            
+            # Tabla de puntuaciones de anomalía (diezmadas)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS anomaly_scores (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    execution_id INTEGER NOT NULL,
+                    cusum REAL NOT NULL,
+                    ewma REAL NOT NULL,
+                    variance REAL NOT NULL,
+                    oscillation REAL NOT NULL,
+                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (execution_id) REFERENCES program_executions (id)
+                )
+            ''')
+            
+            # Tabla de la cola de ejecución (programas encadenados)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS execution_queue (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    position INTEGER NOT NULL,
+                    program_id INTEGER NOT NULL,
+                    chamber_id INTEGER NOT NULL DEFAULT 1,
+                    start_after TIMESTAMP,
+                    depends_on INTEGER,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    execution_id INTEGER,
+                    notes TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (program_id) REFERENCES programs (id),
+                    FOREIGN KEY (depends_on) REFERENCES execution_queue (id),
+                    FOREIGN KEY (execution_id) REFERENCES program_executions (id)
+                )
+            ''')
+            
+            # Migraciones incrementales sobre bases de datos existentes
+            self._apply_migrations(cursor)
+            
             conn.commit()
             print("Tablas de base de datos inicializadas correctamente")
             
@@ -130,6 +231,37 @@ class DatabaseConnection:
             if conn:
                 conn.rollback()
     
+    def _apply_migrations(self, cursor: sqlite3.Cursor):
+        """Añade columnas e índices nuevos a tablas ya existentes"""
+        cursor.execute("PRAGMA table_info(program_executions)")
+        execution_columns = {row['name'] for row in cursor.fetchall()}
+        
+        # Cámara en la que se ejecuta el programa (rigs multi-cámara)
+        if 'chamber_id' not in execution_columns:
+            cursor.execute('ALTER TABLE program_executions ADD COLUMN chamber_id INTEGER DEFAULT 1')
+            print("Migración aplicada: program_executions.chamber_id")
+        
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_pressure_readings_execution
+            ON pressure_readings (execution_id)
+        ''')
+        
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_program_segments_program
+            ON program_segments (program_id, position)
+        ''')
+        
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_anomaly_scores_execution
+            ON anomaly_scores (execution_id)
+        ''')
+        
+        # Historial paginado por programa
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_program_executions_program
+            ON program_executions (program_id, id)
+        ''')
+    
     def _create_default_admin(self):
         """Crea un usuario administrador por defecto"""
         try:
@@ -21,6 +21,7 @@ class ExecutionEntity:
     max_pressure_exceeded: bool = False
     stopped_manually: bool = False
     notes: Optional[str] = None
+    chamber_id: int = 1
     
     def to_dict(self) -> dict:
         """Convierte la entidad a diccionario"""
@@ -34,7 +35,8 @@ class ExecutionEntity:
             'min_pressure_reached': self.min_pressure_reached,
             'max_pressure_exceeded': self.max_pressure_exceeded,
             'stopped_manually': self.stopped_manually,
-            'notes': self.notes
+            'notes': self.notes,
+            'chamber_id': self.chamber_id
         }
     
     @classmethod
@@ -50,5 +52,6 @@ class ExecutionEntity:
             min_pressure_reached=bool(row['min_pressure_reached']),
             max_pressure_exceeded=bool(row['max_pressure_exceeded']),
             stopped_manually=bool(row['stopped_manually']),
-            notes=row['notes']
+            notes=row['notes'],
+            chamber_id=row['chamber_id'] if 'chamber_id' in row.keys() and row['chamber_id'] is not None else 1
         )
\ No newline at end of file
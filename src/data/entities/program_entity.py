@@ -3,9 +3,10 @@ Entidad de programa
 Representa un programa de control en la base de datos
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List
+from .program_segment_entity import ProgramSegmentEntity
 
 @dataclass
 class ProgramEntity:
@@ -22,6 +23,8 @@ class ProgramEntity:
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
     is_active: bool = True
+    # Perfil multi-segmento (vacío = banda única mín/máx durante toda la duración)
+    segments: List[ProgramSegmentEntity] = field(default_factory=list)
     
     def to_dict(self) -> dict:
         """Convierte la entidad a diccionario"""
@@ -36,7 +39,8 @@ class ProgramEntity:
             'created_by': self.created_by,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'is_active': self.is_active
+            'is_active': self.is_active,
+            'segments': [segment.to_dict() for segment in self.segments]
         }
     
     @classmethod
@@ -0,0 +1,44 @@
+"""
+Entidad de segmento de programa
+Representa un tramo de rampa o mantenimiento de un perfil de presión
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+@dataclass
+class ProgramSegmentEntity:
+    """Segmento de un perfil de programa para la base de datos"""
+    
+    id: Optional[int] = None
+    program_id: int = 0
+    position: int = 0  # Orden dentro del programa
+    segment_type: str = "soak"  # 'ramp' (rampa lineal hasta el objetivo) o 'soak' (mantener)
+    target_pressure: float = 0.0
+    duration_minutes: int = 1
+    tolerance: float = 1.0  # Banda de alarma ± alrededor de la consigna
+    
+    def to_dict(self) -> dict:
+        """Convierte la entidad a diccionario"""
+        return {
+            'id': self.id,
+            'program_id': self.program_id,
+            'position': self.position,
+            'segment_type': self.segment_type,
+            'target_pressure': self.target_pressure,
+            'duration_minutes': self.duration_minutes,
+            'tolerance': self.tolerance
+        }
+    
+    @classmethod
+    def from_db_row(cls, row) -> 'ProgramSegmentEntity':
+        """Crea una entidad desde una fila de base de datos"""
+        return cls(
+            id=row['id'],
+            program_id=row['program_id'],
+            position=int(row['position']),
+            segment_type=row['segment_type'],
+            target_pressure=float(row['target_pressure']),
+            duration_minutes=int(row['duration_minutes']),
+            tolerance=float(row['tolerance'])
+        )
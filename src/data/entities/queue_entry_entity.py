@@ -0,0 +1,59 @@
+"""
+Entidad de entrada de la cola de ejecución
+Representa un programa pendiente de ejecutar de forma automática
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+@dataclass
+class QueueEntryEntity:
+    """Entrada de la cola de ejecución para la base de datos"""
+    
+    id: Optional[int] = None
+    position: int = 0  # Orden dentro de la cola
+    program_id: int = 0
+    chamber_id: int = 1
+    start_after: Optional[datetime] = None  # No iniciar antes de esta hora
+    depends_on: Optional[int] = None  # Entrada que debe completarse antes
+    status: str = "pending"  # 'pending', 'running', 'completed', 'stopped', 'failed', 'cancelled'
+    execution_id: Optional[int] = None
+    notes: Optional[str] = None
+    created_at: Optional[datetime] = None
+    
+    @property
+    def is_finished(self) -> bool:
+        """Indica si la entrada ya no se ejecutará"""
+        return self.status in ('completed', 'stopped', 'failed', 'cancelled')
+    
+    def to_dict(self) -> dict:
+        """Convierte la entidad a diccionario"""
+        return {
+            'id': self.id,
+            'position': self.position,
+            'program_id': self.program_id,
+            'chamber_id': self.chamber_id,
+            'start_after': self.start_after.isoformat() if self.start_after else None,
+            'depends_on': self.depends_on,
+            'status': self.status,
+            'execution_id': self.execution_id,
+            'notes': self.notes,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+    
+    @classmethod
+    def from_db_row(cls, row) -> 'QueueEntryEntity':
+        """Crea una entidad desde una fila de base de datos"""
+        return cls(
+            id=row['id'],
+            position=int(row['position']),
+            program_id=row['program_id'],
+            chamber_id=row['chamber_id'],
+            start_after=datetime.fromisoformat(row['start_after']) if row['start_after'] else None,
+            depends_on=row['depends_on'],
+            status=row['status'],
+            execution_id=row['execution_id'],
+            notes=row['notes'],
+            created_at=datetime.fromisoformat(row['created_at']) if row['created_at'] else None
+        )
@@ -0,0 +1,140 @@
+"""
+Repositorio de la cola de ejecución
+Gestiona las entradas de programas encadenados y su orden
+"""
+
+from typing import Optional, List
+from data.database.connection import DatabaseConnection
+from data.entities.queue_entry_entity import QueueEntryEntity
+
+class ExecutionQueueRepository:
+    """Repositorio para la cola de ejecución"""
+    
+    def __init__(self):
+        self.db = DatabaseConnection()
+    
+    def create_entry(self, entry: QueueEntryEntity) -> Optional[QueueEntryEntity]:
+        """Añade una entrada al final de la cola"""
+        try:
+            conn = self.db.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute('SELECT COALESCE(MAX(position), -1) + 1 FROM execution_queue')
+            entry.position = cursor.fetchone()[0]
+            
+            cursor.execute('''
+                INSERT INTO execution_queue (
+                    position, program_id, chamber_id, start_after, depends_on, status, notes
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                entry.position,
+                entry.program_id,
+                entry.chamber_id,
+                entry.start_after.isoformat() if entry.start_after else None,
+                entry.depends_on,
+                entry.status,
+                entry.notes
+            ))
+            
+            conn.commit()
+            return self.get_entry_by_id(cursor.lastrowid)
+            
+        except Exception as e:
+            print(f"Error añadiendo entrada a la cola: {e}")
+            conn.rollback()
+            return None
+    
+    def get_entry_by_id(self, entry_id: int) -> Optional[QueueEntryEntity]:
+        """Obtiene una entrada por su ID"""
+        try:
+            conn = self.db.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute('SELECT * FROM execution_queue WHERE id = ?', (entry_id,))
+            row = cursor.fetchone()
+            
+            return QueueEntryEntity.from_db_row(row) if row else None
+            
+        except Exception as e:
+            print(f"Error obteniendo entrada de la cola: {e}")
+            return None
+    
+    def get_entries(self, include_finished: bool = False) -> List[QueueEntryEntity]:
+        """Obtiene las entradas de la cola en orden"""
+        try:
+            conn = self.db.get_connection()
+            cursor = conn.cursor()
+            
+            if include_finished:
+                cursor.execute('SELECT * FROM execution_queue ORDER BY position')
+            else:
+                cursor.execute('''
+                    SELECT * FROM execution_queue 
+                    WHERE status IN ('pending', 'running') 
+                    ORDER BY position
+                ''')
+            
+            return [QueueEntryEntity.from_db_row(row) for row in cursor.fetchall()]
+            
+        except Exception as e:
+            print(f"Error obteniendo la cola de ejecución: {e}")
+            return []
+    
+    def update_entry(self, entry: QueueEntryEntity) -> bool:
+        """Actualiza el estado de una entrada"""
+        try:
+            conn = self.db.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                UPDATE execution_queue 
+                SET status = ?, execution_id = ?, notes = ? 
+                WHERE id = ?
+            ''', (entry.status, entry.execution_id, entry.notes, entry.id))
+            
+            conn.commit()
+            return cursor.rowcount > 0
+            
+        except Exception as e:
+            print(f"Error actualizando entrada de la cola: {e}")
+            conn.rollback()
+            return False
+    
+    def update_positions(self, entry_ids: List[int]) -> bool:
+        """Reescribe el orden de la cola según la lista de IDs"""
+        try:
+            conn = self.db.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.executemany(
+                'UPDATE execution_queue SET position = ? WHERE id = ?',
+                [(position, entry_id) for position, entry_id in enumerate(entry_ids)]
+            )
+            
+            conn.commit()
+            return True
+            
+        except Exception as e:
+            print(f"Error reordenando la cola de ejecución: {e}")
+            conn.rollback()
+            return False
+    
+    def delete_entry(self, entry_id: int) -> bool:
+        """Elimina una entrada pendiente de la cola"""
+        try:
+            conn = self.db.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                DELETE FROM execution_queue 
+                WHERE id = ? AND status = 'pending'
+            ''', (entry_id,))
+            
+            conn.commit()
+            return cursor.rowcount > 0
+            
+        except Exception as e:
+            print(f"Error eliminando entrada de la cola: {e}")
+            conn.rollback()
+            return False
@@ -3,8 +3,9 @@ Repositorio de ejecuciones
 Gestiona las operaciones CRUD para ejecuciones de programas
 """
 
+from array import array
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from data.database.connection import DatabaseConnection
 from data.entities.execution_entity import ExecutionEntity
 
@@ -23,9 +24,9 @@ class ExecutionRepository:
             cursor.execute('''
                 INSERT INTO program_executions (
                     program_id, user_id, status, min_pressure_reached,
-                    max_pressure_exceeded, stopped_manually, notes
+                    max_pressure_exceeded, stopped_manually, notes, chamber_id
                 )
-                VALUES (?, ?, ?, ?, ?, ?, ?)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             ''', (
                 execution.program_id,
                 execution.user_id,
@@ -33,7 +34,8 @@ class ExecutionRepository:
                 execution.min_pressure_reached,
                 execution.max_pressure_exceeded,
                 execution.stopped_manually,
-                execution.notes
+                execution.notes,
+                execution.chamber_id
             ))
             
             execution_id = cursor.lastrowid
@@ -130,6 +132,60 @@ class ExecutionRepository:
             print(f"Error obteniendo ejecuciones recientes: {e}")
             return []
     
+    def _select_history(self, conditions: List[str], params: list, limit: int) -> List[Dict[str, Any]]:
+        """Ejecuciones con el nombre del programa, de la más reciente a la más antigua"""
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
+        
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        cursor.execute(f'''
+            SELECT e.*, p.name AS program_name
+            FROM program_executions e
+            LEFT JOIN programs p ON p.id = e.program_id
+            {where}
+            ORDER BY e.id DESC
+            LIMIT ?
+        ''', params + [limit])
+        
+        executions = []
+        for row in cursor.fetchall():
+            execution = ExecutionEntity.from_db_row(row).to_dict()
+            execution['program_name'] = row['program_name'] or ''
+            executions.append(execution)
+        return executions
+    
+    def get_executions_page(self, before_id: Optional[int] = None, limit: int = 50,
+                            program_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Obtiene una página del historial (paginación por cursor)
+        
+        Ordena por id descendente (orden de inicio) y continúa desde el último
+        id recibido, de modo que el coste de una página no crece con el historial.
+        """
+        try:
+            conditions = []
+            params: list = []
+            if before_id is not None:
+                conditions.append('e.id < ?')
+                params.append(before_id)
+            if program_id is not None:
+                conditions.append('e.program_id = ?')
+                params.append(program_id)
+            return self._select_history(conditions, params, limit)
+            
+        except Exception as e:
+            print(f"Error obteniendo página del historial: {e}")
+            return []
+    
+    def get_history_entry(self, execution_id: int) -> Optional[Dict[str, Any]]:
+        """Obtiene una ejecución con el nombre del programa"""
+        try:
+            executions = self._select_history(['e.id = ?'], [execution_id], 1)
+            return executions[0] if executions else None
+            
+        except Exception as e:
+            print(f"Error obteniendo ejecución del historial: {e}")
+            return None
+    
     def record_pressure_reading(self, execution_id: int, pressure_value: float) -> bool:
         """Registra una lectura de presión durante la ejecución"""
         try:
@@ -147,4 +203,61 @@ class ExecutionRepository:
         except Exception as e:
             print(f"Error registrando lectura de presión: {e}")
             conn.rollback()
-            return False
\ No newline at end of file
+            return False
+    
+    def get_completed_execution_ids(self, program_id: int, limit: int = 20) -> List[int]:
+        """Obtiene los IDs de las últimas ejecuciones completadas de un programa"""
+        try:
+            conn = self.db.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT id FROM program_executions 
+                WHERE program_id = ? AND status = 'completed' 
+                ORDER BY start_time DESC, id DESC 
+                LIMIT ?
+            ''', (program_id, limit))
+            
+            return [row['id'] for row in cursor.fetchall()]
+            
+        except Exception as e:
+            print(f"Error obteniendo ejecuciones completadas: {e}")
+            return []
+    
+    def get_pressure_values(self, execution_id: int) -> array:
+        """Obtiene la serie de presiones de una ejecución en orden de registro"""
+        values = array('d')
+        try:
+            conn = self.db.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT pressure_value FROM pressure_readings 
+                WHERE execution_id = ? 
+                ORDER BY id
+            ''', (execution_id,))
+            
+            values.extend(row[0] for row in cursor.fetchall())
+            return values
+            
+        except Exception as e:
+            print(f"Error obteniendo lecturas de presión: {e}")
+            return values
+    
+    def get_anomaly_scores(self, execution_id: int) -> List[Dict[str, Any]]:
+        """Obtiene las puntuaciones de anomalía registradas de una ejecución"""
+        try:
+            conn = self.db.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT cusum, ewma, variance, oscillation, timestamp FROM anomaly_scores 
+                WHERE execution_id = ? 
+                ORDER BY id
+            ''', (execution_id,))
+            
+            return [dict(row) for row in cursor.fetchall()]
+            
+        except Exception as e:
+            print(f"Error obteniendo puntuaciones de anomalía: {e}")
+            return []
\ No newline at end of file
@@ -7,12 +7,21 @@ from datetime import datetime
 from typing import Optional, List
 from data.database.connection import DatabaseConnection
 from data.entities.program_entity import ProgramEntity
+from data.repositories.program_segment_repository import ProgramSegmentRepository
 
 class ProgramRepository:
     """Repositorio para gestión de programas"""
     
     def __init__(self):
         self.db = DatabaseConnection()
+        self.segment_repository = ProgramSegmentRepository()
+    
+    def _attach_segments(self, programs: List[ProgramEntity]) -> List[ProgramEntity]:
+        """Carga los perfiles multi-segmento de los programas (una consulta)"""
+        segments = self.segment_repository.get_segments_by_programs([program.id for program in programs])
+        for program in programs:
+            program.segments = segments.get(program.id, [])
+        return programs
     
     def create_program(self, program: ProgramEntity) -> Optional[ProgramEntity]:
         """Crea un nuevo programa"""
@@ -58,7 +67,9 @@ class ProgramRepository:
             row = cursor.fetchone()
             
             if row:
-                return ProgramEntity.from_db_row(row)
+                program = ProgramEntity.from_db_row(row)
+                program.segments = self.segment_repository.get_segments_by_program(program.id)
+                return program
             return None
             
         except Exception as e:
@@ -94,7 +105,7 @@ class ProgramRepository:
                 cursor.execute('SELECT * FROM programs WHERE is_active = 1 ORDER BY created_at DESC')
             
             rows = cursor.fetchall()
-            return [ProgramEntity.from_db_row(row) for row in rows]
+            return self._attach_segments([ProgramEntity.from_db_row(row) for row in rows])
             
         except Exception as e:
             print(f"Error obteniendo todos los programas: {e}")
@@ -113,7 +124,7 @@ class ProgramRepository:
             ''', (user_id,))
             
             rows = cursor.fetchall()
-            return [ProgramEntity.from_db_row(row) for row in rows]
+            return self._attach_segments([ProgramEntity.from_db_row(row) for row in rows])
             
         except Exception as e:
             print(f"Error obteniendo programas por usuario: {e}")
@@ -185,12 +196,49 @@ class ProgramRepository:
             ''', (search_pattern, search_pattern))
             
             rows = cursor.fetchall()
-            return [ProgramEntity.from_db_row(row) for row in rows]
+            return self._attach_segments([ProgramEntity.from_db_row(row) for row in rows])
             
         except Exception as e:
             print(f"Error buscando programas: {e}")
             return []
     
+    def get_programs_page(self, before_id: Optional[int] = None, limit: int = 50,
+                          search_term: str = "") -> List[ProgramEntity]:
+        """Obtiene una página de programas activos (paginación por cursor)
+        
+        Ordena por id descendente, equivalente al orden de creación, para que
+        cada página sea un recorrido del índice de la clave primaria a partir
+        del último id recibido sin importar cuántas filas haya antes.
+        """
+        try:
+            conn = self.db.get_connection()
+            cursor = conn.cursor()
+            
+            conditions = ['is_active = 1']
+            params: list = []
+            if before_id is not None:
+                conditions.append('id < ?')
+                params.append(before_id)
+            if search_term:
+                search_pattern = f"%{search_term}%"
+                conditions.append('(name LIKE ? OR description LIKE ?)')
+                params.extend([search_pattern, search_pattern])
+            params.append(limit)
+            
+            cursor.execute(f'''
+                SELECT * FROM programs
+                WHERE {' AND '.join(conditions)}
+                ORDER BY id DESC
+                LIMIT ?
+            ''', params)
+            
+            rows = cursor.fetchall()
+            return self._attach_segments([ProgramEntity.from_db_row(row) for row in rows])
+            
+        except Exception as e:
+            print(f"Error obteniendo página de programas: {e}")
+            return []
+    
     def validate_program_name_unique(self, name: str, exclude_id: int = None) -> bool:
         """Valida que el nombre del programa sea único"""
         try:
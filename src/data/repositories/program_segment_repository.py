@@ -0,0 +1,84 @@
+"""
+Repositorio de segmentos de programa
+Gestiona los perfiles multi-segmento asociados a cada programa
+"""
+
+from typing import List, Dict
+from data.database.connection import DatabaseConnection
+from data.entities.program_segment_entity import ProgramSegmentEntity
+
+class ProgramSegmentRepository:
+    """Repositorio para los segmentos de los programas"""
+    
+    def __init__(self):
+        self.db = DatabaseConnection()
+    
+    def get_segments_by_program(self, program_id: int) -> List[ProgramSegmentEntity]:
+        """Obtiene los segmentos de un programa en orden"""
+        try:
+            conn = self.db.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT * FROM program_segments
+                WHERE program_id = ?
+                ORDER BY position
+            ''', (program_id,))
+            
+            return [ProgramSegmentEntity.from_db_row(row) for row in cursor.fetchall()]
+            
+        except Exception as e:
+            print(f"Error obteniendo segmentos del programa: {e}")
+            return []
+    
+    def get_segments_by_programs(self, program_ids: List[int]) -> Dict[int, List[ProgramSegmentEntity]]:
+        """Obtiene los segmentos de varios programas en una sola consulta"""
+        segments: Dict[int, List[ProgramSegmentEntity]] = {}
+        if not program_ids:
+            return segments
+        
+        try:
+            conn = self.db.get_connection()
+            cursor = conn.cursor()
+            
+            placeholders = ','.join('?' * len(program_ids))
+            cursor.execute(f'''
+                SELECT * FROM program_segments
+                WHERE program_id IN ({placeholders})
+                ORDER BY program_id, position
+            ''', list(program_ids))
+            
+            for row in cursor.fetchall():
+                segment = ProgramSegmentEntity.from_db_row(row)
+                segments.setdefault(segment.program_id, []).append(segment)
+            return segments
+            
+        except Exception as e:
+            print(f"Error obteniendo segmentos de programas: {e}")
+            return segments
+    
+    def replace_segments(self, program_id: int, segments: List[ProgramSegmentEntity]) -> bool:
+        """Sustituye el perfil completo de un programa en una única transacción"""
+        try:
+            conn = self.db.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute('DELETE FROM program_segments WHERE program_id = ?', (program_id,))
+            cursor.executemany('''
+                INSERT INTO program_segments (
+                    program_id, position, segment_type, target_pressure, duration_minutes, tolerance
+                )
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', [
+                (program_id, position, segment.segment_type, segment.target_pressure,
+                 segment.duration_minutes, segment.tolerance)
+                for position, segment in enumerate(segments)
+            ])
+            
+            conn.commit()
+            return True
+            
+        except Exception as e:
+            print(f"Error guardando segmentos del programa: {e}")
+            conn.rollback()
+            return False
@@ -0,0 +1,96 @@
+"""
+Lector por bloques de lecturas de presión
+Recorre una ejecución grabada con consultas paginadas y un buffer local
+"""
+
+from collections import deque
+from typing import Optional, Tuple
+from data.database.connection import DatabaseConnection
+
+
+class PressureReadingStream:
+    """Cursor secuencial sobre pressure_readings de una ejecución"""
+
+    def __init__(self, execution_id: int, chunk_size: int = 2000):
+        self.db = DatabaseConnection()
+        self.execution_id = execution_id
+        self.chunk_size = chunk_size
+        self._buffer: deque = deque()
+        self._last_id = 0  # Paginación por clave: id > último leído
+        self._exhausted = False
+        self.position = 0  # Índice de la próxima muestra
+        self._total: Optional[int] = None
+
+    def total(self) -> int:
+        """Número total de lecturas de la ejecución"""
+        if self._total is None:
+            try:
+                cursor = self.db.get_connection().cursor()
+                cursor.execute('SELECT COUNT(*) FROM pressure_readings WHERE execution_id = ?',
+                               (self.execution_id,))
+                self._total = cursor.fetchone()[0]
+            except Exception as e:
+                print(f"Error contando lecturas de presión: {e}")
+                self._total = 0
+        return self._total
+
+    def _fetch_chunk(self):
+        """Carga el siguiente bloque de lecturas en el buffer"""
+        try:
+            cursor = self.db.get_connection().cursor()
+            cursor.execute('''
+                SELECT id, pressure_value, timestamp FROM pressure_readings
+                WHERE execution_id = ? AND id > ?
+                ORDER BY id
+                LIMIT ?
+            ''', (self.execution_id, self._last_id, self.chunk_size))
+            rows = cursor.fetchall()
+        except Exception as e:
+            print(f"Error leyendo bloque de lecturas de presión: {e}")
+            rows = []
+
+        if len(rows) < self.chunk_size:
+            self._exhausted = True
+        if rows:
+            self._last_id = rows[-1]['id']
+            self._buffer.extend((row['pressure_value'], row['timestamp']) for row in rows)
+
+    def next(self) -> Optional[Tuple[float, str]]:
+        """Devuelve la siguiente lectura (presión, timestamp) o None al terminar"""
+        if not self._buffer:
+            if self._exhausted:
+                return None
+            self._fetch_chunk()
+            if not self._buffer:
+                return None
+
+        self.position += 1
+        return self._buffer.popleft()
+
+    def seek(self, index: int):
+        """Sitúa el cursor en la lectura de índice indicado (0 = inicio)"""
+        index = max(0, index)
+        self._buffer.clear()
+        self._exhausted = False
+        self.position = index
+        self._last_id = 0
+
+        if index == 0:
+            return
+
+        try:
+            cursor = self.db.get_connection().cursor()
+            cursor.execute('''
+                SELECT id FROM pressure_readings
+                WHERE execution_id = ?
+                ORDER BY id
+                LIMIT 1 OFFSET ?
+            ''', (self.execution_id, index - 1))
+            row = cursor.fetchone()
+            if row:
+                self._last_id = row['id']
+            else:
+                self._exhausted = True
+                self.position = self.total()
+        except Exception as e:
+            print(f"Error posicionando lector de lecturas: {e}")
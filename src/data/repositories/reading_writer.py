@@ -0,0 +1,153 @@
+"""
+Escritor por lotes de lecturas de presión
+Agrupa las lecturas (y las puntuaciones de anomalía) de todas las cámaras en una única transacción
+"""
+
+import threading
+import time
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Tuple, Sequence
+from data.database.connection import DatabaseConnection
+
+
+class PressureReadingWriter:
+    """Buffer compartido de lecturas de presión con volcado por lotes
+
+    Con start() los volcados periódicos se hacen en un hilo propio, con su
+    conexión SQLite: add() solo encola en memoria y una base de datos lenta
+    no llega al tick de control. flush() sigue disponible para los volcados
+    que deben completarse en el momento (fin de ejecución y cierre); un
+    único volcado a la vez conserva el orden de inserción.
+    """
+
+    def __init__(self, flush_interval: float = 5.0, max_batch: int = 500):
+        self.db = DatabaseConnection()
+        self.flush_interval = flush_interval  # segundos entre volcados
+        self.max_batch = max_batch  # volcado anticipado al superar este tamaño
+        self._buffer: List[Tuple[int, float, str]] = []
+        self._score_buffer: List[Tuple[int, float, float, float, float, str]] = []
+        self._last_flush = time.monotonic()
+        self.total_written = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+
+        self._lock = threading.Lock()  # Buffers (hilo de control y volcado)
+        self._flush_lock = threading.Lock()  # Un volcado a la vez
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+    def start(self):
+        """Vuelca en segundo plano en lugar de en el hilo que añade lecturas"""
+        if self._thread is not None:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="reading-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Detiene el hilo de volcado y escribe lo pendiente"""
+        thread = self._thread
+        if thread is not None:
+            self._running = False
+            self._wake.set()
+            thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def _run(self):
+        while self._running:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def add(self, execution_id: int, pressure_value: float, timestamp: datetime = None):
+        """Añade una lectura al buffer"""
+        # Mismo formato que CURRENT_TIMESTAMP de SQLite (UTC)
+        ts = (timestamp or datetime.utcnow()).strftime('%Y-%m-%d %H:%M:%S')
+        with self._lock:
+            self._buffer.append((execution_id, pressure_value, ts))
+            full = len(self._buffer) >= self.max_batch
+
+        if full:
+            if self._thread is not None:
+                self._wake.set()
+            else:
+                self.flush()
+
+    def add_anomaly_scores(self, execution_id: int, scores: Sequence[float], timestamp: datetime = None):
+        """Añade una fila de puntuaciones (cusum, ewma, variance, oscillation) al buffer"""
+        ts = (timestamp or datetime.utcnow()).strftime('%Y-%m-%d %H:%M:%S')
+        with self._lock:
+            self._score_buffer.append((execution_id, *scores, ts))
+
+    def pending(self) -> int:
+        """Número de lecturas pendientes de escribir"""
+        return len(self._buffer)
+
+    def flush_if_due(self) -> int:
+        """Vuelca el buffer si se cumplió el intervalo de volcado (sin hilo de volcado)"""
+        if self._thread is not None:
+            return 0
+        if (self._buffer or self._score_buffer) and time.monotonic() - self._last_flush >= self.flush_interval:
+            return self.flush()
+        return 0
+
+    def flush(self) -> int:
+        """Escribe todas las lecturas pendientes en una sola transacción"""
+        with self._flush_lock:
+            self._last_flush = time.monotonic()
+            with self._lock:
+                if not self._buffer and not self._score_buffer:
+                    return 0
+                batch = self._buffer
+                scores = self._score_buffer
+                self._buffer = []
+                self._score_buffer = []
+
+            started = time.perf_counter()
+            conn = None
+            try:
+                conn = self.db.get_connection(readings_writer=True)
+                cursor = conn.cursor()
+
+                cursor.executemany('''
+                    INSERT INTO pressure_readings (execution_id, pressure_value, timestamp)
+                    VALUES (?, ?, ?)
+                ''', batch)
+
+                if scores:
+                    cursor.executemany('''
+                        INSERT INTO anomaly_scores (execution_id, cusum, ewma, variance, oscillation, timestamp)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                    ''', scores)
+
+                conn.commit()
+                self.total_written += len(batch)
+                return len(batch)
+
+            except Exception as e:
+                print(f"Error escribiendo lote de lecturas de presión: {e}")
+                if conn is not None:
+                    try:
+                        conn.rollback()
+                    except Exception as rollback_error:
+                        print(f"Error deshaciendo lote de lecturas de presión: {rollback_error}")
+                # Conservar las lecturas para el próximo intento (acotado)
+                with self._lock:
+                    self._buffer = (batch + self._buffer)[-self.max_batch * 10:]
+                    self._score_buffer = (scores + self._score_buffer)[-self.max_batch:]
+                return 0
+
+            finally:
+                self.last_flush_ms = (time.perf_counter() - started) * 1000.0
+                self.max_flush_ms = max(self.max_flush_ms, self.last_flush_ms)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            'background': self._thread is not None,
+            'pending': len(self._buffer),
+            'total_written': self.total_written,
+            'last_flush_ms': round(self.last_flush_ms, 2),
+            'max_flush_ms': round(self.max_flush_ms, 2)
+        }
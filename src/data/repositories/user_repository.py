@@ -3,7 +3,6 @@ Repositorio de usuarios
 Gestiona las operaciones CRUD para usuarios
 """
 
-import bcrypt
 from datetime import datetime
 from typing import Optional, List
 from data.database.connection import DatabaseConnection
@@ -21,7 +20,8 @@ class UserRepository:
             conn = self.db.get_connection()
             cursor = conn.cursor()
             
-            # Hash de la contraseña
+            # Hash de la contraseña (bcrypt se importa al usarse: no retrasa el arranque)
+            import bcrypt
             password_hash = bcrypt.hashpw(
                 password.encode('utf-8'), 
                 bcrypt.gensalt()
@@ -92,6 +92,7 @@ class UserRepository:
                 return None
             
             # Verificar contraseña
+            import bcrypt
             if bcrypt.checkpw(password.encode('utf-8'), user.password_hash.encode('utf-8')):
                 # Actualizar último login
                 self.update_last_login(user.id)
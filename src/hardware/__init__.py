@@ -0,0 +1,4 @@
+"""
+Capa de hardware
+Fuentes de lectura de sensores y salidas físicas (reales o simuladas)
+"""
\ No newline at end of file
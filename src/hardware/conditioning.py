@@ -0,0 +1,314 @@
+"""
+Acondicionamiento de señal de los sensores
+Etapas de filtrado en flujo (media móvil, EWMA, mediana, Kalman, calibración)
+"""
+
+import math
+from collections import deque
+from typing import Optional, Dict, Any, List, Sequence
+
+# NumPy es opcional: sin él, los bloques se procesan muestra a muestra
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class FilterStage:
+    """Etapa de filtrado con estado que persiste entre muestras y bloques"""
+
+    def reset(self):
+        """Descarta el estado acumulado"""
+
+    def process(self, value: float) -> float:
+        """Procesa una muestra"""
+        raise NotImplementedError
+
+    def process_block(self, values):
+        """Procesa un bloque de muestras (array de NumPy si está disponible)"""
+        return [self.process(value) for value in values]
+
+
+def _ewma_block(values, state: float, alpha: float):
+    """EWMA vectorizado: y_j = b^(j+1)·(y0 + a·Σ x_k / b^(k+1)), por tramos sin desbordamiento"""
+    decay = 1.0 - alpha
+    if decay <= 0.0:
+        return values.copy()
+
+    # Tramos cortos: b^-m debe caber en un double con margen de precisión
+    chunk = max(1, min(256, int(600.0 / -math.log(decay)))) if decay < 1.0 else len(values)
+    output = np.empty_like(values)
+    for start in range(0, len(values), chunk):
+        block = values[start:start + chunk]
+        powers = decay ** np.arange(1, len(block) + 1)
+        smoothed = powers * (state + alpha * np.cumsum(block / powers))
+        output[start:start + chunk] = smoothed
+        state = smoothed[-1]
+    return output
+
+
+class MovingAverageFilter(FilterStage):
+    """Media móvil de las últimas 'window' muestras"""
+
+    def __init__(self, window: int = 5):
+        self.window = max(1, int(window))
+        self.reset()
+
+    def reset(self):
+        self._history = deque(maxlen=self.window)
+        self._total = 0.0
+
+    def process(self, value: float) -> float:
+        if len(self._history) == self.window:
+            self._total -= self._history[0]
+        self._history.append(value)
+        self._total += value
+        return self._total / len(self._history)
+
+    def process_block(self, values):
+        if np is None:
+            return super().process_block(values)
+
+        history = np.fromiter(self._history, dtype=float, count=len(self._history))
+        extended = np.concatenate((history, values))
+        sums = np.concatenate(([0.0], np.cumsum(extended)))
+
+        # Durante el arranque se promedia sobre las muestras disponibles
+        ends = np.arange(len(history), len(extended)) + 1
+        counts = np.minimum(self.window, ends)
+        output = (sums[ends] - sums[ends - counts]) / counts
+
+        # La deque (maxlen=window) conserva las últimas muestras de history + values
+        self._history.extend(values.tolist())
+        self._total = float(sum(self._history))
+        return output
+
+
+class EWMAFilter(FilterStage):
+    """Media móvil exponencial: y += alpha·(x - y)"""
+
+    def __init__(self, alpha: float = 0.3):
+        self.alpha = min(1.0, max(0.0, float(alpha)))
+        self.reset()
+
+    def reset(self):
+        self._value: Optional[float] = None
+
+    def process(self, value: float) -> float:
+        if self._value is None:
+            self._value = value
+        else:
+            self._value += self.alpha * (value - self._value)
+        return self._value
+
+    def process_block(self, values):
+        if np is None or len(values) == 0:
+            return super().process_block(values)
+
+        if self._value is None:
+            self._value = float(values[0])
+        output = _ewma_block(values, self._value, self.alpha)
+        self._value = float(output[-1])
+        return output
+
+
+class MedianSpikeFilter(FilterStage):
+    """Rechazo de picos: sustituye por la mediana las muestras que se alejan más del umbral"""
+
+    def __init__(self, window: int = 5, threshold: float = 5.0):
+        self.window = max(1, int(window))
+        self.threshold = float(threshold)
+        self.reset()
+
+    def reset(self):
+        self._history = deque(maxlen=self.window)
+        self.rejected = 0
+
+    def process(self, value: float) -> float:
+        history = self._history
+        output = value
+        if history:
+            ordered = sorted(history)
+            middle = len(ordered) // 2
+            median = ordered[middle] if len(ordered) % 2 else (ordered[middle - 1] + ordered[middle]) / 2.0
+            if abs(value - median) > self.threshold:
+                output = median
+                self.rejected += 1
+        history.append(value)
+        return output
+
+    def process_block(self, values):
+        if np is None:
+            return super().process_block(values)
+
+        # Arranque muestra a muestra hasta llenar la ventana
+        warmup = min(len(values), self.window - len(self._history))
+        head = [self.process(float(value)) for value in values[:warmup]]
+        rest = values[warmup:]
+        if len(rest) == 0:
+            return np.asarray(head, dtype=float)
+
+        history = np.fromiter(self._history, dtype=float, count=len(self._history))
+        extended = np.concatenate((history, rest))
+        # Ventana j = las 'window' muestras anteriores a rest[j]
+        windows = np.lib.stride_tricks.sliding_window_view(extended[:-1], self.window)
+        medians = np.median(windows, axis=1)
+        spikes = np.abs(rest - medians) > self.threshold
+        self.rejected += int(np.count_nonzero(spikes))
+
+        self._history.extend(rest.tolist())
+        return np.concatenate((head, np.where(spikes, medians, rest)))
+
+
+class KalmanFilter(FilterStage):
+    """Filtro de Kalman escalar (modelo de paseo aleatorio)"""
+
+    def __init__(self, process_variance: float = 0.01, measurement_variance: float = 0.25):
+        self.process_variance = float(process_variance)
+        self.measurement_variance = float(measurement_variance)
+        self.reset()
+
+    def reset(self):
+        self._estimate: Optional[float] = None
+        self._error = 1.0
+
+    def _gain(self) -> float:
+        """Avanza la covarianza y devuelve la ganancia (no depende de las medidas)"""
+        error = self._error + self.process_variance
+        gain = error / (error + self.measurement_variance)
+        self._error = (1.0 - gain) * error
+        return gain
+
+    def process(self, value: float) -> float:
+        if self._estimate is None:
+            self._estimate = value
+            return value
+        self._estimate += self._gain() * (value - self._estimate)
+        return self._estimate
+
+    def process_block(self, values):
+        if np is None or len(values) == 0:
+            return super().process_block(values)
+
+        output = np.empty_like(values)
+        index = 0
+        if self._estimate is None:
+            self._estimate = float(values[0])
+            output[0] = self._estimate
+            index = 1
+
+        # Hasta converger, la ganancia varía: muestra a muestra
+        while index < len(values):
+            previous = self._error
+            gain = self._gain()
+            self._estimate += gain * (float(values[index]) - self._estimate)
+            output[index] = self._estimate
+            index += 1
+            if abs(self._error - previous) < 1e-12:
+                break
+
+        # Ganancia estacionaria: equivale a un EWMA con alpha = ganancia
+        if index < len(values):
+            rest = _ewma_block(values[index:], self._estimate, gain)
+            output[index:] = rest
+            self._estimate = float(rest[-1])
+        return output
+
+
+class CalibrationTable(FilterStage):
+    """Curva de calibración precalculada en una tabla uniforme (búsqueda O(1))"""
+
+    def __init__(self, points: Sequence[Sequence[float]], resolution: int = 1024):
+        points = sorted((float(raw), float(value)) for raw, value in points)
+        if len(points) < 2:
+            raise ValueError("La calibración necesita al menos dos puntos")
+
+        self.raw_min = points[0][0]
+        self.raw_max = points[-1][0]
+        self.resolution = max(2, int(resolution))
+        self.step = (self.raw_max - self.raw_min) / (self.resolution - 1)
+        self.table = [self._interpolate(points, self.raw_min + i * self.step) for i in range(self.resolution)]
+        self._np_table = np.asarray(self.table) if np is not None else None
+
+    @staticmethod
+    def _interpolate(points, raw: float) -> float:
+        for (x0, y0), (x1, y1) in zip(points, points[1:]):
+            if raw <= x1:
+                return y0 + (y1 - y0) * (raw - x0) / (x1 - x0) if x1 != x0 else y1
+        return points[-1][1]
+
+    def process(self, value: float) -> float:
+        position = (value - self.raw_min) / self.step
+        index = min(max(int(math.floor(position)), 0), self.resolution - 2)
+        # Fuera de rango se extrapola con el tramo extremo
+        return self.table[index] + (self.table[index + 1] - self.table[index]) * (position - index)
+
+    def process_block(self, values):
+        if np is None:
+            return super().process_block(values)
+
+        position = (values - self.raw_min) / self.step
+        index = np.clip(np.floor(position).astype(np.int64), 0, self.resolution - 2)
+        table = self._np_table
+        return table[index] + (table[index + 1] - table[index]) * (position - index)
+
+
+class FilterChain:
+    """Cadena de etapas aplicada entre la adquisición y los consumidores"""
+
+    def __init__(self, stages: List[FilterStage]):
+        self.stages = stages
+
+    def reset(self):
+        for stage in self.stages:
+            stage.reset()
+
+    def process(self, value: float) -> float:
+        for stage in self.stages:
+            value = stage.process(value)
+        return value
+
+    def process_block(self, values):
+        """Procesa un bloque; con NumPy devuelve un ndarray, sin él una lista"""
+        if np is not None:
+            values = np.asarray(values, dtype=float)
+        else:
+            values = list(values)
+        if len(values) == 0:
+            return values
+        for stage in self.stages:
+            values = stage.process_block(values)
+        return values
+
+
+_STAGE_TYPES = {
+    'moving_average': lambda c: MovingAverageFilter(c.get('window', 5)),
+    'ewma': lambda c: EWMAFilter(c.get('alpha', 0.3)),
+    'median': lambda c: MedianSpikeFilter(c.get('window', 5), c.get('threshold', 5.0)),
+    'kalman': lambda c: KalmanFilter(c.get('process_variance', 0.01), c.get('measurement_variance', 0.25)),
+    'calibration': lambda c: CalibrationTable(c['points'], c.get('resolution', 1024)),
+}
+
+
+def create_filter_chain(config: Optional[Dict[str, Any]], sensor_channel: Optional[int] = None) -> Optional[FilterChain]:
+    """Crea la cadena del canal indicado ('channels') o la común ('default')"""
+    if not config:
+        return None
+
+    channels = config.get('channels', {}) or {}
+    stage_configs = channels.get(sensor_channel, channels.get(str(sensor_channel)))
+    if stage_configs is None:
+        stage_configs = config.get('default', []) or []
+
+    stages = []
+    for stage_config in stage_configs:
+        factory = _STAGE_TYPES.get(stage_config.get('type'))
+        if factory is None:
+            raise ValueError(f"Etapa de filtrado no soportada: {stage_config.get('type')}")
+        stages.append(factory(stage_config))
+
+    if not stages:
+        return None
+    if np is None:
+        print("Warning: NumPy no disponible, acondicionamiento por bloques sin vectorizar")
+    return FilterChain(stages)
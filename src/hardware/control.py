@@ -0,0 +1,163 @@
+"""
+Control de presión en lazo cerrado
+Controlador PID con anti-windup y limitación de velocidad, y modelos de planta
+"""
+
+import math
+from typing import Dict, Any, Optional
+
+
+class PIDController:
+    """PID discreto con derivada sobre la medida, anti-windup y limitación de pendiente
+
+    El estado es fijo (__slots__) y update() no crea estructuras, para poder
+    ejecutarse a frecuencias de lazo altas.
+    """
+
+    __slots__ = ('kp', 'ki', 'kd', 'feed_forward', 'output_min', 'output_max',
+                 'rate_limit', 'integral', 'output', '_last_measurement')
+
+    def __init__(self, kp: float, ki: float = 0.0, kd: float = 0.0, feed_forward: float = 0.0,
+                 output_min: float = 0.0, output_max: float = 1.0,
+                 rate_limit: Optional[float] = None):
+        self.kp = kp
+        self.ki = ki
+        self.kd = kd
+        self.feed_forward = feed_forward  # Salida por unidad de consigna (modelo estático)
+        self.output_min = output_min
+        self.output_max = output_max
+        self.rate_limit = rate_limit  # Cambio máximo de la salida por segundo
+        self.integral = 0.0
+        self.output = 0.0
+        self._last_measurement = 0.0
+
+    def reset(self, measurement: float = 0.0, output: float = 0.0):
+        """Reinicia el estado (sin salto de derivada en el primer paso)"""
+        self.integral = 0.0
+        self.output = output
+        self._last_measurement = measurement
+
+    def update(self, setpoint: float, measurement: float, dt: float) -> float:
+        """Calcula la salida del lazo para un paso de duración dt"""
+        error = setpoint - measurement
+
+        # Derivada sobre la medida: sin picos al cambiar la consigna
+        derivative = (measurement - self._last_measurement) / dt
+        self._last_measurement = measurement
+
+        integral = self.integral + self.ki * error * dt
+        demand = self.feed_forward * setpoint + self.kp * error + integral - self.kd * derivative
+
+        # Saturación del actuador
+        output = demand
+        if output > self.output_max:
+            output = self.output_max
+        elif output < self.output_min:
+            output = self.output_min
+
+        # Limitación de pendiente de la salida (actuador)
+        if self.rate_limit is not None:
+            max_step = self.rate_limit * dt
+            if output > self.output + max_step:
+                output = self.output + max_step
+            elif output < self.output - max_step:
+                output = self.output - max_step
+
+        # Anti-windup por integración condicional sobre la salida final: no
+        # acumular mientras la saturación o la limitación de pendiente recortan,
+        # salvo si el error empuja de vuelta hacia dentro del margen
+        if output < demand:
+            if error < 0:
+                self.integral = integral
+        elif output > demand:
+            if error > 0:
+                self.integral = integral
+        else:
+            self.integral = integral
+
+        self.output = output
+        return output
+
+
+class FirstOrderPlant:
+    """Planta de primer orden: tau·dp/dt = ganancia·u + ambiente - p"""
+
+    __slots__ = ('gain', 'time_constant', 'ambient', 'pressure', '_dt', '_alpha')
+
+    def __init__(self, gain: float, time_constant: float, ambient: float = 0.0):
+        self.gain = gain
+        self.time_constant = time_constant
+        self.ambient = ambient
+        self.pressure = ambient
+        self._dt = 0.0
+        self._alpha = 0.0
+
+    def reset(self, pressure: float):
+        """Fija el estado de la planta"""
+        self.pressure = pressure
+
+    def step(self, output: float, dt: float) -> float:
+        """Avanza la planta dt segundos con la entrada indicada (discretización exacta)"""
+        if dt != self._dt:
+            self._dt = dt
+            self._alpha = 1.0 - math.exp(-dt / self.time_constant)
+        target = self.gain * output + self.ambient
+        self.pressure += (target - self.pressure) * self._alpha
+        return self.pressure
+
+
+class SecondOrderPlant:
+    """Planta de segundo orden: p'' = wn²·(ganancia·u + ambiente - p) - 2·ζ·wn·p'"""
+
+    __slots__ = ('gain', 'natural_frequency', 'damping', 'ambient', 'pressure', 'rate')
+
+    def __init__(self, gain: float, natural_frequency: float, damping: float = 0.7,
+                 ambient: float = 0.0):
+        self.gain = gain
+        self.natural_frequency = natural_frequency
+        self.damping = damping
+        self.ambient = ambient
+        self.pressure = ambient
+        self.rate = 0.0
+
+    def reset(self, pressure: float):
+        """Fija el estado de la planta en reposo"""
+        self.pressure = pressure
+        self.rate = 0.0
+
+    def step(self, output: float, dt: float) -> float:
+        """Avanza la planta dt segundos (Euler semi-implícito)"""
+        wn = self.natural_frequency
+        target = self.gain * output + self.ambient
+        acceleration = wn * wn * (target - self.pressure) - 2.0 * self.damping * wn * self.rate
+        self.rate += acceleration * dt
+        self.pressure += self.rate * dt
+        return self.pressure
+
+
+def create_controller(config: Dict[str, Any]) -> PIDController:
+    """Crea el controlador a partir de la sección 'control' de la configuración"""
+    rate_limit = config.get('output_rate_limit')
+    return PIDController(
+        kp=float(config.get('kp', 0.02)),
+        ki=float(config.get('ki', 0.004)),
+        kd=float(config.get('kd', 0.0)),
+        feed_forward=float(config.get('feed_forward', 0.0)),
+        output_min=float(config.get('output_min', 0.0)),
+        output_max=float(config.get('output_max', 1.0)),
+        rate_limit=float(rate_limit) if rate_limit is not None else None
+    )
+
+
+def create_plant(config: Dict[str, Any]):
+    """Crea el modelo de planta (orden 1 o 2) a partir de la configuración"""
+    order = int(config.get('order', 1))
+    gain = float(config.get('gain', 100.0))
+    ambient = float(config.get('ambient', 0.0))
+
+    if order == 1:
+        return FirstOrderPlant(gain, float(config.get('time_constant', 20.0)), ambient)
+    if order == 2:
+        return SecondOrderPlant(gain, float(config.get('natural_frequency', 0.1)),
+                                float(config.get('damping', 0.8)), ambient)
+    raise ValueError(f"Orden de planta no soportado: {order}")
@@ -0,0 +1,230 @@
+"""
+Salidas físicas (luz y sirena)
+Controlador de salidas con cola de órdenes asíncrona, coalescencia y límite de cadencia
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Optional, Dict, Any
+
+# RPi.GPIO solo existe en la Raspberry Pi: sin él se usa el backend simulado
+try:
+    import RPi.GPIO as GPIO
+except ImportError:
+    GPIO = None
+
+
+class OutputBackend:
+    """Escritura de una salida digital"""
+
+    def setup(self, pin: int):
+        """Prepara el pin como salida en estado inactivo"""
+
+    def write(self, pin: int, state: bool):
+        raise NotImplementedError
+
+    def close(self):
+        """Libera los recursos del backend"""
+
+
+class SimulatedOutputBackend(OutputBackend):
+    """Backend simulado con retardo de escritura configurable e historial de cambios"""
+
+    def __init__(self, write_delay_s: float = 0.0, history: int = 256):
+        self.write_delay_s = write_delay_s
+        self.states: Dict[int, bool] = {}
+        self.history: deque = deque(maxlen=history)  # (instante monotónico, pin, estado)
+
+    def setup(self, pin: int):
+        self.states[pin] = False
+
+    def write(self, pin: int, state: bool):
+        if self.write_delay_s > 0:
+            time.sleep(self.write_delay_s)
+        self.states[pin] = state
+        self.history.append((time.monotonic(), pin, state))
+
+
+class GPIOOutputBackend(OutputBackend):
+    """Salidas GPIO de la Raspberry Pi (numeración BCM)"""
+
+    def __init__(self, active_high: bool = True):
+        if GPIO is None:
+            raise ImportError("RPi.GPIO no disponible")
+        self.active_high = active_high
+        GPIO.setmode(GPIO.BCM)
+        GPIO.setwarnings(False)
+
+    def _level(self, state: bool):
+        return GPIO.HIGH if state == self.active_high else GPIO.LOW
+
+    def setup(self, pin: int):
+        GPIO.setup(pin, GPIO.OUT, initial=self._level(False))
+
+    def write(self, pin: int, state: bool):
+        GPIO.output(pin, self._level(state))
+
+    def close(self):
+        GPIO.cleanup()
+
+
+class OutputDriver:
+    """Salidas con nombre gobernadas por un hilo propio
+
+    set() solo actualiza el estado deseado y nunca espera al hardware. Las
+    órdenes repetidas con el mismo estado se descartan (una alarma roja por
+    tick se convierte en un único cambio de salida) y cada salida cambia como
+    mucho una vez cada min_interval_s; los cambios intermedios se coalescen.
+    """
+
+    def __init__(self, backend: OutputBackend, channels: Dict[str, int], min_interval_s: float = 0.2):
+        self.backend = backend
+        self.channels = dict(channels)
+        self.min_interval_s = min_interval_s
+
+        self._condition = threading.Condition()
+        self._target: Dict[str, bool] = {name: False for name in self.channels}
+        self._applied: Dict[str, bool] = {name: False for name in self.channels}
+        self._pending: Dict[str, int] = {}  # salida -> instante de la primera orden sin aplicar (ns)
+        self._last_change: Dict[str, float] = {}
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+        self.requested = 0
+        self.coalesced = 0
+        self.applied = 0
+        self.rate_limited = 0
+        self.errors = 0
+        self.last_latency_ms = 0.0
+        self.max_latency_ms = 0.0
+        self._total_latency_ms = 0.0
+
+        for pin in self.channels.values():
+            self.backend.setup(pin)
+
+    def start(self):
+        """Arranca el hilo de actuación"""
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="output-driver", daemon=True)
+        self._thread.start()
+
+    def set(self, channel: str, state: bool) -> bool:
+        """Solicita un estado; False si coincide con el ya solicitado (coalescido)"""
+        if channel not in self.channels:
+            return False
+
+        with self._condition:
+            self.requested += 1
+            if self._target[channel] == state:
+                self.coalesced += 1
+                return False
+            self._target[channel] = state
+            self._pending.setdefault(channel, time.perf_counter_ns())
+            self._condition.notify()
+        return True
+
+    def get_state(self, channel: str) -> bool:
+        """Último estado aplicado en la salida"""
+        return self._applied.get(channel, False)
+
+    def _run(self):
+        condition = self._condition
+        while True:
+            with condition:
+                while self._running and not self._pending:
+                    condition.wait()
+                if not self._running:
+                    return
+
+                # Salidas listas según su cadencia máxima; el resto espera
+                now = time.monotonic()
+                ready = []
+                wait = None
+                for channel in list(self._pending):
+                    remaining = self._last_change.get(channel, float('-inf')) + self.min_interval_s - now
+                    if remaining <= 0:
+                        ready.append((channel, self._target[channel], self._pending.pop(channel)))
+                    elif wait is None or remaining < wait:
+                        wait = remaining
+                if not ready:
+                    self.rate_limited += 1
+                    condition.wait(wait)
+                    continue
+
+            for channel, state, requested_ns in ready:
+                self._apply(channel, state, requested_ns)
+
+    def _apply(self, channel: str, state: bool, requested_ns: int):
+        if self._applied[channel] == state:
+            # Encendido y apagado antes de aplicarse: no hay cambio que hacer
+            self.coalesced += 1
+            return
+        try:
+            self.backend.write(self.channels[channel], state)
+        except Exception as e:
+            self.errors += 1
+            print(f"Error escribiendo salida '{channel}': {e}")
+            return
+
+        self._applied[channel] = state
+        self._last_change[channel] = time.monotonic()
+        latency = (time.perf_counter_ns() - requested_ns) / 1e6
+        self.applied += 1
+        self.last_latency_ms = latency
+        self._total_latency_ms += latency
+        if latency > self.max_latency_ms:
+            self.max_latency_ms = latency
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            'states': dict(self._applied),
+            'requested': self.requested,
+            'coalesced': self.coalesced,
+            'applied': self.applied,
+            'rate_limited': self.rate_limited,
+            'errors': self.errors,
+            'last_latency_ms': round(self.last_latency_ms, 3),
+            'avg_latency_ms': round(self._total_latency_ms / self.applied, 3) if self.applied else 0.0,
+            'max_latency_ms': round(self.max_latency_ms, 3)
+        }
+
+    def close(self):
+        """Apaga las salidas, detiene el hilo y libera el backend"""
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        if self._thread:
+            self._thread.join(timeout=1.0)
+        for name, pin in self.channels.items():
+            if self._applied[name]:
+                try:
+                    self.backend.write(pin, False)
+                except Exception as e:
+                    print(f"Error apagando salida '{name}': {e}")
+        self.backend.close()
+
+
+def create_output_driver(config: Optional[Dict[str, Any]]) -> OutputDriver:
+    """Crea el controlador de salidas a partir de la sección 'hardware'"""
+    config = config or {}
+    outputs = config.get('outputs', {}) or {}
+    channels = {
+        'light': int(outputs.get('light_pin', 23)),
+        'siren': int(outputs.get('siren_pin', 24)),
+    }
+
+    backend: Optional[OutputBackend] = None
+    if not config.get('simulation_mode', True):
+        try:
+            backend = GPIOOutputBackend(bool(outputs.get('active_high', True)))
+        except ImportError:
+            print("Warning: RPi.GPIO no disponible, usando salidas simuladas")
+    if backend is None:
+        backend = SimulatedOutputBackend(float(outputs.get('simulated_write_delay_ms', 0)) / 1000.0)
+
+    driver = OutputDriver(backend, channels, float(outputs.get('min_interval_ms', 200)) / 1000.0)
+    driver.start()
+    return driver
@@ -0,0 +1,184 @@
+"""
+Fuentes de lectura de presión
+Separan la adquisición de la lógica de fases de la ejecución
+"""
+
+from typing import Optional, Dict, Any, List
+
+from .control import PIDController, create_controller, create_plant
+from .conditioning import FilterChain, create_filter_chain
+
+
+class PressureSource:
+    """Fuente de lecturas de presión de una cámara"""
+
+    # True cuando la fuente no puede entregar más lecturas (p. ej. repetición terminada)
+    exhausted = False
+
+    def read(self, chamber) -> Optional[float]:
+        """Devuelve la presión del tick actual o None si no hay lectura"""
+        raise NotImplementedError
+
+    def read_block(self, chamber) -> Optional[List[float]]:
+        """Muestras del sensor tomadas durante el tick (la última es la lectura del tick)"""
+        value = self.read(chamber)
+        return None if value is None else [value]
+
+
+class SimulatedPressureSource(PressureSource):
+    """Modelo simulado: rampa lineal en setup y variación aleatoria acotada en ejecución"""
+
+    def __init__(self):
+        self.pressure = 0.0  # Estado propio del modelo (sin acondicionar)
+        self._execution = None
+
+    def read(self, chamber) -> Optional[float]:
+        program = chamber.current_program
+        if chamber.current_execution is not self._execution:
+            # Nueva ejecución o reanudación: partir del estado actual de la cámara
+            self._execution = chamber.current_execution
+            self.pressure = chamber.current_pressure
+
+        if chamber.execution_phase == "setup":
+            # Subir presión gradualmente hasta la mínima
+            self.pressure = min(self.pressure + chamber.pressure_increment, program.min_pressure)
+            return self.pressure
+
+        # Variación controlada con el generador de la cámara (reproducible con semilla)
+        pressure = self.pressure + chamber.rng.uniform(-0.8, 1.2)
+
+        # Mantener presión en rango válido para simulación
+        self.pressure = max(program.min_pressure * 0.9, min(program.max_pressure * 1.1, pressure))
+        return self.pressure
+
+
+class ControlledPressureSource(PressureSource):
+    """Lazo cerrado: un PID acciona una planta (modelo físico o adaptador de hardware)
+
+    La planta solo necesita reset(presión) y step(salida, dt) -> presión, de modo
+    que un adaptador que escriba la válvula y lea el sensor real la sustituye
+    sin cambios. Cada tick de ejecución (1 s) se resuelve en loop_rate_hz pasos,
+    y el sensor se muestrea a esa misma frecuencia (read_block).
+    """
+
+    def __init__(self, controller: PIDController, plant, loop_rate_hz: float = 10.0,
+                 measurement_noise: float = 0.0, setpoint_fraction: float = 0.5):
+        self.controller = controller
+        self.plant = plant
+        self.substeps = max(1, int(round(loop_rate_hz)))
+        self.dt = 1.0 / self.substeps
+        self.measurement_noise = measurement_noise
+        self.setpoint_fraction = setpoint_fraction  # Consigna dentro de la banda [mín, máx]
+        self.setpoint = 0.0
+        self._execution = None
+
+    def _setpoint(self, chamber) -> float:
+        """Consigna: rampa de referencia en setup y tabla del perfil en ejecución"""
+        profile = chamber.profile
+        if chamber.execution_phase == "setup":
+            index = 0
+        else:
+            index = profile.index(chamber.program_elapsed_seconds)  # Segundo que evaluará este tick
+        target = profile.setpoint[index]
+        if self.setpoint_fraction != 0.5:
+            # Desplazamiento de la consigna dentro de la banda de alarma
+            target = profile.low[index] + (profile.high[index] - profile.low[index]) * self.setpoint_fraction
+        if chamber.execution_phase == "setup":
+            return min(chamber.pressure_increment * (chamber.elapsed_seconds + 1), target)
+        return target
+
+    def read(self, chamber) -> Optional[float]:
+        return self.read_block(chamber)[-1]
+
+    def read_block(self, chamber) -> Optional[List[float]]:
+        if chamber.current_execution is not self._execution:
+            # Nueva ejecución o reanudación: partir del estado actual de la cámara
+            self._execution = chamber.current_execution
+            self.plant.reset(chamber.current_pressure)
+            self.controller.reset(chamber.current_pressure)
+
+        setpoint = self._setpoint(chamber)
+        self.setpoint = setpoint
+        controller = self.controller
+        plant = self.plant
+        dt = self.dt
+        noise = self.measurement_noise
+        gauss = chamber.rng.gauss
+
+        samples = []
+        for step in range(self.substeps):
+            measured = plant.pressure
+            if noise:
+                measured += gauss(0.0, noise)
+            if step:
+                samples.append(max(0.0, measured))  # La del primer paso es la del tick anterior
+            plant.step(controller.update(setpoint, measured, dt), dt)
+
+        # Lectura del sensor al final del tick
+        measured = plant.pressure
+        if noise:
+            measured += gauss(0.0, noise)
+        samples.append(max(0.0, measured))
+        return samples
+
+
+class ConditionedPressureSource(PressureSource):
+    """Aplica la cadena de acondicionamiento del sensor a otra fuente"""
+
+    def __init__(self, source: PressureSource, chain: FilterChain):
+        self.source = source
+        self.chain = chain
+        self.raw_pressure: Optional[float] = None  # Última lectura sin acondicionar
+        self._execution = None
+
+    @property
+    def exhausted(self) -> bool:
+        return self.source.exhausted
+
+    def condition(self, chamber, samples: List[float]) -> float:
+        """Acondiciona las muestras ya adquiridas del tick y devuelve la última filtrada
+
+        Un bloque de varias muestras (fuente muestreada a más de 1 Hz) pasa
+        por la cadena vectorizada; una sola muestra, por la ruta escalar.
+        """
+        if chamber.current_execution is not self._execution:
+            # El estado de los filtros no se arrastra entre ejecuciones
+            self._execution = chamber.current_execution
+            self.chain.reset()
+        self.raw_pressure = samples[-1]
+        if len(samples) == 1:
+            return self.chain.process(samples[0])
+        return float(self.chain.process_block(samples)[-1])
+
+    def read(self, chamber) -> Optional[float]:
+        samples = self.source.read_block(chamber)
+        if not samples:
+            return None
+        return self.condition(chamber, samples)
+
+
+def create_pressure_source(config: Optional[Dict[str, Any]] = None,
+                           sensor_channel: Optional[int] = None) -> PressureSource:
+    """Crea la fuente de presión de la configuración, con el acondicionamiento del canal"""
+    config = config or {}
+    source = _create_base_source(config)
+    chain = create_filter_chain(config.get('conditioning'), sensor_channel)
+    return ConditionedPressureSource(source, chain) if chain else source
+
+
+def _create_base_source(config: Dict[str, Any]) -> PressureSource:
+    """Crea la fuente de adquisición indicada en pressure_model"""
+    model = config.get('pressure_model', 'simulated')
+
+    if model == 'simulated':
+        return SimulatedPressureSource()
+    if model == 'pid':
+        control = config.get('control', {}) or {}
+        return ControlledPressureSource(
+            create_controller(control),
+            create_plant(control.get('plant', {}) or {}),
+            loop_rate_hz=float(control.get('loop_rate_hz', 10.0)),
+            measurement_noise=float(control.get('measurement_noise', 0.0)),
+            setpoint_fraction=float(control.get('setpoint_fraction', 0.5))
+        )
+    raise ValueError(f"Modelo de presión no soportado: {model}")
@@ -0,0 +1,4 @@
+"""
+Elementos gráficos nativos para QML
+Gráficas dibujadas con el scene graph de Qt Quick
+"""
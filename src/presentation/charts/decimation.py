@@ -0,0 +1,104 @@
+"""
+Diezmado mínimo/máximo por columna de píxeles
+Reduce series largas a dos puntos por columna conservando picos y valles
+"""
+
+from collections import deque
+from typing import Optional, List, Tuple
+
+
+class MinMaxDecimator:
+    """Serie temporal reducida a un par mínimo/máximo por columna
+
+    Las columnas son intervalos de tiempo fijos, así que cada muestra nueva
+    solo toca la última columna. Con ventana (window_s > 0) el ancho de
+    columna es window_s / columns y las columnas antiguas salen por la
+    izquierda; sin ventana (toda la serie) el ancho se duplica fusionando
+    columnas por parejas cuando no caben. En ambos casos el coste por
+    muestra es constante y nunca hay más de 'columns' columnas.
+    """
+
+    def __init__(self, columns: int, window_s: float = 0.0, initial_width_s: float = 1.0):
+        self.columns = max(2, columns)
+        self.window_s = max(0.0, window_s)
+        self.initial_width_s = initial_width_s
+        self.reset()
+
+    def reset(self):
+        self.width_s = self.window_s / self.columns if self.window_s > 0 else self.initial_width_s
+        # [índice de columna, t del mínimo, mínimo, t del máximo, máximo]
+        self._buckets: deque = deque()
+        self.last_time: Optional[float] = None
+        self.version = 0  # Cambia con cada muestra: indica si hay que regenerar vértices
+
+    def add(self, timestamp: float, value: float):
+        buckets = self._buckets
+        index = int(timestamp // self.width_s)
+        if buckets and index <= buckets[-1][0]:
+            # Misma columna (o reloj que retrocede): solo se ajustan los extremos
+            bucket = buckets[-1]
+            if value < bucket[2]:
+                bucket[1], bucket[2] = timestamp, value
+            if value > bucket[4]:
+                bucket[3], bucket[4] = timestamp, value
+        else:
+            buckets.append([index, timestamp, value, timestamp, value])
+            if self.window_s > 0:
+                oldest = index - self.columns + 1
+                while buckets[0][0] < oldest:
+                    buckets.popleft()
+            else:
+                while len(self._buckets) > self.columns:
+                    self._merge_pairs()
+        self.last_time = timestamp
+        self.version += 1
+
+    def _merge_pairs(self):
+        """Duplica el ancho de columna fusionando columnas vecinas"""
+        self.width_s *= 2
+        merged: deque = deque()
+        for index, t_min, v_min, t_max, v_max in self._buckets:
+            index //= 2
+            if merged and merged[-1][0] == index:
+                bucket = merged[-1]
+                if v_min < bucket[2]:
+                    bucket[1], bucket[2] = t_min, v_min
+                if v_max > bucket[4]:
+                    bucket[3], bucket[4] = t_max, v_max
+            else:
+                merged.append([index, t_min, v_min, t_max, v_max])
+        self._buckets = merged
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def points(self) -> List[Tuple[float, float]]:
+        """Extremos de cada columna en orden temporal (entrada de una polilínea)"""
+        points = []
+        append = points.append
+        for _, t_min, v_min, t_max, v_max in self._buckets:
+            if t_min < t_max:
+                append((t_min, v_min))
+                append((t_max, v_max))
+            elif t_max < t_min:
+                append((t_max, v_max))
+                append((t_min, v_min))
+            else:
+                append((t_min, v_min))
+        return points
+
+    def time_span(self) -> Tuple[float, float]:
+        """Intervalo de tiempo que ocupa el eje horizontal"""
+        if not self._buckets:
+            return 0.0, max(self.window_s, 1.0)
+        end = (self._buckets[-1][0] + 1) * self.width_s
+        if self.window_s > 0:
+            return end - self.window_s, end
+        return self._buckets[0][0] * self.width_s, end
+
+    def value_range(self) -> Tuple[float, float]:
+        """Mínimo y máximo de las columnas visibles"""
+        if not self._buckets:
+            return 0.0, 1.0
+        return (min(bucket[2] for bucket in self._buckets),
+                max(bucket[4] for bucket in self._buckets))
@@ -0,0 +1,261 @@
+"""
+Gráfica de tendencia de presión
+QQuickItem que dibuja el historial en memoria con geometría del scene graph
+"""
+
+from typing import Optional, List, Tuple
+from PyQt6.QtCore import QObject, pyqtSignal, pyqtProperty
+from PyQt6.QtGui import QColor
+from PyQt6.QtQuick import QQuickItem, QSGGeometryNode, QSGGeometry, QSGFlatColorMaterial, QSGNode
+
+from .decimation import MinMaxDecimator
+
+
+class TrendChart(QQuickItem):
+    """Polilínea de presión de una cámara sin Canvas ni repintado completo
+
+    Las muestras nuevas del SampleHistory de la cámara se añaden al
+    diezmador (una columna mínimo/máximo por píxel) al llegar la telemetría
+    de la cámara; el nodo de geometría solo se regenera cuando hubo muestras
+    nuevas, con como mucho dos vértices por columna, así que el coste de
+    dibujo depende del ancho en píxeles y no de las horas de datos.
+
+    'source' es el ExecutionController (señal chamberTelemetryUpdated y
+    método get_sample_history). timeWindow en segundos; 0 muestra toda la
+    ejecución. Si maxValue <= minValue el eje vertical se ajusta a los datos.
+    resolution son los píxeles por columna (1 = máximo detalle); el
+    regulador de calidad la sube cuando el equipo va cargado.
+    """
+
+    sourceChanged = pyqtSignal()
+    chamberIdChanged = pyqtSignal()
+    timeWindowChanged = pyqtSignal()
+    lineColorChanged = pyqtSignal()
+    lineWidthChanged = pyqtSignal()
+    rangeChanged = pyqtSignal()
+    resolutionChanged = pyqtSignal()
+    sampleCountChanged = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setFlag(QQuickItem.Flag.ItemHasContents, True)
+        self._source: Optional[QObject] = None
+        self._chamber_id = 1
+        self._time_window = 600.0
+        self._line_color = QColor("#3498DB")
+        self._line_width = 2.0
+        self._min_value = 0.0
+        self._max_value = 0.0
+        self._resolution = 1
+
+        self._history = None
+        self._seen_total = 0
+        self._seen_generation = -1
+        self._decimator = MinMaxDecimator(self._columns(), self._time_window)
+        self._rendered_version = -1
+        self._rendered_size = (0.0, 0.0)
+        self._style_dirty = True
+
+        self.widthChanged.connect(self._rebuild)
+        self.heightChanged.connect(self.update)
+
+    def _columns(self) -> int:
+        return max(2, int(self.width()) // self._resolution)  # Una columna cada 'resolution' píxeles
+
+    # --- Alimentación desde el historial ---
+
+    def _on_telemetry(self, chamber_id: int, _snapshot=None):
+        if chamber_id == self._chamber_id:
+            self._sync()
+
+    def _get_history(self):
+        if self._source is None or not hasattr(self._source, 'get_sample_history'):
+            return None
+        return self._source.get_sample_history(self._chamber_id)
+
+    def _sync(self):
+        """Pasa al diezmador solo las muestras nuevas del historial"""
+        history = self._get_history()
+        if history is None:
+            return
+        if (history is not self._history or history.generation != self._seen_generation
+                or history.total - self._seen_total > history.capacity or history.total < self._seen_total):
+            self._rebuild()
+            return
+
+        if history.total != self._seen_total:
+            add = self._decimator.add
+            for timestamp, value in history.get_since(self._seen_total):
+                add(timestamp, value)
+            self._seen_total = history.total
+            self.sampleCountChanged.emit()
+            self.update()
+
+    def _rebuild(self):
+        """Recalcula las columnas desde el historial completo (cambio de ancho, ventana o ejecución)"""
+        self._decimator = MinMaxDecimator(self._columns(), self._time_window)
+        self._rendered_version = -1
+        history = self._get_history()
+        self._history = history
+        if history is not None:
+            add = self._decimator.add
+            for timestamp, value in history.get_all():
+                add(timestamp, value)
+            self._seen_total = history.total
+            self._seen_generation = history.generation
+        else:
+            self._seen_total = 0
+            self._seen_generation = -1
+        self.sampleCountChanged.emit()
+        self.update()
+
+    # --- Scene graph ---
+
+    def _screen_points(self) -> List[Tuple[float, float]]:
+        width, height = self.width(), self.height()
+        decimator = self._decimator
+        t0, t1 = decimator.time_span()
+        if self._max_value > self._min_value:
+            v0, v1 = self._min_value, self._max_value
+        else:
+            v0, v1 = decimator.value_range()
+            margin = max((v1 - v0) * 0.05, 0.5)
+            v0, v1 = v0 - margin, v1 + margin
+        x_scale = width / (t1 - t0) if t1 > t0 else 0.0
+        y_scale = height / (v1 - v0) if v1 > v0 else 0.0
+        return [((t - t0) * x_scale, height - (v - v0) * y_scale) for t, v in decimator.points()]
+
+    def updatePaintNode(self, node, _update_data):
+        if node is None:
+            node = QSGGeometryNode()
+            geometry = QSGGeometry(QSGGeometry.defaultAttributes_Point2D(), 0)
+            geometry.setDrawingMode(QSGGeometry.DrawingMode.DrawLineStrip.value)
+            node.setGeometry(geometry)
+            node.setFlag(QSGNode.Flag.OwnsGeometry, True)
+            node.setMaterial(QSGFlatColorMaterial())
+            node.setFlag(QSGNode.Flag.OwnsMaterial, True)
+            self._style_dirty = True
+            self._rendered_version = -1
+
+        if self._style_dirty:
+            node.material().setColor(self._line_color)
+            node.geometry().setLineWidth(self._line_width)
+            node.markDirty(QSGNode.DirtyStateBit.DirtyMaterial)
+            self._style_dirty = False
+
+        # Sin muestras nuevas ni cambio de tamaño la geometría subida sigue valiendo
+        size = (self.width(), self.height())
+        if self._decimator.version == self._rendered_version and size == self._rendered_size:
+            return node
+
+        points = self._screen_points()
+        geometry = node.geometry()
+        geometry.allocate(len(points))
+        if points:
+            vertices = geometry.vertexDataAsPoint2D()
+            for vertex, (x, y) in zip(vertices, points):
+                vertex.set(x, y)
+        node.markDirty(QSGNode.DirtyStateBit.DirtyGeometry)
+        self._rendered_version = self._decimator.version
+        self._rendered_size = size
+        return node
+
+    # --- Propiedades ---
+
+    def get_source(self) -> Optional[QObject]:
+        return self._source
+
+    def set_source(self, source: Optional[QObject]):
+        if source is self._source:
+            return
+        if self._source is not None and hasattr(self._source, 'chamberTelemetryUpdated'):
+            try:
+                self._source.chamberTelemetryUpdated.disconnect(self._on_telemetry)
+            except TypeError:
+                pass
+        self._source = source
+        if source is not None and hasattr(source, 'chamberTelemetryUpdated'):
+            source.chamberTelemetryUpdated.connect(self._on_telemetry)
+        self._rebuild()
+        self.sourceChanged.emit()
+
+    def get_chamber_id(self) -> int:
+        return self._chamber_id
+
+    def set_chamber_id(self, chamber_id: int):
+        if chamber_id != self._chamber_id:
+            self._chamber_id = chamber_id
+            self._rebuild()
+            self.chamberIdChanged.emit()
+
+    def get_time_window(self) -> float:
+        return self._time_window
+
+    def set_time_window(self, seconds: float):
+        if seconds != self._time_window:
+            self._time_window = max(0.0, seconds)
+            self._rebuild()
+            self.timeWindowChanged.emit()
+
+    def get_line_color(self) -> QColor:
+        return self._line_color
+
+    def set_line_color(self, color: QColor):
+        if color != self._line_color:
+            self._line_color = QColor(color)
+            self._style_dirty = True
+            self.update()
+            self.lineColorChanged.emit()
+
+    def get_line_width(self) -> float:
+        return self._line_width
+
+    def set_line_width(self, line_width: float):
+        if line_width != self._line_width:
+            self._line_width = line_width
+            self._style_dirty = True
+            self.update()
+            self.lineWidthChanged.emit()
+
+    def get_min_value(self) -> float:
+        return self._min_value
+
+    def set_min_value(self, value: float):
+        if value != self._min_value:
+            self._min_value = value
+            self._rendered_version = -1
+            self.update()
+            self.rangeChanged.emit()
+
+    def get_max_value(self) -> float:
+        return self._max_value
+
+    def set_max_value(self, value: float):
+        if value != self._max_value:
+            self._max_value = value
+            self._rendered_version = -1
+            self.update()
+            self.rangeChanged.emit()
+
+    def get_resolution(self) -> int:
+        return self._resolution
+
+    def set_resolution(self, pixels: int):
+        pixels = max(1, int(pixels))
+        if pixels != self._resolution:
+            self._resolution = pixels
+            self._rebuild()
+            self.resolutionChanged.emit()
+
+    def get_sample_count(self) -> int:
+        return self._seen_total
+
+    source = pyqtProperty(QObject, get_source, set_source, notify=sourceChanged)
+    chamberId = pyqtProperty(int, get_chamber_id, set_chamber_id, notify=chamberIdChanged)
+    timeWindow = pyqtProperty(float, get_time_window, set_time_window, notify=timeWindowChanged)
+    lineColor = pyqtProperty(QColor, get_line_color, set_line_color, notify=lineColorChanged)
+    lineWidth = pyqtProperty(float, get_line_width, set_line_width, notify=lineWidthChanged)
+    minValue = pyqtProperty(float, get_min_value, set_min_value, notify=rangeChanged)
+    maxValue = pyqtProperty(float, get_max_value, set_max_value, notify=rangeChanged)
+    resolution = pyqtProperty(int, get_resolution, set_resolution, notify=resolutionChanged)
+    sampleCount = pyqtProperty(int, get_sample_count, notify=sampleCountChanged)
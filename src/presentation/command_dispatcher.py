@@ -0,0 +1,204 @@
+"""
+Capa de comandos asíncronos
+Ejecuta llamadas a servicios y repositorios en un QThreadPool y entrega los resultados en el hilo de la interfaz
+"""
+
+import itertools
+from typing import Optional, Dict, Any, Callable, Tuple
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from business.services.event_bus import EventBus
+
+# Hilos de trabajo compartidos: consultas SQLite y bcrypt no compiten con el
+# lazo de control por más de dos núcleos de la Raspberry Pi
+WORKER_THREADS = 2
+
+_pool: Optional[QThreadPool] = None
+_invoker: Optional['_MainThreadInvoker'] = None
+
+
+def _shared_pool() -> QThreadPool:
+    global _pool
+    if _pool is None:
+        _pool = QThreadPool()
+        _pool.setMaxThreadCount(WORKER_THREADS)
+        # Sin caducidad: cada hilo conserva su conexión SQLite abierta
+        _pool.setExpiryTimeout(-1)
+    return _pool
+
+
+class _MainThreadInvoker(QObject):
+    """Ejecuta en el hilo de la interfaz las funciones emitidas desde otros hilos"""
+
+    invoke = pyqtSignal(object)
+
+    def __init__(self):
+        super().__init__()
+        self.invoke.connect(self._run)
+
+    def _run(self, callback: Callable[[], None]):
+        callback()
+
+
+def install_event_bus_dispatch():
+    """Entrega en el hilo de la interfaz los eventos publicados desde hilos de trabajo
+
+    Debe llamarse desde el hilo principal antes de crear los controladores.
+    """
+    global _invoker
+    if _invoker is None:
+        _invoker = _MainThreadInvoker()
+        EventBus().set_thread_dispatcher(_invoker.invoke.emit)
+
+
+def shutdown_command_pool(timeout_ms: int = 3000):
+    """Descarta los comandos en espera y aguarda a los que están en curso"""
+    if _pool is not None:
+        _pool.clear()
+        _pool.waitForDone(timeout_ms)
+
+
+class _CommandSignals(QObject):
+    # request_id, resultado, excepción (None si terminó bien)
+    finished = pyqtSignal(int, object, object)
+
+
+class _Command(QRunnable):
+    """Llamada ejecutada en un hilo del pool"""
+
+    def __init__(self, request_id: int, fn: Callable[..., Any], args: Tuple, signals: _CommandSignals):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.request_id = request_id
+        self.fn = fn
+        self.args = args
+        self.signals = signals
+        self.cancelled = False
+
+    def run(self):
+        if self.cancelled:
+            return
+        try:
+            result, error = self.fn(*self.args), None
+        except Exception as e:
+            result, error = None, e
+        if self.cancelled:
+            return
+        try:
+            # El emisor vive en el hilo de la interfaz: la conexión es encolada
+            self.signals.finished.emit(self.request_id, result, error)
+        except RuntimeError:
+            pass  # Aplicación cerrándose
+
+
+class CommandDispatcher(QObject):
+    """Despacha comandos a los hilos de trabajo y devuelve sus resultados encolados
+
+    Cada comando recibe un id de petición. Los comandos con la misma clave
+    se sustituyen entre sí: al enviar uno nuevo, el anterior se retira del
+    pool si aún no había empezado y, si ya estaba en curso, su resultado se
+    descarta (p. ej. una búsqueda por cada pulsación). Las funciones
+    on_done/on_error se invocan siempre en el hilo de la interfaz.
+    """
+
+    commandFinished = pyqtSignal(int, bool)  # request_id, success
+    busyChanged = pyqtSignal()
+
+    _request_ids = itertools.count(1)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pool = _shared_pool()
+        self._signals = _CommandSignals(self)
+        self._signals.finished.connect(self._on_finished)
+        # request_id -> (clave, comando, on_done, on_error)
+        self._commands: Dict[int, Tuple[Optional[str], _Command, Optional[Callable], Optional[Callable]]] = {}
+        self._keys: Dict[str, int] = {}
+        self.completed = 0
+        self.failed = 0
+        self.superseded = 0
+
+    def submit(self, fn: Callable[..., Any], *args, key: Optional[str] = None,
+               on_done: Optional[Callable[[Any], None]] = None,
+               on_error: Optional[Callable[[Exception], None]] = None) -> int:
+        """Encola fn(*args) en el pool; devuelve el id de la petición"""
+        if key is not None:
+            self.cancel(key)
+
+        request_id = next(self._request_ids)
+        command = _Command(request_id, fn, args, self._signals)
+        was_busy = bool(self._commands)
+        self._commands[request_id] = (key, command, on_done, on_error)
+        if key is not None:
+            self._keys[key] = request_id
+        self.pool.start(command)
+        if not was_busy:
+            self.busyChanged.emit()
+        return request_id
+
+    def cancel(self, key: str) -> bool:
+        """Cancela el comando pendiente con esa clave; True si había uno"""
+        request_id = self._keys.pop(key, None)
+        if request_id is None:
+            return False
+        return self._drop(request_id)
+
+    def cancel_request(self, request_id: int) -> bool:
+        """Cancela un comando por su id de petición"""
+        entry = self._commands.get(request_id)
+        if entry is None:
+            return False
+        if entry[0] is not None and self._keys.get(entry[0]) == request_id:
+            del self._keys[entry[0]]
+        return self._drop(request_id)
+
+    def _drop(self, request_id: int) -> bool:
+        entry = self._commands.pop(request_id, None)
+        if entry is None:
+            return False
+        command = entry[1]
+        command.cancelled = True
+        self.pool.tryTake(command)
+        self.superseded += 1
+        if not self._commands:
+            self.busyChanged.emit()
+        return True
+
+    def is_pending(self, key: str) -> bool:
+        return key in self._keys
+
+    def get_busy(self) -> bool:
+        return bool(self._commands)
+
+    def _on_finished(self, request_id: int, result: Any, error: Optional[Exception]):
+        entry = self._commands.pop(request_id, None)
+        if entry is None:
+            return  # Cancelado o sustituido mientras se ejecutaba
+        key, _command, on_done, on_error = entry
+        if key is not None and self._keys.get(key) == request_id:
+            del self._keys[key]
+        if not self._commands:
+            self.busyChanged.emit()
+
+        try:
+            if error is None:
+                self.completed += 1
+                if on_done:
+                    on_done(result)
+            else:
+                self.failed += 1
+                print(f"Error en comando asíncrono {request_id}: {error}")
+                if on_error:
+                    on_error(error)
+        except Exception as e:
+            print(f"Error procesando resultado del comando {request_id}: {e}")
+        self.commandFinished.emit(request_id, error is None)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            'pending': len(self._commands),
+            'completed': self.completed,
+            'failed': self.failed,
+            'superseded': self.superseded,
+            'active_threads': self.pool.activeThreadCount()
+        }
@@ -5,6 +5,7 @@ Gestiona la comunicación entre la UI y los servicios de autenticación
 
 from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot, pyqtProperty
 from business.services.auth_service import AuthService
+from presentation.command_dispatcher import CommandDispatcher
 
 class AuthController(QObject):
     """Controlador de autenticación para la interfaz"""
@@ -16,31 +17,39 @@ class AuthController(QObject):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.auth_service = AuthService()
+        self.commands = CommandDispatcher(self)
     
     @pyqtSlot(str, str)
     def login(self, username: str, password: str):
-        """Intenta autenticar al usuario"""
+        """Intenta autenticar al usuario (bcrypt y consulta en un hilo de trabajo)"""
         try:
             if not username.strip() or not password.strip():
                 self.loginResult.emit(False, "Usuario y contraseña son requeridos")
                 return
             
-            success = self.auth_service.login(username.strip(), password)
-            
-            if success:
-                self.userChanged.emit()
-                role = self.auth_service.get_user_role_display()
-                self.loginResult.emit(True, f"Bienvenido, {username} ({role})")
-            else:
-                self.loginResult.emit(False, "Usuario o contraseña incorrectos")
+            # Un segundo intento sustituye al que siga verificándose
+            self.commands.submit(self.auth_service.authenticate, username.strip(), password,
+                                 key='login', on_done=lambda user: self._on_authenticated(username, user),
+                                 on_error=lambda _error: self.loginResult.emit(False, "Error interno del sistema"))
                 
         except Exception as e:
             print(f"Error en login: {e}")
             self.loginResult.emit(False, "Error interno del sistema")
     
+    def _on_authenticated(self, username: str, user):
+        """Abre la sesión en el hilo de la interfaz con el resultado de la verificación"""
+        if user:
+            self.auth_service.start_session(user)
+            self.userChanged.emit()
+            role = self.auth_service.get_user_role_display()
+            self.loginResult.emit(True, f"Bienvenido, {username} ({role})")
+        else:
+            self.loginResult.emit(False, "Usuario o contraseña incorrectos")
+    
     @pyqtSlot()
     def logout(self):
         """Cierra la sesión del usuario"""
+        self.commands.cancel('login')
         self.auth_service.logout()
         self.userChanged.emit()
     
@@ -3,9 +3,16 @@ Controlador de ejecución de programas
 Gestiona la comunicación entre la UI y el servicio de ejecución
 """
 
+from datetime import datetime
 from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot, pyqtProperty
 from business.services.execution_service import ExecutionService
+from business.services.replay_service import ReplayService
 from business.services.auth_service import AuthService
+from business.services.event_bus import EventBus, EXECUTION_STARTED, EXECUTION_UPDATED, EXECUTION_FINISHED
+from presentation.models.execution_history_model import ExecutionHistoryModel
+from presentation.models.execution_state import ExecutionState
+from presentation.command_dispatcher import CommandDispatcher
+from utils.config_loader import ConfigLoader
 
 class ExecutionController(QObject):
     """Controlador de ejecución de programas para la interfaz"""
@@ -15,15 +22,51 @@ class ExecutionController(QObject):
     executionFinished = pyqtSignal(int, str)  # execution_id, status
     progressUpdated = pyqtSignal(int, int, int)  # elapsed, remaining, percentage
     statusChanged = pyqtSignal(str)  # status message
+    telemetryUpdated = pyqtSignal('QVariant')  # instantánea numérica de la cámara por defecto
     operationResult = pyqtSignal(bool, str)  # success, message
-    executionStateChanged = pyqtSignal()  # Para actualizar propiedades
+    executionStateChanged = pyqtSignal()  # Inicio, fin o corrección del estado de ejecución
+    isRunningChanged = pyqtSignal()
+    currentProgramNameChanged = pyqtSignal()
+    currentPressureChanged = pyqtSignal()
     cleanupCompleted = pyqtSignal(int)  # cantidad de ejecuciones limpiadas
     executionResumed = pyqtSignal('QVariant')  # program data when execution is resumed
+    chamberStateChanged = pyqtSignal(int)  # chamber_id (inicio/fin en cualquier cámara)
+    chamberProgressUpdated = pyqtSignal(int, int, int, int)  # chamber_id, elapsed, remaining, percentage
+    chamberAlarmTriggered = pyqtSignal(int, str, str)  # chamber_id, alarm_type, message
+    simulationFinished = pyqtSignal('QVariant')  # resumen de la simulación
+    executionSeriesReady = pyqtSignal(int, 'QVariant')  # execution_id, serie reducida {x, y, start, end, total}
+    chamberDeviationUpdated = pyqtSignal(int, float, float)  # chamber_id, desviación, rango percentil
+    chamberAnomalyDetected = pyqtSignal(int, str, float)  # chamber_id, detector, puntuación
+    chamberTelemetryUpdated = pyqtSignal(int, 'QVariant')  # chamber_id, instantánea numérica
+    queueChanged = pyqtSignal()  # entradas o estado de la cola de ejecución
+    queueEntryFailed = pyqtSignal(int, str)  # entry_id, motivo
+    programEnvelopeReady = pyqtSignal(int, 'QVariant')  # program_id, envolvente (None sin historial)
+    executionAnomalyScoresReady = pyqtSignal(int, 'QVariant')  # execution_id, puntuaciones registradas
+    replayStarted = pyqtSignal(int, int)  # execution_id, total_seconds
+    replayPositionChanged = pyqtSignal(int, int)  # position_seconds, total_seconds
+    replayPressureUpdated = pyqtSignal(float)
+    replayAlarmTriggered = pyqtSignal(str, str)  # alarm_type, message
+    replayPhaseChanged = pyqtSignal(str)
+    replayFinished = pyqtSignal(int, str)  # execution_id, status
     
     def __init__(self, auth_service: AuthService, parent=None):
         super().__init__(parent)
         self.auth_service = auth_service
         self.execution_service = ExecutionService(auth_service)
+        self.commands = CommandDispatcher(self)  # Consultas y simulaciones fuera del hilo de la interfaz
+        # Envolventes (carga y recálculo) en el pool de comandos, no en el tick de control
+        self.execution_service.execution_manager.set_background_runner(self.commands.submit)
+        
+        # Estado de la ejecución actual para QML (se actualiza por eventos, no por consulta)
+        self._current_execution = ExecutionState(self)
+        self._current_execution.runningChanged.connect(self.isRunningChanged.emit)
+        self._current_execution.programNameChanged.connect(self.currentProgramNameChanged.emit)
+        self._current_execution.pressureChanged.connect(self.currentPressureChanged.emit)
+        self.executionStateChanged.connect(self._sync_execution_state)
+        self.execution_service.executionStarted.connect(self._sync_execution_state)
+        self.execution_service.telemetryUpdated.connect(self._current_execution.apply_telemetry)
+        self.execution_service.phaseChanged.connect(self._current_execution.set_phase)
+        self._sync_execution_state()
         
         # Conectar señales del servicio
         self.execution_service.executionStarted.connect(self.executionStarted.emit)
@@ -31,6 +74,40 @@ class ExecutionController(QObject):
         self.execution_service.pressureUpdated.connect(self._on_pressure_updated)
         self.execution_service.progressUpdated.connect(self.progressUpdated.emit)
         self.execution_service.statusUpdated.connect(self.statusChanged.emit)
+        self.execution_service.telemetryUpdated.connect(self.telemetryUpdated.emit)
+        
+        # Señales multi-cámara
+        manager = self.execution_service.execution_manager
+        manager.chamberStarted.connect(lambda chamber_id, _execution_id: self.chamberStateChanged.emit(chamber_id))
+        manager.chamberFinished.connect(lambda chamber_id, _execution_id, _status: self.chamberStateChanged.emit(chamber_id))
+        manager.chamberProgressUpdated.connect(self.chamberProgressUpdated.emit)
+        manager.chamberAlarmTriggered.connect(self.chamberAlarmTriggered.emit)
+        manager.chamberDeviationUpdated.connect(self.chamberDeviationUpdated.emit)
+        manager.chamberAnomalyDetected.connect(self.chamberAnomalyDetected.emit)
+        manager.chamberTelemetryUpdated.connect(self.chamberTelemetryUpdated.emit)
+        
+        # Cola de ejecución
+        queue = self.execution_service.execution_queue
+        queue.queueChanged.connect(self.queueChanged.emit)
+        queue.entryFailed.connect(self.queueEntryFailed.emit)
+        
+        # Historial paginado (se carga la primera vez que QML lo pide)
+        page_size = ConfigLoader().load_config().get('screen', {}).get('list_page_size', 30)
+        self._history_model = ExecutionHistoryModel(self._fetch_history_page, page_size, self)
+        self._history_program_id = None
+        self._history_loaded = False
+        event_bus = EventBus()
+        for topic in (EXECUTION_STARTED, EXECUTION_UPDATED, EXECUTION_FINISHED):
+            event_bus.subscribe(topic, self._on_history_execution_changed)
+        
+        # Repetición de ejecuciones grabadas
+        self.replay_service = ReplayService()
+        self.replay_service.replayStarted.connect(self.replayStarted.emit)
+        self.replay_service.positionChanged.connect(self.replayPositionChanged.emit)
+        self.replay_service.pressureUpdated.connect(self.replayPressureUpdated.emit)
+        self.replay_service.alarmTriggered.connect(self.replayAlarmTriggered.emit)
+        self.replay_service.phaseChanged.connect(self.replayPhaseChanged.emit)
+        self.replay_service.replayFinished.connect(self.replayFinished.emit)
         
         print("ExecutionController inicializado")
     
@@ -66,12 +143,293 @@ class ExecutionController(QObject):
             print(f"Error en stop_execution: {e}")
             self.operationResult.emit(False, "Error interno del sistema")
     
+    @pyqtSlot(int, int)
+    def start_chamber_execution(self, chamber_id: int, program_id: int):
+        """Inicia la ejecución de un programa en una cámara concreta"""
+        try:
+            result = self.execution_service.start_program_execution(program_id, chamber_id=chamber_id)
+            
+            if result['success']:
+                self.executionStateChanged.emit()
+            self.operationResult.emit(result['success'], result['message'])
+                
+        except Exception as e:
+            print(f"Error en start_chamber_execution: {e}")
+            self.operationResult.emit(False, "Error interno del sistema")
+    
+    @pyqtSlot(int)
+    def stop_chamber_execution(self, chamber_id: int):
+        """Detiene la ejecución de una cámara concreta"""
+        try:
+            result = self.execution_service.stop_program_execution(manual_stop=True, chamber_id=chamber_id)
+            
+            if result['success']:
+                self.executionStateChanged.emit()
+            self.operationResult.emit(result['success'], result['message'])
+                
+        except Exception as e:
+            print(f"Error en stop_chamber_execution: {e}")
+            self.operationResult.emit(False, "Error interno del sistema")
+    
+    @pyqtSlot(result='QVariant')
+    def get_chambers_info(self):
+        """Obtiene el estado de todas las cámaras - MÉTODO SLOT PARA QML"""
+        try:
+            return self.execution_service.execution_manager.get_all_execution_info()
+        except Exception as e:
+            print(f"Error obteniendo información de cámaras: {e}")
+            return []
+    
+    @pyqtSlot(bool, result='QVariant')
+    def get_queue(self, include_finished: bool):
+        """Entradas de la cola de ejecución - MÉTODO SLOT PARA QML"""
+        try:
+            return self.execution_service.execution_queue.get_entries(include_finished)
+        except Exception as e:
+            print(f"Error obteniendo la cola de ejecución: {e}")
+            return []
+    
+    @pyqtSlot(int, int, str, int)
+    def enqueue_program(self, program_id: int, chamber_id: int, start_after: str, depends_on: int):
+        """Añade un programa a la cola (start_after ISO o vacío, depends_on 0 = ninguna)"""
+        try:
+            start_time = datetime.fromisoformat(start_after) if start_after else None
+            result = self.execution_service.execution_queue.enqueue(
+                program_id, chamber_id, start_time, depends_on if depends_on > 0 else None
+            )
+            self.operationResult.emit(result['success'], result['message'])
+            
+        except ValueError:
+            self.operationResult.emit(False, "Hora de inicio no válida")
+        except Exception as e:
+            print(f"Error en enqueue_program: {e}")
+            self.operationResult.emit(False, "Error interno del sistema")
+    
+    @pyqtSlot(int)
+    def remove_queue_entry(self, entry_id: int):
+        """Quita una entrada pendiente de la cola"""
+        result = self.execution_service.execution_queue.remove(entry_id)
+        self.operationResult.emit(result['success'], result['message'])
+    
+    @pyqtSlot(int, int)
+    def move_queue_entry(self, entry_id: int, new_index: int):
+        """Cambia la posición de una entrada de la cola"""
+        result = self.execution_service.execution_queue.move(entry_id, new_index)
+        self.operationResult.emit(result['success'], result['message'])
+    
+    @pyqtSlot()
+    def pause_queue(self):
+        """Pausa el arranque automático de la cola"""
+        self.execution_service.execution_queue.pause()
+    
+    @pyqtSlot()
+    def resume_queue(self):
+        """Reanuda el arranque automático de la cola"""
+        self.execution_service.execution_queue.resume()
+    
+    @pyqtSlot(result=bool)
+    def is_queue_paused(self):
+        """Indica si la cola está pausada - MÉTODO SLOT PARA QML"""
+        return self.execution_service.execution_queue.paused
+    
+    @pyqtSlot(int, result='QVariant')
+    def get_chamber_telemetry(self, chamber_id: int):
+        """Instantánea numérica actual de una cámara - MÉTODO SLOT PARA QML"""
+        try:
+            return self.execution_service.execution_manager.get_telemetry(chamber_id)
+        except Exception as e:
+            print(f"Error obteniendo telemetría: {e}")
+            return None
+    
+    def get_sample_history(self, chamber_id: int):
+        """Historial de muestras de una cámara para las gráficas nativas (TrendChart)"""
+        return self.execution_service.execution_manager.get_sample_history(chamber_id)
+    
+    @pyqtSlot()
+    def acknowledge_alarms(self):
+        """Reconoce los avisos activos (apaga la luz si no hay alarma roja)"""
+        try:
+            self.execution_service.execution_manager.acknowledge_alarms()
+        except Exception as e:
+            print(f"Error reconociendo alarmas: {e}")
+    
+    @pyqtSlot(result='QVariant')
+    def get_output_metrics(self):
+        """Estado, coalescencia y latencia de luz y sirena - MÉTODO SLOT PARA QML"""
+        try:
+            return self.execution_service.execution_manager.get_output_metrics()
+        except Exception as e:
+            print(f"Error obteniendo métricas de salidas: {e}")
+            return None
+    
+    @pyqtSlot(result='QVariant')
+    def get_pipeline_metrics(self):
+        """Métricas por etapa del canal de telemetría - MÉTODO SLOT PARA QML"""
+        try:
+            return self.execution_service.execution_manager.get_pipeline_metrics()
+        except Exception as e:
+            print(f"Error obteniendo métricas del canal: {e}")
+            return []
+    
+    @pyqtSlot(int, int)
+    def request_program_envelope(self, program_id: int, step: int):
+        """Pide la curva de referencia de un programa (en un hilo de trabajo; llega por programEnvelopeReady)"""
+        self.commands.submit(self.execution_service.execution_manager.get_program_envelope, program_id, step,
+                             key=f'envelope.{program_id}',
+                             on_done=lambda envelope: self.programEnvelopeReady.emit(program_id, envelope))
+    
+    @pyqtSlot(int, result='QVariant')
+    def get_anomaly_scores(self, chamber_id: int):
+        """Puntuaciones de anomalía en curso de una cámara - MÉTODO SLOT PARA QML"""
+        try:
+            return self.execution_service.execution_manager.get_anomaly_scores(chamber_id)
+        except Exception as e:
+            print(f"Error obteniendo puntuaciones de anomalía: {e}")
+            return None
+    
+    @pyqtSlot(int)
+    def request_execution_anomaly_scores(self, execution_id: int):
+        """Pide las puntuaciones de anomalía registradas de una ejecución (llegan por executionAnomalyScoresReady)"""
+        self.commands.submit(self.execution_service.get_execution_anomaly_scores, execution_id,
+                             key=f'anomaly_scores.{execution_id}',
+                             on_done=lambda scores: self.executionAnomalyScoresReady.emit(execution_id, scores or []))
+    
+    def _fetch_history_page(self, before_id, limit: int) -> list:
+        """Página del historial para el modelo (se ejecuta en un hilo de trabajo)"""
+        return self.execution_service.get_execution_history_page(before_id, limit, self._history_program_id)
+    
+    def _on_history_execution_changed(self, execution_id: int, **_):
+        """Consulta en segundo plano la ejecución afectada por un evento"""
+        if not self._history_loaded:
+            return
+        self.commands.submit(self.execution_service.get_history_entry, execution_id,
+                             key=f'history.{execution_id}',
+                             on_done=lambda entry: self._apply_history_change(execution_id, entry))
+    
+    def _apply_history_change(self, execution_id: int, entry):
+        """Inserta o actualiza solo la fila de la ejecución afectada"""
+        if not entry:
+            self._history_model.remove_item(execution_id)
+        elif self._history_program_id is None or entry['program_id'] == self._history_program_id:
+            self._history_model.insert_item(entry)
+    
+    @pyqtSlot()
+    def refresh_history(self):
+        """Recarga el historial desde la primera página"""
+        try:
+            self._history_model.reload()
+            self._history_loaded = True
+        except Exception as e:
+            print(f"Error recargando historial: {e}")
+    
+    @pyqtSlot(int)
+    def filter_history(self, program_id: int):
+        """Filtra el historial por programa (0 = todos)"""
+        self._history_program_id = program_id if program_id > 0 else None
+        self.refresh_history()
+    
+    def get_history_model(self) -> ExecutionHistoryModel:
+        """Modelo paginado del historial para el ListView de QML"""
+        if not self._history_loaded:
+            self.refresh_history()
+        return self._history_model
+    
+    @pyqtSlot(int, int, int, int, str)
+    def request_execution_series(self, execution_id: int, start: int, end: int, width: int, method: str):
+        """Pide la serie de presión de una ejecución reducida a 'width' puntos (en un hilo de trabajo)
+        
+        Cada petición sustituye a la anterior pendiente, así que arrastrar o hacer zoom
+        solo calcula el último intervalo. end <= 0 = hasta el final; method 'lttb' o 'minmax'.
+        """
+        self.commands.submit(self.execution_service.get_execution_series, execution_id, start, end, width,
+                             method or None, key='series',
+                             on_done=lambda result: self._on_series_ready(execution_id, result))
+    
+    def _on_series_ready(self, execution_id: int, result: dict):
+        """Entrega a QML la serie reducida"""
+        if result['success']:
+            self.executionSeriesReady.emit(execution_id, result)
+        else:
+            self.operationResult.emit(False, result['message'])
+    
+    @pyqtSlot(int)
+    def simulate_program(self, program_id: int):
+        """Simula un programa más rápido que el tiempo real (en un hilo de trabajo)"""
+        try:
+            self.commands.submit(self.execution_service.simulate_program, program_id,
+                                 key=f'simulate.{program_id}', on_done=self._on_simulation_done,
+                                 on_error=lambda _error: self.operationResult.emit(False, "Error interno del sistema"))
+                
+        except Exception as e:
+            print(f"Error en simulate_program: {e}")
+            self.operationResult.emit(False, "Error interno del sistema")
+    
+    def _on_simulation_done(self, result: dict):
+        """Entrega a QML el resumen de la simulación"""
+        if result['success']:
+            self.simulationFinished.emit(result['result'])
+        self.operationResult.emit(result['success'], result['message'])
+    
+    @pyqtSlot(int, float)
+    def start_replay(self, execution_id: int, speed: float):
+        """Repite una ejecución grabada a la velocidad indicada (1x a 1000x)"""
+        try:
+            # Las consultas van al hilo de trabajo; la repetición arranca en el hilo de la interfaz
+            self.commands.submit(self.replay_service.fetch, execution_id, key='replay',
+                                 on_done=lambda fetched: self._on_replay_fetched(fetched, speed),
+                                 on_error=lambda _error: self.operationResult.emit(False, "Error interno del sistema"))
+                
+        except Exception as e:
+            print(f"Error en start_replay: {e}")
+            self.operationResult.emit(False, "Error interno del sistema")
+    
+    def _on_replay_fetched(self, fetched: dict, speed: float):
+        """Arranca la repetición con la ejecución ya consultada"""
+        result = self.replay_service.open(fetched)
+        if result['success']:
+            self.replay_service.play(speed)
+        self.operationResult.emit(result['success'], result['message'])
+    
+    @pyqtSlot()
+    def pause_replay(self):
+        """Pausa la repetición en curso"""
+        self.replay_service.pause()
+    
+    @pyqtSlot()
+    def resume_replay(self):
+        """Reanuda la repetición pausada"""
+        self.replay_service.play()
+    
+    @pyqtSlot(float)
+    def set_replay_speed(self, speed: float):
+        """Cambia la velocidad de la repetición"""
+        self.replay_service.set_speed(speed)
+    
+    @pyqtSlot(int)
+    def seek_replay(self, seconds: int):
+        """Salta a un segundo concreto de la repetición"""
+        self.replay_service.seek(seconds)
+    
+    @pyqtSlot()
+    def stop_replay(self):
+        """Detiene la repetición"""
+        self.replay_service.stop()
+    
     @pyqtSlot()
     def clean_phantom_executions(self):
-        """Limpia ejecuciones fantasma manualmente"""
+        """Limpia ejecuciones fantasma manualmente (en un hilo de trabajo)"""
+        try:
+            self.commands.submit(self.execution_service.clean_phantom_executions,
+                                 on_done=self._on_cleanup_done,
+                                 on_error=lambda _error: self.operationResult.emit(False, "Error interno del sistema"))
+                
+        except Exception as e:
+            print(f"Error en clean_phantom_executions: {e}")
+            self.operationResult.emit(False, "Error interno del sistema")
+    
+    def _on_cleanup_done(self, cleaned_count: int):
+        """Notifica a QML el resultado de la limpieza"""
         try:
-            cleaned_count = self.execution_service.clean_phantom_executions()
-            
             self.cleanupCompleted.emit(cleaned_count)
             
             if cleaned_count > 0:
@@ -80,7 +438,7 @@ class ExecutionController(QObject):
                 self.operationResult.emit(True, "No se encontraron ejecuciones fantasma para limpiar")
                 
         except Exception as e:
-            print(f"Error en clean_phantom_executions: {e}")
+            print(f"Error en _on_cleanup_done: {e}")
             self.operationResult.emit(False, "Error interno del sistema")
     
     @pyqtSlot()
@@ -107,9 +465,7 @@ class ExecutionController(QObject):
                 print("execution_service no disponible")
                 return None
             
-            info = self.execution_service.get_current_execution_info()
-            print(f"Información de ejecución obtenida: {info}")
-            return info
+            return self.execution_service.get_current_execution_info()
             
         except Exception as e:
             print(f"Error obteniendo información de ejecución: {e}")
@@ -125,26 +481,35 @@ class ExecutionController(QObject):
         # Esta señal se reenvía al MainController para actualizar el gauge
         pass
     
+    def _sync_execution_state(self, *_):
+        """Relee la información completa de la cámara por defecto (inicio, fin, corrección)"""
+        try:
+            self._current_execution.sync(self.execution_service.get_current_execution_info())
+        except Exception as e:
+            print(f"Error sincronizando estado de ejecución: {e}")
+    
+    def get_current_execution(self) -> ExecutionState:
+        return self._current_execution
+    
     def get_is_running(self) -> bool:
         """Verifica si hay una ejecución en curso"""
-        info = self.execution_service.get_current_execution_info()
-        return info['is_running']
+        return self._current_execution.running
     
     def get_current_program_name(self) -> str:
         """Obtiene el nombre del programa en ejecución"""
-        info = self.execution_service.get_current_execution_info()
-        return info.get('program_name', '')
+        return self._current_execution.programName
     
     def get_current_pressure(self) -> float:
         """Obtiene la presión actual"""
-        info = self.execution_service.get_current_execution_info()
-        return info.get('current_pressure', 0.0)
+        return self._current_execution.pressure
     
     def get_execution_service(self):
         """Obtiene el servicio de ejecución para integración con MainController"""
         return self.execution_service
     
     # Propiedades para QML
-    isRunning = pyqtProperty(bool, get_is_running, notify=executionStateChanged)
-    currentProgramName = pyqtProperty(str, get_current_program_name, notify=executionStateChanged)
-    currentPressure = pyqtProperty(float, get_current_pressure, notify=executionStateChanged)
\ No newline at end of file
+    isRunning = pyqtProperty(bool, get_is_running, notify=isRunningChanged)
+    currentProgramName = pyqtProperty(str, get_current_program_name, notify=currentProgramNameChanged)
+    currentPressure = pyqtProperty(float, get_current_pressure, notify=currentPressureChanged)
+    currentExecution = pyqtProperty(QObject, get_current_execution, constant=True)
+    historyModel = pyqtProperty(QObject, get_history_model, constant=True)
\ No newline at end of file
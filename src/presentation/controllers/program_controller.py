@@ -6,6 +6,12 @@ Gestiona la comunicación entre la UI y los servicios de programas
 from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot, pyqtProperty
 from business.services.program_service import ProgramService
 from business.services.auth_service import AuthService
+from business.services.event_bus import (
+    EventBus, PROGRAM_CREATED, PROGRAM_UPDATED, PROGRAM_DELETED, PROGRAM_SEGMENTS_UPDATED
+)
+from presentation.models.program_list_model import ProgramListModel
+from presentation.command_dispatcher import CommandDispatcher
+from utils.config_loader import ConfigLoader
 
 class ProgramController(QObject):
     """Controlador de gestión de programas para la interfaz"""
@@ -19,11 +25,21 @@ class ProgramController(QObject):
         super().__init__(parent)
         self.auth_service = auth_service
         self.program_service = ProgramService(auth_service)
-        self._programs = []
+        self.commands = CommandDispatcher(self)  # Servicios fuera del hilo de la interfaz
+        page_size = ConfigLoader().load_config().get('screen', {}).get('list_page_size', 30)
+        self._program_model = ProgramListModel(self._fetch_programs_page, page_size, self)
+        self._program_model.modelReset.connect(self.programsChanged.emit)
         self._current_program = None
         self._search_term = ""
         self._initialized = False  # Flag para controlar inicialización
         
+        # Cambios fila a fila desde la capa de servicios
+        self.event_bus = EventBus()
+        self.event_bus.subscribe(PROGRAM_CREATED, self._on_program_changed)
+        self.event_bus.subscribe(PROGRAM_UPDATED, self._on_program_changed)
+        self.event_bus.subscribe(PROGRAM_SEGMENTS_UPDATED, self._on_program_changed)
+        self.event_bus.subscribe(PROGRAM_DELETED, self._on_program_deleted)
+        
         print("ProgramController inicializado")
     
     def ensure_initialized(self):
@@ -47,13 +63,8 @@ class ProgramController(QObject):
                 'program_duration': duration
             }
             
-            result = self.program_service.create_program(program_data)
-            
-            if result['success']:
-                self.refresh_programs()
-                self.operationResult.emit(True, result['message'])
-            else:
-                self.operationResult.emit(False, result['message'])
+            self.commands.submit(self.program_service.create_program, program_data,
+                                 on_done=self._emit_operation_result, on_error=self._on_command_error)
                 
         except Exception as e:
             print(f"Error en create_program: {e}")
@@ -73,29 +84,34 @@ class ProgramController(QObject):
                 'program_duration': duration
             }
             
-            result = self.program_service.update_program(program_id, program_data)
-            
-            if result['success']:
-                self.refresh_programs()
-                self.operationResult.emit(True, result['message'])
-            else:
-                self.operationResult.emit(False, result['message'])
+            self.commands.submit(self.program_service.update_program, program_id, program_data,
+                                 on_done=self._emit_operation_result, on_error=self._on_command_error)
                 
         except Exception as e:
             print(f"Error en update_program: {e}")
             self.operationResult.emit(False, "Error interno del sistema")
     
+    @pyqtSlot(int, 'QVariant')
+    def update_program_segments(self, program_id: int, segments):
+        """Guarda el perfil multi-segmento de un programa"""
+        try:
+            # Desde QML llega un QJSValue o una lista de diccionarios
+            if hasattr(segments, 'toVariant'):
+                segments = segments.toVariant()
+            
+            self.commands.submit(self.program_service.update_program_segments, program_id, list(segments or []),
+                                 on_done=self._emit_operation_result, on_error=self._on_command_error)
+                
+        except Exception as e:
+            print(f"Error en update_program_segments: {e}")
+            self.operationResult.emit(False, "Error interno del sistema")
+    
     @pyqtSlot(int)
     def delete_program(self, program_id: int):
         """Elimina un programa"""
         try:
-            result = self.program_service.delete_program(program_id)
-            
-            if result['success']:
-                self.refresh_programs()
-                self.operationResult.emit(True, result['message'])
-            else:
-                self.operationResult.emit(False, result['message'])
+            self.commands.submit(self.program_service.delete_program, program_id,
+                                 on_done=self._emit_operation_result, on_error=self._on_command_error)
                 
         except Exception as e:
             print(f"Error en delete_program: {e}")
@@ -105,7 +121,17 @@ class ProgramController(QObject):
     def select_program(self, program_id: int):
         """Selecciona un programa para edición"""
         try:
-            program = self.program_service.get_program_by_id(program_id)
+            # Una selección nueva sustituye a la anterior aún sin responder
+            self.commands.submit(self.program_service.get_program_by_id, program_id,
+                                 key='select', on_done=self._on_program_selected, on_error=self._on_command_error)
+                
+        except Exception as e:
+            print(f"Error en select_program: {e}")
+            self.operationResult.emit(False, "Error interno del sistema")
+    
+    def _on_program_selected(self, program):
+        """Entrega a QML el programa seleccionado"""
+        try:
             if program:
                 self._current_program = program
                 # Convertir a diccionario para QML
@@ -115,28 +141,67 @@ class ProgramController(QObject):
                 self.operationResult.emit(False, "Programa no encontrado")
                 
         except Exception as e:
-            print(f"Error en select_program: {e}")
+            print(f"Error en _on_program_selected: {e}")
             self.operationResult.emit(False, "Error interno del sistema")
     
+    def _emit_operation_result(self, result: dict):
+        """Reenvía a QML el resultado de una operación del servicio"""
+        self.operationResult.emit(result['success'], result['message'])
+    
+    def _on_command_error(self, error: Exception):
+        self.operationResult.emit(False, "Error interno del sistema")
+    
+    def _fetch_programs_page(self, before_id, limit: int) -> list:
+        """Página de programas para el modelo (se ejecuta en un hilo de trabajo)"""
+        programs = self.program_service.get_programs_page(before_id, limit, self._search_term)
+        return [program.to_dict() for program in programs]
+    
+    def _matches_search(self, program: dict) -> bool:
+        """Mismo criterio que la búsqueda del repositorio (LIKE sin distinguir mayúsculas)"""
+        if not self._search_term:
+            return True
+        term = self._search_term.lower()
+        return term in (program.get('name') or '').lower() or term in (program.get('description') or '').lower()
+    
+    def _on_program_changed(self, program_id: int):
+        """Consulta en segundo plano el programa afectado por un evento"""
+        if not self._initialized:
+            return
+        self.commands.submit(self.program_service.get_program_by_id, program_id,
+                             key=f'program.{program_id}',
+                             on_done=lambda program: self._apply_program_change(program_id, program))
+    
+    def _apply_program_change(self, program_id: int, program):
+        """Inserta, actualiza o quita solo la fila del programa afectado"""
+        if not program or not program.is_active:
+            self._program_model.remove_item(program_id)
+            return
+        
+        program_dict = program.to_dict()
+        if self._matches_search(program_dict):
+            # Fuera del tramo cargado llegará con su página
+            self._program_model.insert_item(program_dict)
+        else:
+            self._program_model.remove_item(program_id)
+    
+    def _on_program_deleted(self, program_id: int):
+        """Quita la fila del programa eliminado"""
+        if self._initialized:
+            self.commands.cancel(f'program.{program_id}')
+            self._program_model.remove_item(program_id)
+    
     @pyqtSlot()
     def refresh_programs(self):
-        """Actualiza la lista de programas"""
+        """Recarga la lista desde la primera página (carga inicial y búsquedas)
+        
+        La consulta se hace en un hilo de trabajo; una recarga nueva (cada
+        pulsación de búsqueda) sustituye a la que siga en curso.
+        """
         try:
-            if self._search_term:
-                programs = self.program_service.search_programs(self._search_term)
-                print(f"Programas encontrados con búsqueda '{self._search_term}': {len(programs)}")
-            else:
-                programs = self.program_service.get_all_programs()
-                print(f"Programas cargados: {len(programs)}")
-            
-            # Convertir a lista de diccionarios para QML
-            self._programs = [program.to_dict() for program in programs]
-            self.programsChanged.emit()
+            self._program_model.reload()
             
         except Exception as e:
             print(f"Error en refresh_programs: {e}")
-            self._programs = []
-            self.programsChanged.emit()
     
     @pyqtSlot(str)
     def search_programs(self, search_term: str):
@@ -159,10 +224,15 @@ class ProgramController(QObject):
         self.ensure_initialized()
     
     def get_programs(self) -> list:
-        """Obtiene la lista de programas para QML"""
+        """Obtiene los programas cargados en el modelo (copia para QML)"""
         # Asegurar que los programas estén cargados cuando QML los solicite
         self.ensure_initialized()
-        return self._programs
+        return self._program_model.to_list()
+    
+    def get_program_model(self) -> ProgramListModel:
+        """Modelo de lista para el ListView de QML"""
+        self.ensure_initialized()
+        return self._program_model
     
     def get_can_manage(self) -> bool:
         """Verifica si puede gestionar programas"""
@@ -174,5 +244,6 @@ class ProgramController(QObject):
     
     # Propiedades para QML
     programs = pyqtProperty('QVariantList', get_programs, notify=programsChanged)
+    programModel = pyqtProperty(QObject, get_program_model, constant=True)
     canManage = pyqtProperty(bool, get_can_manage)
     canExecute = pyqtProperty(bool, get_can_execute)
\ No newline at end of file
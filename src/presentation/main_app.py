@@ -6,6 +6,7 @@ Gestiona la ventana principal y la carga de componentes QML
 import sys
 import os
 from pathlib import Path
+from typing import Optional
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtQml import qmlRegisterType, QQmlApplicationEngine
 from PyQt6.QtCore import QUrl, QObject, pyqtSignal, pyqtSlot, QTimer
@@ -14,44 +15,111 @@ from PyQt6.QtGui import QIcon
 # Importaciones absolutas corregidas
 from utils.config_loader import ConfigLoader
 from utils.i18n_manager import I18nManager
-from presentation.controllers.main_controller import MainController
 from presentation.controllers.auth_controller import AuthController
-from presentation.controllers.program_controller import ProgramController
-from presentation.controllers.execution_controller import ExecutionController
+from presentation.command_dispatcher import install_event_bus_dispatch, shutdown_command_pool
+from presentation.charts.trend_chart import TrendChart
+from presentation.startup_report import StartupReport
+from presentation.qml_cache import configure_qml_disk_cache, precompile_qml
+
+def register_qml_types():
+    """Registra los tipos de arranque en el módulo QML PressureControl"""
+    qmlRegisterType(AuthController, "PressureControl", 1, 0, "AuthController")
+    # Elementos gráficos nativos
+    qmlRegisterType(TrendChart, "PressureControl", 1, 0, "TrendChart")
+
+
+def register_service_qml_types():
+    """Registra los controladores que dependen de los servicios de ejecución"""
+    # Importación diferida: arrastra servicios, hardware y QtMultimedia
+    from presentation.controllers.main_controller import MainController
+    from presentation.controllers.program_controller import ProgramController
+    from presentation.controllers.execution_controller import ExecutionController
+    qmlRegisterType(MainController, "PressureControl", 1, 0, "MainController")
+    qmlRegisterType(ProgramController, "PressureControl", 1, 0, "ProgramController")
+    qmlRegisterType(ExecutionController, "PressureControl", 1, 0, "ExecutionController")
+
+
+def precompile_qml_cache(argv) -> int:
+    """Compila todas las vistas QML en la caché de disco (paso de despliegue, sin abrir la interfaz)"""
+    screen_config = ConfigLoader().load_config().get('screen', {}) or {}
+    cache_path = configure_qml_disk_cache(screen_config.get('qml_cache_dir'))
+    if not cache_path:
+        print("Caché QML desactivada (screen.qml_cache_dir vacío)")
+        return 1
+    
+    app = QApplication(argv)  # Los módulos de QtQuick necesitan la aplicación Qt
+    engine = QQmlApplicationEngine()
+    register_qml_types()
+    register_service_qml_types()
+    timings = precompile_qml(engine)
+    for name, elapsed_ms in timings.items():
+        print(f"  {elapsed_ms:8.1f} ms  {name}")
+    print(f"{len(timings)} archivos QML compilados en {cache_path}")
+    return 0
 
 class PressureControlApp:
     """Aplicación principal del sistema de control de presión"""
     
-    def __init__(self, argv):
-        """Inicializa la aplicación PyQt6"""
+    def __init__(self, argv, boot_time: Optional[float] = None, import_timeline=None):
+        """Inicializa la aplicación PyQt6
+        
+        Arranque en dos fases: antes del primer fotograma solo se prepara lo que
+        necesita la pantalla de login; el resto de controladores y servicios se
+        construye justo después (_start_deferred_phase).
+        """
         print("Inicializando aplicación PyQt6...")
-        self.app = QApplication(argv)
-        self.engine = QQmlApplicationEngine()
+        self.startup_report = StartupReport(boot_time)
+        self.import_timeline = import_timeline
         
+        # La caché de compilación QML debe fijarse antes de crear la aplicación Qt
         print("Cargando configuración...")
-        self.config_loader = ConfigLoader()
-        self.i18n_manager = I18nManager()
+        with self.startup_report.measure("Configuración"):
+            self.config_loader = ConfigLoader()
+            config = self.config_loader.load_config()
+            cache_path = configure_qml_disk_cache((config.get('screen', {}) or {}).get('qml_cache_dir'))
+        if cache_path:
+            print(f"Caché QML en: {cache_path}")
+        self.startup_report.set_regression_tracking(config.get('startup', {}) or {},
+                                                    self.config_loader.project_root)
         
-        print("Inicializando controladores...")
-        self.main_controller = MainController()
-        self.auth_controller = AuthController()
-        # Pasar el servicio de autenticación a los demás controladores
-        self.program_controller = ProgramController(self.auth_controller.auth_service)
-        self.execution_controller = ExecutionController(self.auth_controller.auth_service)
+        with self.startup_report.measure("QApplication"):
+            self.app = QApplication(argv)
+            self.engine = QQmlApplicationEngine()
         
-        # Conectar servicios entre controladores
-        self.main_controller.set_execution_service(self.execution_controller.get_execution_service())
+        # Eventos de servicios ejecutados en hilos de trabajo -> hilo de la interfaz
+        install_event_bus_dispatch()
+        
+        with self.startup_report.measure("Idioma"):
+            self.i18n_manager = I18nManager()
         
         # Inicializar base de datos
         print("Inicializando base de datos...")
-        self._initialize_database()
+        with self.startup_report.measure("Base de datos"):
+            self._initialize_database()
+        
+        # Fase 1: solo lo necesario para el login
+        with self.startup_report.measure("Autenticación"):
+            self.auth_controller = AuthController()
+        
+        # Fase 2 (tras el primer fotograma): controladores con servicios de ejecución
+        self.main_controller = None
+        self.program_controller = None
+        self.execution_controller = None
+        self.quality_governor = None
+        self._deferred_started = False
         
         # Configurar verificación de ejecuciones después del login
         self._setup_execution_verification()
         
         self._setup_application()
-        self._register_qml_types()
-        self._load_main_qml()
+        
+        # Terminar los comandos en curso al salir (el servicio de ejecución se conecta en la fase 2)
+        self.app.aboutToQuit.connect(shutdown_command_pool)
+        
+        with self.startup_report.measure("Tipos QML"):
+            self._register_qml_types()
+        with self.startup_report.measure("main.qml"):
+            self._load_main_qml()
         print("Aplicación inicializada correctamente.")
     
     def _initialize_database(self):
@@ -76,6 +144,8 @@ class PressureControlApp:
     def _on_login_success(self, success: bool, message: str):
         """Maneja el resultado del login y verifica ejecuciones si es exitoso"""
         if success:
+            # Un login muy rápido puede adelantarse a la fase diferida
+            self._start_deferred_phase()
             print("Login exitoso, verificando ejecuciones incompletas...")
             # Pequeño delay para asegurar que el login se complete
             QTimer.singleShot(500, self._check_incomplete_executions_after_login)
@@ -84,22 +154,18 @@ class PressureControlApp:
         """Verifica ejecuciones incompletas después del login exitoso"""
         try:
             execution_service = self.execution_controller.get_execution_service()
-            incomplete_info = execution_service.check_for_incomplete_execution()
+            incomplete = execution_service.check_for_incomplete_executions()
             
-            if incomplete_info and incomplete_info.get('should_resume'):
-                execution = incomplete_info['execution']
-                program = incomplete_info['program']
+            # Cada ejecución vuelve a su cámara (como mucho una por cámara)
+            resumed = []
+            for info in incomplete:
+                execution = info['execution']
+                program = info['program']
                 
-                print(f"Ejecución incompleta encontrada después del login: {program.name}")
+                print(f"Ejecución incompleta encontrada después del login: {program.name} (cámara {execution.chamber_id})")
                 
-                # Resumir la ejecución
                 if execution_service.resume_execution(execution, program):
-                    # Notificar a QML que debe mostrar la ejecución
-                    self.engine.rootContext().setContextProperty("shouldShowExecutionAfterLogin", True)
-                    self.engine.rootContext().setContextProperty("resumedProgramAfterLogin", program.to_dict())
-                    
-                    # Emitir señal para que QML maneje la navegación
-                    self.execution_controller.executionResumed.emit(program.to_dict())
+                    resumed.append(info)
                 else:
                     # Si no se puede resumir, marcar como detenida
                     from datetime import datetime
@@ -107,7 +173,20 @@ class PressureControlApp:
                     execution.stopped_manually = True
                     execution.end_time = datetime.now()
                     execution_service.execution_repository.update_execution(execution)
-                    print("No se pudo resumir la ejecución, marcada como detenida")
+                    print(f"No se pudo resumir la ejecución {execution.id}, marcada como detenida")
+            
+            if resumed:
+                # La vista muestra la de la cámara por defecto o, si no, la primera reanudada
+                default_chamber = execution_service.execution_manager.DEFAULT_CHAMBER
+                shown = next((info for info in resumed if info['execution'].chamber_id == default_chamber), resumed[0])
+                program = shown['program']
+                
+                # Notificar a QML que debe mostrar la ejecución
+                self.engine.rootContext().setContextProperty("shouldShowExecutionAfterLogin", True)
+                self.engine.rootContext().setContextProperty("resumedProgramAfterLogin", program.to_dict())
+                
+                # Emitir señal para que QML maneje la navegación
+                self.execution_controller.executionResumed.emit(program.to_dict())
             else:
                 print("No se encontraron ejecuciones incompletas")
                 self.engine.rootContext().setContextProperty("shouldShowExecutionAfterLogin", False)
@@ -117,6 +196,9 @@ class PressureControlApp:
             print(f"Error verificando ejecuciones después del login: {e}")
             self.engine.rootContext().setContextProperty("shouldShowExecutionAfterLogin", False)
             self.engine.rootContext().setContextProperty("resumedProgramAfterLogin", None)
+        
+        # Con las ejecuciones interrumpidas resueltas, la cola puede planificar
+        self.execution_controller.get_execution_service().execution_queue.activate()
     
     def _setup_application(self):
         """Configura propiedades básicas de la aplicación"""
@@ -139,11 +221,7 @@ class PressureControlApp:
     
     def _register_qml_types(self):
         """Registra tipos personalizados para QML"""
-        # Registrar controladores
-        qmlRegisterType(MainController, "PressureControl", 1, 0, "MainController")
-        qmlRegisterType(AuthController, "PressureControl", 1, 0, "AuthController")
-        qmlRegisterType(ProgramController, "PressureControl", 1, 0, "ProgramController")
-        qmlRegisterType(ExecutionController, "PressureControl", 1, 0, "ExecutionController")
+        register_qml_types()
         print("Tipos QML registrados.")
     
     def _load_main_qml(self):
@@ -155,12 +233,14 @@ class PressureControlApp:
         
         print(f"Cargando interfaz QML desde: {qml_file}")
         
-        # Exponer controladores al contexto QML
-        self.engine.rootContext().setContextProperty("mainController", self.main_controller)
+        # Exponer controladores al contexto QML (los de la fase 2 quedan vacíos hasta construirse)
+        self.engine.rootContext().setContextProperty("mainController", None)
         self.engine.rootContext().setContextProperty("authController", self.auth_controller)
-        self.engine.rootContext().setContextProperty("programController", self.program_controller)
-        self.engine.rootContext().setContextProperty("executionController", self.execution_controller)
+        self.engine.rootContext().setContextProperty("programController", None)
+        self.engine.rootContext().setContextProperty("executionController", None)
+        self.engine.rootContext().setContextProperty("qualityGovernor", None)
         self.engine.rootContext().setContextProperty("i18nManager", self.i18n_manager)
+        self.engine.rootContext().setContextProperty("startupReport", self.startup_report)
         
         # Inicializar propiedades de ejecución resumida (se actualizarán después del login)
         self.engine.rootContext().setContextProperty("shouldShowExecutionAfterLogin", False)
@@ -173,6 +253,69 @@ class PressureControlApp:
             raise RuntimeError("Error al cargar la interfaz QML")
         
         print("Interfaz QML cargada correctamente.")
+        
+        # El informe de arranque se imprime con el primer fotograma
+        self.engine.rootObjects()[0].frameSwapped.connect(self._on_first_frame)
+    
+    def _on_first_frame(self):
+        """Cierra el informe de arranque al mostrarse la primera imagen"""
+        if self.startup_report.first_frame_ms is not None:
+            return
+        self.startup_report.mark_first_frame()
+        try:
+            self.engine.rootObjects()[0].frameSwapped.disconnect(self._on_first_frame)
+        except TypeError:
+            pass
+        
+        # El login ya está en pantalla: construir el resto en el siguiente ciclo del bucle
+        QTimer.singleShot(0, self._start_deferred_phase)
+    
+    def _start_deferred_phase(self):
+        """Construye los controladores que no necesita la pantalla de login"""
+        if self._deferred_started:
+            return
+        self._deferred_started = True
+        
+        print("Inicializando controladores...")
+        with self.startup_report.measure("Controladores (diferido)"):
+            register_service_qml_types()
+            from presentation.controllers.main_controller import MainController
+            from presentation.controllers.program_controller import ProgramController
+            from presentation.controllers.execution_controller import ExecutionController
+            
+            self.main_controller = MainController()
+            # Pasar el servicio de autenticación a los demás controladores
+            self.program_controller = ProgramController(self.auth_controller.auth_service)
+            self.execution_controller = ExecutionController(self.auth_controller.auth_service)
+            
+            # Conectar servicios entre controladores
+            self.main_controller.set_execution_service(self.execution_controller.get_execution_service())
+            
+            context = self.engine.rootContext()
+            context.setContextProperty("mainController", self.main_controller)
+            context.setContextProperty("programController", self.program_controller)
+            context.setContextProperty("executionController", self.execution_controller)
+            
+            # Calidad de la interfaz según la carga (el lazo de control tiene prioridad)
+            from presentation.quality_governor import QualityGovernor
+            config = self.config_loader.load_config()
+            execution_service = self.execution_controller.get_execution_service()
+            self.quality_governor = QualityGovernor(
+                (config.get('screen', {}) or {}).get('quality', {}) or {},
+                base_refresh_hz=execution_service.execution_manager.ui_refresh_hz,
+                execution_manager=execution_service.execution_manager
+            )
+            context.setContextProperty("qualityGovernor", self.quality_governor)
+        
+        # Persistir lecturas pendientes al salir
+        self.app.aboutToQuit.connect(self.quality_governor.stop)
+        self.app.aboutToQuit.connect(self.execution_controller.get_execution_service().shutdown)
+        self.quality_governor.start()
+        
+        self.startup_report.mark_ready()
+        if self.import_timeline is not None:
+            self.import_timeline.uninstall()
+            print(self.import_timeline.format_report())
     
     def run(self):
         """Ejecuta la aplicación"""
@@ -0,0 +1,4 @@
+"""
+Modelos de datos Qt para las vistas QML
+Listas con notificaciones de inserción, actualización y eliminación por fila
+"""
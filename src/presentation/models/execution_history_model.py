@@ -0,0 +1,39 @@
+"""
+Modelo del historial de ejecuciones
+Roles de ejecución sobre la lista paginada para el ListView de QML
+"""
+
+from PyQt6.QtCore import Qt
+
+from .paged_list_model import PagedListModel
+
+
+class ExecutionHistoryModel(PagedListModel):
+    """Ejecuciones de la más reciente a la más antigua, cargadas por páginas"""
+
+    IdRole = Qt.ItemDataRole.UserRole + 1
+    ProgramIdRole = Qt.ItemDataRole.UserRole + 2
+    ProgramNameRole = Qt.ItemDataRole.UserRole + 3
+    ChamberIdRole = Qt.ItemDataRole.UserRole + 4
+    StartTimeRole = Qt.ItemDataRole.UserRole + 5
+    EndTimeRole = Qt.ItemDataRole.UserRole + 6
+    StatusRole = Qt.ItemDataRole.UserRole + 7
+    StoppedManuallyRole = Qt.ItemDataRole.UserRole + 8
+    MaxPressureExceededRole = Qt.ItemDataRole.UserRole + 9
+    NotesRole = Qt.ItemDataRole.UserRole + 10
+    ExecutionDataRole = Qt.ItemDataRole.UserRole + 11
+
+    _ROLES = {
+        IdRole: ('executionId', 'id'),
+        ProgramIdRole: ('programId', 'program_id'),
+        ProgramNameRole: ('programName', 'program_name'),
+        ChamberIdRole: ('chamberId', 'chamber_id'),
+        StartTimeRole: ('startTime', 'start_time'),
+        EndTimeRole: ('endTime', 'end_time'),
+        StatusRole: ('status', 'status'),
+        StoppedManuallyRole: ('stoppedManually', 'stopped_manually'),
+        MaxPressureExceededRole: ('maxPressureExceeded', 'max_pressure_exceeded'),
+        NotesRole: ('notes', 'notes'),
+        ExecutionDataRole: ('executionData', None),
+    }
+    _ITEM_ROLE = ExecutionDataRole
@@ -0,0 +1,123 @@
+"""
+Estado de la ejecución en curso
+Propiedades con notificación individual para enlazar desde QML sin consultar al servicio
+"""
+
+from typing import Dict, Any, Optional
+from PyQt6.QtCore import QObject, pyqtSignal, pyqtProperty
+
+
+def _state_property(name: str, type_, notify):
+    """Propiedad de solo lectura sobre el valor guardado en _values"""
+    return pyqtProperty(type_, lambda self: self._values[name], notify=notify)
+
+
+class ExecutionState(QObject):
+    """Instantánea de la ejecución de la cámara por defecto
+
+    El controlador la alimenta con la información completa al iniciar o
+    terminar una ejecución (sync) y con la telemetría ya coalescida al
+    refresco de pantalla (apply_telemetry). Cada campo emite su propia
+    señal y solo cuando su valor cambia, así un cambio de presión no
+    reevalúa los enlaces que dependen del nombre del programa.
+    """
+
+    runningChanged = pyqtSignal()
+    executionIdChanged = pyqtSignal()
+    programNameChanged = pyqtSignal()
+    phaseChanged = pyqtSignal()
+    pressureChanged = pyqtSignal()
+    minPressureChanged = pyqtSignal()
+    maxPressureChanged = pyqtSignal()
+    programDurationChanged = pyqtSignal()
+    elapsedSecondsChanged = pyqtSignal()
+    remainingSecondsChanged = pyqtSignal()
+    progressChanged = pyqtSignal()
+    alarmActiveChanged = pyqtSignal()
+
+    # Valores de cada campo cuando no hay ejecución (cada campo notifica con <campo>Changed)
+    _DEFAULTS = {
+        'running': False,
+        'executionId': 0,
+        'programName': '',
+        'phase': 'setup',
+        'pressure': 0.0,
+        'minPressure': 0.0,
+        'maxPressure': 0.0,
+        'programDuration': 0,
+        'elapsedSeconds': 0,
+        'remainingSeconds': 0,
+        'progress': 0,
+        'alarmActive': False,
+    }
+
+    # Presión en la resolución que muestra la interfaz (evita notificar ruido)
+    PRESSURE_DECIMALS = 2
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._values: Dict[str, Any] = dict(self._DEFAULTS)
+        self.notifications = 0
+
+    def _set(self, name: str, value: Any):
+        if self._values[name] == value:
+            return
+        self._values[name] = value
+        self.notifications += 1
+        getattr(self, name + 'Changed').emit()
+
+    def _set_pressure(self, pressure: Optional[float]):
+        self._set('pressure', round(float(pressure or 0.0), self.PRESSURE_DECIMALS))
+
+    def sync(self, info: Optional[Dict[str, Any]]):
+        """Actualiza todos los campos desde ExecutionManager.get_execution_info()"""
+        if not info or not info.get('is_running'):
+            for name, value in self._DEFAULTS.items():
+                self._set(name, value)
+            return
+
+        self._set('executionId', int(info.get('execution_id') or 0))
+        self._set('programName', info.get('program_name') or '')
+        self._set('phase', info.get('phase') or 'setup')
+        self._set('minPressure', float(info.get('min_pressure') or 0.0))
+        self._set('maxPressure', float(info.get('max_pressure') or 0.0))
+        self._set('programDuration', int(info.get('program_duration') or 0))
+        self._set('elapsedSeconds', int(info.get('elapsed_seconds') or 0))
+        self._set('alarmActive', bool(info.get('alarm_active')))
+        self._set_pressure(info.get('current_pressure'))
+        # El último: quien reaccione a running ya ve el resto de campos
+        self._set('running', True)
+
+    def apply_telemetry(self, snapshot: Optional[Dict[str, Any]]):
+        """Actualiza los campos dinámicos desde ExecutionManager.get_telemetry()"""
+        if not snapshot:
+            return
+        if not snapshot.get('is_running'):
+            self._set('running', False)
+            return
+
+        self._set('phase', snapshot.get('phase') or 'setup')
+        self._set_pressure(snapshot.get('pressure'))
+        self._set('elapsedSeconds', int(snapshot.get('elapsed_seconds') or 0))
+        self._set('remainingSeconds', int(snapshot.get('remaining_seconds') or 0))
+        self._set('progress', int(snapshot.get('progress') or 0))
+        self._set('alarmActive', bool(snapshot.get('alarm_active')))
+
+    def set_phase(self, phase: str):
+        self._set('phase', phase)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self._values)
+
+    running = _state_property('running', bool, runningChanged)
+    executionId = _state_property('executionId', int, executionIdChanged)
+    programName = _state_property('programName', str, programNameChanged)
+    phase = _state_property('phase', str, phaseChanged)
+    pressure = _state_property('pressure', float, pressureChanged)
+    minPressure = _state_property('minPressure', float, minPressureChanged)
+    maxPressure = _state_property('maxPressure', float, maxPressureChanged)
+    programDuration = _state_property('programDuration', int, programDurationChanged)
+    elapsedSeconds = _state_property('elapsedSeconds', int, elapsedSecondsChanged)
+    remainingSeconds = _state_property('remainingSeconds', int, remainingSecondsChanged)
+    progress = _state_property('progress', int, progressChanged)
+    alarmActive = _state_property('alarmActive', bool, alarmActiveChanged)
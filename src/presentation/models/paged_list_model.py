@@ -0,0 +1,229 @@
+"""
+Modelo de lista paginado
+Carga filas bajo demanda (canFetchMore/fetchMore) y precarga la página siguiente en un hilo de trabajo
+"""
+
+from typing import Optional, List, Dict, Any, Callable, Tuple
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QByteArray, pyqtSignal, pyqtProperty
+
+from presentation.command_dispatcher import CommandDispatcher
+
+# (before_id, límite) -> filas como diccionarios, de id mayor a menor
+PageFetcher = Callable[[Optional[int], int], List[Dict[str, Any]]]
+
+
+class PagedListModel(QAbstractListModel):
+    """Lista de diccionarios ordenada por 'id' descendente y cargada por páginas
+
+    Todas las consultas se hacen en los hilos de trabajo del CommandDispatcher:
+    reload() pide la primera página y la aplica al llegar; tras cada página
+    se precarga la siguiente, y fetchMore() la añade al instante si ya llegó
+    o en cuanto llegue. Solo hay una consulta de página en curso por modelo;
+    recargar la sustituye. Las subclases definen _ROLES (rol -> (nombre en
+    QML, clave del diccionario)) e _ITEM_ROLE (rol con el diccionario completo).
+    """
+
+    _ROLES: Dict[int, Tuple[str, Optional[str]]] = {}
+    _ITEM_ROLE = Qt.ItemDataRole.UserRole + 100
+    _PAGE_KEY = 'page'
+
+    countChanged = pyqtSignal()
+    loadingChanged = pyqtSignal()
+
+    def __init__(self, fetch_page: PageFetcher, page_size: int = 30, parent=None):
+        super().__init__(parent)
+        self._fetch_page = fetch_page
+        self.page_size = max(1, page_size)
+        self.commands = CommandDispatcher(self)
+        self._items: List[Dict[str, Any]] = []
+        self._cursor: Optional[int] = None  # id de la última fila cargada
+        self._exhausted = True
+        self._loading = False  # Primera página en curso
+        self._ready_page: Optional[List[Dict[str, Any]]] = None  # Página siguiente ya precargada
+        self._append_when_ready = False  # La vista pidió más filas antes de que llegaran
+
+    # --- QAbstractListModel ---
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._items)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._items):
+            return None
+
+        item = self._items[index.row()]
+        if role == self._ITEM_ROLE:
+            return item
+        entry = self._ROLES.get(role)
+        return item.get(entry[1]) if entry and entry[1] else None
+
+    def roleNames(self) -> Dict[int, QByteArray]:
+        return {role: QByteArray(name.encode()) for role, (name, _) in self._ROLES.items()}
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and not self._exhausted and not self._append_when_ready
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._exhausted:
+            return
+        if self._ready_page is not None:
+            page, self._ready_page = self._ready_page, None
+            self._append_page(page)
+            return
+
+        # Sin página precargada: se añade en cuanto llegue
+        self._append_when_ready = True
+        if not self.commands.is_pending(self._PAGE_KEY):
+            self._request_next_page()
+
+    # --- Paginación ---
+
+    def reload(self):
+        """Descarta la consulta en curso y pide la primera página"""
+        self._ready_page = None
+        self._append_when_ready = False
+        self._set_loading(True)
+        self.commands.submit(self._fetch_page, None, self.page_size,
+                             key=self._PAGE_KEY, on_done=self._apply_first_page,
+                             on_error=lambda _error: self._set_loading(False))
+
+    def _apply_first_page(self, page: List[Dict[str, Any]]):
+        previous = len(self._items)
+        self.beginResetModel()
+        self._items = list(page)
+        self._cursor = page[-1].get('id') if page else None
+        self.endResetModel()
+        if previous != len(self._items):
+            self.countChanged.emit()
+
+        self._exhausted = len(page) < self.page_size
+        self._set_loading(False)
+        if not self._exhausted:
+            self._request_next_page()
+
+    def _request_next_page(self):
+        cursor = self._cursor
+        self.commands.submit(self._fetch_page, cursor, self.page_size,
+                             key=self._PAGE_KEY, on_done=lambda page: self._on_next_page(cursor, page))
+
+    def _on_next_page(self, cursor: Optional[int], page: List[Dict[str, Any]]):
+        if cursor != self._cursor:
+            return  # Las filas cambiaron mientras tanto
+        if self._append_when_ready:
+            self._append_when_ready = False
+            self._append_page(page)
+        else:
+            self._ready_page = page
+
+    def _append_page(self, page: List[Dict[str, Any]]):
+        if page:
+            first = len(self._items)
+            self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+            self._items.extend(page)
+            self.endInsertRows()
+            self._cursor = page[-1].get('id')
+            self.countChanged.emit()
+
+        self._exhausted = len(page) < self.page_size
+        if not self._exhausted:
+            self._request_next_page()
+
+    def _invalidate_prefetch(self):
+        """Una fila cambió: la página precargada puede traer una foto anterior"""
+        if self._ready_page is None and not self.commands.is_pending(self._PAGE_KEY):
+            return
+        self._ready_page = None
+        if not self._loading and not self._exhausted:
+            self._request_next_page()
+
+    def _set_loading(self, loading: bool):
+        if self._loading != loading:
+            self._loading = loading
+            self.loadingChanged.emit()
+
+    def get_loading(self) -> bool:
+        return self._loading
+
+    loading = pyqtProperty(bool, get_loading, notify=loadingChanged)
+
+    # --- Cambios fila a fila ---
+
+    def get_count(self) -> int:
+        return len(self._items)
+
+    count = pyqtProperty(int, get_count, notify=countChanged)
+
+    def row_of(self, item_id: int) -> int:
+        """Fila del elemento o -1 si no está cargado"""
+        for row, item in enumerate(self._items):
+            if item.get('id') == item_id:
+                return row
+        return -1
+
+    def get_item(self, item_id: int) -> Optional[Dict[str, Any]]:
+        row = self.row_of(item_id)
+        return self._items[row] if row >= 0 else None
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        return list(self._items)
+
+    def covers(self, item_id: int) -> bool:
+        """True si el id cae dentro del tramo ya cargado (o no quedan páginas)"""
+        return self._exhausted or self._cursor is None or item_id > self._cursor
+
+    def insert_item(self, item: Dict[str, Any]) -> bool:
+        """Inserta en su posición por id; fuera del tramo cargado llegará con su página"""
+        item_id = item.get('id')
+        if self.row_of(item_id) >= 0:
+            return self.update_item(item)
+        if not self.covers(item_id):
+            self._invalidate_prefetch()
+            return False
+
+        row = 0
+        while row < len(self._items) and self._items[row].get('id') > item_id:
+            row += 1
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._items.insert(row, item)
+        self.endInsertRows()
+        self.countChanged.emit()
+        return True
+
+    def update_item(self, item: Dict[str, Any]) -> bool:
+        """Sustituye la fila del elemento notificando solo los roles que cambian"""
+        row = self.row_of(item.get('id'))
+        if row < 0:
+            self._invalidate_prefetch()
+            return False
+
+        previous = self._items[row]
+        self._items[row] = item
+        if previous == item:
+            return True
+        roles = [role for role, (_, key) in self._ROLES.items()
+                 if key is not None and previous.get(key) != item.get(key)]
+        roles.extend(self._changed_extra_roles(previous, item))
+        roles.append(self._ITEM_ROLE)
+
+        index = self.index(row, 0)
+        self.dataChanged.emit(index, index, roles)
+        return True
+
+    def _changed_extra_roles(self, previous: Dict[str, Any], item: Dict[str, Any]) -> List[int]:
+        """Roles calculados por la subclase afectados por el cambio"""
+        return []
+
+    def remove_item(self, item_id: int) -> bool:
+        """Elimina la fila del elemento"""
+        row = self.row_of(item_id)
+        if row < 0:
+            self._invalidate_prefetch()
+            return False
+
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._items[row]
+        self.endRemoveRows()
+        self.countChanged.emit()
+        return True
@@ -0,0 +1,56 @@
+"""
+Modelo de lista de programas
+Roles de programa sobre la lista paginada para el ListView de QML
+"""
+
+from typing import List, Dict, Any
+from PyQt6.QtCore import Qt, QModelIndex
+
+from .paged_list_model import PagedListModel
+
+
+class ProgramListModel(PagedListModel):
+    """Programas visibles en la vista de gestión (más recientes primero)
+
+    Las altas, ediciones y bajas se aplican fila a fila: el ListView solo
+    crea, actualiza o destruye el delegado afectado. reload() queda para la
+    carga inicial y las búsquedas.
+    """
+
+    IdRole = Qt.ItemDataRole.UserRole + 1
+    NameRole = Qt.ItemDataRole.UserRole + 2
+    DescriptionRole = Qt.ItemDataRole.UserRole + 3
+    MinPressureRole = Qt.ItemDataRole.UserRole + 4
+    MaxPressureRole = Qt.ItemDataRole.UserRole + 5
+    TimeToMinPressureRole = Qt.ItemDataRole.UserRole + 6
+    ProgramDurationRole = Qt.ItemDataRole.UserRole + 7
+    SegmentCountRole = Qt.ItemDataRole.UserRole + 8
+    ProgramDataRole = Qt.ItemDataRole.UserRole + 9
+
+    _ROLES = {
+        IdRole: ('programId', 'id'),
+        NameRole: ('name', 'name'),
+        DescriptionRole: ('description', 'description'),
+        MinPressureRole: ('minPressure', 'min_pressure'),
+        MaxPressureRole: ('maxPressure', 'max_pressure'),
+        TimeToMinPressureRole: ('timeToMinPressure', 'time_to_min_pressure'),
+        ProgramDurationRole: ('programDuration', 'program_duration'),
+        SegmentCountRole: ('segmentCount', None),
+        ProgramDataRole: ('programData', None),
+    }
+    _ITEM_ROLE = ProgramDataRole
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if role == self.SegmentCountRole and index.isValid() and 0 <= index.row() < len(self._items):
+            return len(self._items[index.row()].get('segments') or [])
+        if role == Qt.ItemDataRole.DisplayRole:
+            role = self.NameRole
+        return super().data(index, role)
+
+    def _changed_extra_roles(self, previous: Dict[str, Any], item: Dict[str, Any]) -> List[int]:
+        roles = []
+        if previous.get('segments') != item.get('segments'):
+            roles.append(self.SegmentCountRole)
+        if previous.get('name') != item.get('name'):
+            roles.append(Qt.ItemDataRole.DisplayRole)
+        return roles
@@ -0,0 +1,116 @@
+import QtQuick 2.15
+import QtQuick.Controls 2.15
+import QtQuick.Layouts 1.15
+
+// Estado del regulador de calidad: nivel actual, motivo y medidas de carga
+Dialog {
+    id: diagnosticsPanel
+    
+    // Se actualiza con cada ventana de evaluación del regulador
+    readonly property var metrics: qualityGovernor ? qualityGovernor.metrics : null
+    readonly property int level: metrics ? metrics.level : 0
+    readonly property color levelColor: level === 0 ? "#27AE60" : (level === 1 ? "#F39C12" : "#E74C3C")
+    
+    anchors.centerIn: parent
+    width: Math.min(460, parent.width * 0.9)
+    
+    title: "Diagnóstico de la interfaz"
+    modal: true
+    closePolicy: Popup.CloseOnEscape | Popup.CloseOnPressOutside
+    
+    background: Rectangle {
+        color: "#ECF0F1"
+        radius: 10
+        border.color: diagnosticsPanel.levelColor
+        border.width: 2
+    }
+    
+    ColumnLayout {
+        anchors.fill: parent
+        spacing: 12
+        
+        // Nivel de calidad y motivo del último cambio
+        Rectangle {
+            Layout.fillWidth: true
+            Layout.preferredHeight: 60
+            color: diagnosticsPanel.levelColor
+            radius: 8
+            
+            Column {
+                anchors.centerIn: parent
+                spacing: 2
+                
+                Text {
+                    anchors.horizontalCenter: parent.horizontalCenter
+                    text: metrics ? "Calidad " + metrics.level_name : "Regulador no disponible"
+                    color: "white"
+                    font.pixelSize: 18
+                    font.bold: true
+                }
+                
+                Text {
+                    anchors.horizontalCenter: parent.horizontalCenter
+                    visible: text !== ""
+                    text: metrics && metrics.reason ? metrics.reason : ""
+                    color: "white"
+                    font.pixelSize: 12
+                }
+            }
+        }
+        
+        GridLayout {
+            Layout.fillWidth: true
+            columns: 2
+            columnSpacing: 20
+            rowSpacing: 6
+            visible: metrics !== null
+            
+            Repeater {
+                // Pares etiqueta, valor (una fila de la rejilla cada dos elementos)
+                model: metrics ? [
+                    "Refresco de telemetría", metrics.ui_refresh_hz.toFixed(0) + " Hz",
+                    "Animaciones", metrics.animations ? "Activas" : "Desactivadas",
+                    "Resolución de gráficas", metrics.chart_resolution + " px por columna",
+                    "Retraso del bucle de eventos", metrics.loop_latency_ms.toFixed(1) + " ms (máx. " + metrics.loop_latency_max_ms.toFixed(0) + ")",
+                    "CPU del proceso", metrics.cpu_percent.toFixed(0) + " % de un núcleo (" + metrics.cpu_count + " núcleos)",
+                    "Retraso del lazo de control", metrics.control_lateness_ms.toFixed(1) + " ms",
+                    "Cambios de nivel", String(metrics.level_changes),
+                    "Tiempo con calidad reducida", Math.round(metrics.degraded_seconds) + " s"
+                ] : []
+                
+                delegate: Text {
+                    Layout.fillWidth: index % 2 === 1
+                    text: modelData
+                    font.pixelSize: 13
+                    font.bold: index % 2 === 0
+                    color: "#2C3E50"
+                }
+            }
+        }
+        
+        Button {
+            text: "Cerrar"
+            Layout.alignment: Qt.AlignHCenter
+            Layout.preferredWidth: 100
+            Layout.preferredHeight: 35
+            
+            background: Rectangle {
+                color: parent.pressed ? "#2980B9" : "#3498DB"
+                radius: 6
+                border.color: "#2471A3"
+                border.width: 1
+            }
+            
+            contentItem: Text {
+                text: parent.text
+                color: "white"
+                font.pixelSize: 14
+                font.bold: true
+                horizontalAlignment: Text.AlignHCenter
+                verticalAlignment: Text.AlignVCenter
+            }
+            
+            onClicked: diagnosticsPanel.close()
+        }
+    }
+}
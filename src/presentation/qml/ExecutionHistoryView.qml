@@ -0,0 +1,404 @@
+import QtQuick 2.15
+import QtQuick.Controls 2.15
+import QtQuick.Layouts 1.15
+
+Rectangle {
+    id: executionHistoryView
+    
+    // Señales
+    signal backToMain()
+    
+    // Repetición de una ejecución grabada (alimentada por las señales replay* del controlador)
+    property int replayExecutionId: 0
+    property int replayTotal: 0
+    property int replayPosition: 0
+    property real replayPressure: 0.0
+    property string replayPhase: ""
+    property string replayAlarm: ""
+    property bool replayPlaying: false
+    property real replaySpeed: 10
+    
+    function formatSeconds(seconds) {
+        var minutes = Math.floor(seconds / 60)
+        var rest = seconds % 60
+        return minutes + ":" + (rest < 10 ? "0" : "") + rest
+    }
+    
+    function stopReplay() {
+        if (executionController) {
+            executionController.stop_replay()
+        }
+        replayExecutionId = 0
+        replayPlaying = false
+    }
+    
+    gradient: Gradient {
+        GradientStop { position: 0.0; color: "#2C3E50" }
+        GradientStop { position: 1.0; color: "#34495E" }
+    }
+    
+    function statusColor(status) {
+        switch (status) {
+        case "completed": return "#27AE60"
+        case "stopped": return "#E67E22"
+        case "error": return "#E74C3C"
+        default: return "#3498DB"
+        }
+    }
+    
+    function statusText(status) {
+        switch (status) {
+        case "completed": return "Completada"
+        case "stopped": return "Detenida"
+        case "error": return "Error"
+        default: return "En curso"
+        }
+    }
+    
+    function formatTime(isoTime) {
+        return isoTime ? isoTime.replace("T", " ").substring(0, 16) : "—"
+    }
+    
+    ColumnLayout {
+        anchors.fill: parent
+        anchors.margins: 20
+        spacing: 15
+        
+        // Header
+        Rectangle {
+            Layout.fillWidth: true
+            Layout.preferredHeight: 70
+            color: "transparent"
+            border.color: "#3498DB"
+            border.width: 2
+            radius: 10
+            
+            RowLayout {
+                anchors.fill: parent
+                anchors.margins: 15
+                
+                Button {
+                    text: "← Volver"
+                    implicitWidth: 120
+                    implicitHeight: 40
+                    
+                    background: Rectangle {
+                        color: parent.pressed ? "#2980B9" : "#3498DB"
+                        radius: 8
+                        border.color: "#2471A3"
+                        border.width: 1
+                    }
+                    
+                    contentItem: Text {
+                        text: parent.text
+                        color: "white"
+                        font.pixelSize: 16
+                        font.bold: true
+                        horizontalAlignment: Text.AlignHCenter
+                        verticalAlignment: Text.AlignVCenter
+                    }
+                    
+                    onClicked: backToMain()
+                }
+                
+                Text {
+                    text: "Historial de Ejecuciones"
+                    font.pixelSize: 24
+                    font.bold: true
+                    color: "#ECF0F1"
+                    Layout.fillWidth: true
+                    horizontalAlignment: Text.AlignHCenter
+                }
+                
+                Button {
+                    text: "↻"
+                    implicitWidth: 50
+                    implicitHeight: 40
+                    
+                    background: Rectangle {
+                        color: parent.pressed ? "#2980B9" : "#3498DB"
+                        radius: 8
+                    }
+                    
+                    contentItem: Text {
+                        text: parent.text
+                        color: "white"
+                        font.pixelSize: 18
+                        font.bold: true
+                        horizontalAlignment: Text.AlignHCenter
+                        verticalAlignment: Text.AlignVCenter
+                    }
+                    
+                    onClicked: {
+                        if (executionController) {
+                            executionController.refresh_history()
+                        }
+                    }
+                }
+            }
+        }
+        
+        // Lista paginada: el modelo carga más filas al acercarse al final
+        Rectangle {
+            Layout.fillWidth: true
+            Layout.fillHeight: true
+            color: "#ECF0F1"
+            radius: 12
+            border.color: "#BDC3C7"
+            border.width: 1
+            
+            ListView {
+                id: historyListView
+                anchors.fill: parent
+                anchors.margins: 10
+                clip: true
+                spacing: 8
+                model: executionController ? executionController.historyModel : null
+                
+                ScrollBar.vertical: ScrollBar {}
+                
+                delegate: Rectangle {
+                    width: historyListView.width
+                    height: 64
+                    radius: 8
+                    color: "#FFFFFF"
+                    border.color: "#D5DBDB"
+                    border.width: 1
+                    
+                    RowLayout {
+                        anchors.fill: parent
+                        anchors.leftMargin: 15
+                        anchors.rightMargin: 15
+                        spacing: 15
+                        
+                        Rectangle {
+                            Layout.preferredWidth: 10
+                            Layout.preferredHeight: 10
+                            radius: 5
+                            color: executionHistoryView.statusColor(model.status)
+                        }
+                        
+                        Column {
+                            Layout.fillWidth: true
+                            spacing: 4
+                            
+                            Text {
+                                text: model.programName !== "" ? model.programName : "Programa #" + model.programId
+                                font.pixelSize: 16
+                                font.bold: true
+                                color: "#2C3E50"
+                                elide: Text.ElideRight
+                                width: parent.width
+                            }
+                            
+                            Text {
+                                text: `#${model.executionId} · Cámara ${model.chamberId} · ` +
+                                      `${executionHistoryView.formatTime(model.startTime)} → ${executionHistoryView.formatTime(model.endTime)}`
+                                font.pixelSize: 12
+                                color: "#7F8C8D"
+                                elide: Text.ElideRight
+                                width: parent.width
+                            }
+                        }
+                        
+                        Text {
+                            text: executionHistoryView.statusText(model.status) + (model.maxPressureExceeded ? " ⚠" : "")
+                            font.pixelSize: 14
+                            font.bold: true
+                            color: executionHistoryView.statusColor(model.status)
+                        }
+                        
+                        Button {
+                            text: "▶"
+                            implicitWidth: 40
+                            implicitHeight: 36
+                            visible: model.status !== "running"
+                            
+                            background: Rectangle {
+                                color: parent.pressed ? "#2980B9" : "#3498DB"
+                                radius: 8
+                            }
+                            
+                            contentItem: Text {
+                                text: parent.text
+                                color: "white"
+                                font.pixelSize: 16
+                                horizontalAlignment: Text.AlignHCenter
+                                verticalAlignment: Text.AlignVCenter
+                            }
+                            
+                            onClicked: {
+                                if (executionController) {
+                                    executionController.start_replay(model.executionId, executionHistoryView.replaySpeed)
+                                }
+                            }
+                        }
+                    }
+                }
+                
+                // Mensaje cuando no hay ejecuciones
+                Text {
+                    anchors.centerIn: parent
+                    text: historyListView.model && historyListView.model.loading ?
+                          "Cargando historial..." : "No hay ejecuciones registradas"
+                    font.pixelSize: 18
+                    color: "#7F8C8D"
+                    visible: historyListView.count === 0
+                }
+            }
+        }
+        
+        // Repetición en curso
+        Rectangle {
+            Layout.fillWidth: true
+            Layout.preferredHeight: 110
+            visible: replayExecutionId !== 0
+            color: "#2C3E50"
+            radius: 12
+            border.color: replayAlarm !== "" ? "#E74C3C" : "#3498DB"
+            border.width: 2
+            
+            ColumnLayout {
+                anchors.fill: parent
+                anchors.margins: 12
+                spacing: 8
+                
+                RowLayout {
+                    Layout.fillWidth: true
+                    spacing: 15
+                    
+                    Text {
+                        text: "Repetición #" + replayExecutionId
+                        font.pixelSize: 16
+                        font.bold: true
+                        color: "#ECF0F1"
+                    }
+                    
+                    Text {
+                        text: replayPressure.toFixed(2) + " bar"
+                        font.pixelSize: 16
+                        font.bold: true
+                        color: "#3498DB"
+                    }
+                    
+                    Text {
+                        text: replayPhase
+                        font.pixelSize: 14
+                        color: "#BDC3C7"
+                    }
+                    
+                    Text {
+                        Layout.fillWidth: true
+                        text: replayAlarm
+                        font.pixelSize: 14
+                        font.bold: true
+                        color: "#E74C3C"
+                        elide: Text.ElideRight
+                    }
+                    
+                    Text {
+                        text: formatSeconds(replayPosition) + " / " + formatSeconds(replayTotal)
+                        font.pixelSize: 14
+                        color: "#ECF0F1"
+                    }
+                }
+                
+                RowLayout {
+                    Layout.fillWidth: true
+                    spacing: 10
+                    
+                    Button {
+                        text: replayPlaying ? "⏸" : "▶"
+                        implicitWidth: 50
+                        implicitHeight: 36
+                        
+                        onClicked: {
+                            if (!executionController) {
+                                return
+                            }
+                            if (replayPlaying) {
+                                executionController.pause_replay()
+                            } else {
+                                executionController.resume_replay()
+                            }
+                            replayPlaying = !replayPlaying
+                        }
+                    }
+                    
+                    Slider {
+                        Layout.fillWidth: true
+                        from: 0
+                        to: Math.max(1, replayTotal)
+                        stepSize: 1
+                        value: replayPosition
+                        
+                        onMoved: {
+                            if (executionController) {
+                                executionController.seek_replay(Math.round(value))
+                            }
+                        }
+                    }
+                    
+                    ComboBox {
+                        implicitWidth: 100
+                        model: [1, 10, 100, 1000]
+                        displayText: currentText + "x"
+                        currentIndex: model.indexOf(replaySpeed)
+                        
+                        onActivated: {
+                            replaySpeed = model[currentIndex]
+                            if (executionController) {
+                                executionController.set_replay_speed(replaySpeed)
+                            }
+                        }
+                    }
+                    
+                    Button {
+                        text: "■"
+                        implicitWidth: 50
+                        implicitHeight: 36
+                        onClicked: stopReplay()
+                    }
+                }
+            }
+        }
+    }
+    
+    Connections {
+        target: executionController
+        
+        function onReplayStarted(executionId, totalSeconds) {
+            replayExecutionId = executionId
+            replayTotal = totalSeconds
+            replayPosition = 0
+            replayPressure = 0.0
+            replayPhase = ""
+            replayAlarm = ""
+            replayPlaying = true
+        }
+        
+        function onReplayPositionChanged(position, total) {
+            replayPosition = position
+            replayTotal = total
+        }
+        
+        function onReplayPressureUpdated(pressure) {
+            replayPressure = pressure
+        }
+        
+        function onReplayPhaseChanged(phase) {
+            replayPhase = phase
+        }
+        
+        function onReplayAlarmTriggered(alarmType, message) {
+            replayAlarm = message
+        }
+        
+        function onReplayFinished(executionId, status) {
+            replayPlaying = false
+        }
+    }
+    
+    // La repetición no sigue corriendo al salir del historial
+    Component.onDestruction: stopReplay()
+}
@@ -0,0 +1,52 @@
+import QtQuick 2.15
+import QtQuick.Controls 2.15
+
+// Carga diferida y asíncrona de vistas y diálogos pesados.
+// El archivo QML solo se compila e instancia al activarse el Loader;
+// withItem() ejecuta la acción en cuanto el elemento está listo.
+Loader {
+    id: lazyLoader
+    
+    property string name: ""
+    property var pendingActions: []
+    property double requestedAt: Date.now()
+    
+    asynchronous: true
+    
+    // Ejecuta action(item) ahora o cuando termine la carga
+    function withItem(action) {
+        if (status === Loader.Ready && item) {
+            action(item)
+            return
+        }
+        pendingActions = pendingActions.concat([action])
+        if (!active) {
+            requestedAt = Date.now()
+            active = true
+        }
+    }
+    
+    onLoaded: {
+        if (startupReport) {
+            startupReport.component_loaded(name, Date.now() - requestedAt)
+        }
+        var actions = pendingActions
+        pendingActions = []
+        for (var i = 0; i < actions.length; i++) {
+            actions[i](item)
+        }
+    }
+    
+    onStatusChanged: {
+        if (status === Loader.Error) {
+            console.log("Error cargando componente:", name, source)
+        }
+    }
+    
+    // Indicador mientras se compila o instancia en segundo plano
+    BusyIndicator {
+        anchors.centerIn: parent
+        running: lazyLoader.active && lazyLoader.status === Loader.Loading
+        visible: running
+    }
+}
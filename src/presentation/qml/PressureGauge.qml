@@ -1,4 +1,5 @@
 import QtQuick 2.15
+import QtQuick.Shapes 1.15
 
 Item {
     id: gauge
@@ -10,6 +11,9 @@ Item {
     property color gaugeColor: "#3498DB"
     property color backgroundColor: "#ECF0F1"
     property color needleColor: "#E74C3C"
+    property color scaleColor: "#7F8C8D"
+    property color labelColor: "#2C3E50"
+    property bool animated: true  // Suaviza la aguja; se actualiza como mucho una vez por fotograma
     
     width: size
     height: size
@@ -19,6 +23,18 @@ Item {
     property real valueRange: maxValue - minValue
     property real normalizedValue: valueRange > 0 ? (safeValue - minValue) / valueRange : 0
     
+    // Escala de 270° con el hueco abajo (grados del canvas: 0 = derecha, sentido horario)
+    readonly property real startAngle: 135
+    readonly property real sweepAngle: 270
+    
+    // Valor mostrado: lo mueve la animación (sincronizada con el refresco de pantalla),
+    // no cada muestra, así que aguja y arco cuestan lo mismo con cualquier frecuencia de muestreo
+    property real displayedValue: normalizedValue
+    Behavior on displayedValue {
+        enabled: gauge.animated
+        NumberAnimation { duration: 120; easing.type: Easing.OutQuad }
+    }
+    
     // Círculo de fondo
     Rectangle {
         id: background
@@ -31,84 +47,82 @@ Item {
         border.width: 3
     }
     
-    // Arco de progreso
+    // Capa estática: marcas y etiquetas pintadas una vez en una textura.
+    // Solo se repinta al cambiar tamaño, rango o colores, nunca con el valor.
     Canvas {
-        id: progressArc
+        id: dial
         anchors.fill: background
+        renderTarget: Canvas.Image
         
         onPaint: {
             var ctx = getContext("2d")
-            ctx.clearRect(0, 0, width, height)
+            ctx.reset()
             
             var centerX = width / 2
             var centerY = height / 2
-            var radius = (Math.min(width, height) / 2) - 10
-            
-            // Ángulo inicial y final en radianes (de -135° a +135°)
-            var startAngle = (225 * Math.PI) / 180   // 225°
-            var endAngle = (45 * Math.PI) / 180      // 45°
-            var safeNormalizedValue = isNaN(normalizedValue) ? 0 : Math.max(0, Math.min(1, normalizedValue))
-            var currentAngle = startAngle + (endAngle - startAngle) * safeNormalizedValue
-            
-            // Dibujar arco de progreso
-            ctx.beginPath()
-            ctx.arc(centerX, centerY, radius, startAngle, currentAngle, false)
-            ctx.lineWidth = 8
-            ctx.strokeStyle = gaugeColor
-            ctx.stroke()
-        }
-    }
-    
-    // Marcas de escala
-    Repeater {
-        model: 11
-        
-        Rectangle {
-            // Ángulo de -135° a +135°
-            property real angle: (-135 + (index / 10) * 270) * Math.PI / 180
-            property real markRadius: size / 2 - 25
-            
-            x: size / 2 + Math.cos(angle) * markRadius - width / 2
-            y: size / 2 + Math.sin(angle) * markRadius - height / 2
+            var markRadius = Math.min(width, height) / 2 - 25
+            var labelRadius = Math.min(width, height) / 2 - 45
             
-            width: index % 2 === 0 ? 3 : 2
-            height: index % 2 === 0 ? 15 : 10
-            color: "#7F8C8D"
+            // Marcas de escala (11, las pares más largas)
+            ctx.strokeStyle = scaleColor
+            for (var i = 0; i <= 10; i++) {
+                var angle = (startAngle + (i / 10) * sweepAngle) * Math.PI / 180
+                var length = i % 2 === 0 ? 15 : 10
+                var cos = Math.cos(angle)
+                var sin = Math.sin(angle)
+                ctx.beginPath()
+                ctx.lineWidth = i % 2 === 0 ? 3 : 2
+                ctx.moveTo(centerX + cos * (markRadius - length / 2), centerY + sin * (markRadius - length / 2))
+                ctx.lineTo(centerX + cos * (markRadius + length / 2), centerY + sin * (markRadius + length / 2))
+                ctx.stroke()
+            }
             
-            transform: Rotation {
-                origin.x: width / 2
-                origin.y: height / 2
-                angle: angle * 180 / Math.PI + 90
+            // Etiquetas numéricas (6)
+            ctx.fillStyle = labelColor
+            ctx.font = "bold 12px sans-serif"
+            ctx.textAlign = "center"
+            ctx.textBaseline = "middle"
+            for (var j = 0; j <= 5; j++) {
+                var labelAngle = (startAngle + (j / 5) * sweepAngle) * Math.PI / 180
+                var labelValue = minValue + (j / 5) * (maxValue - minValue)
+                ctx.fillText(Math.round(labelValue).toString(),
+                             centerX + Math.cos(labelAngle) * labelRadius,
+                             centerY + Math.sin(labelAngle) * labelRadius)
             }
         }
+        
+        onWidthChanged: requestPaint()
+        onHeightChanged: requestPaint()
     }
     
-    // Etiquetas numéricas
-    Repeater {
-        model: 6
+    // Capa dinámica: arco de progreso como geometría del scene graph (sin Canvas)
+    Shape {
+        id: progressArc
+        anchors.fill: background
+        asynchronous: true
         
-        Text {
-            // Ángulo de -135° a +135°
-            property real angle: (-135 + (index / 5) * 270) * Math.PI / 180
-            property real labelRadius: size / 2 - 45
-            property real labelValue: minValue + (index / 5) * (maxValue - minValue)
-            
-            x: size / 2 + Math.cos(angle) * labelRadius - width / 2
-            y: size / 2 + Math.sin(angle) * labelRadius - height / 2
+        ShapePath {
+            strokeColor: gaugeColor
+            strokeWidth: 8
+            fillColor: "transparent"
+            capStyle: ShapePath.FlatCap
             
-            text: Math.round(labelValue).toString()
-            font.pixelSize: 12
-            font.bold: true
-            color: "#2C3E50"
-            horizontalAlignment: Text.AlignHCenter
-            verticalAlignment: Text.AlignVCenter
+            PathAngleArc {
+                centerX: progressArc.width / 2
+                centerY: progressArc.height / 2
+                radiusX: Math.min(progressArc.width, progressArc.height) / 2 - 10
+                radiusY: radiusX
+                startAngle: gauge.startAngle
+                sweepAngle: gauge.sweepAngle * Math.max(0, Math.min(1, gauge.displayedValue))
+            }
         }
     }
     
-    // Aguja
+    // Aguja (gira sobre el centro del indicador)
     Rectangle {
         id: needle
-        anchors.centerIn: parent
+        x: size / 2 - width / 2
+        y: size / 2 - height
         width: 4
         height: size / 2 - 30
         color: needleColor
@@ -118,10 +132,7 @@ Item {
         transform: Rotation {
             origin.x: needle.width / 2
             origin.y: needle.height
-            angle: {
-                var safeNormalizedValue = isNaN(normalizedValue) ? 0 : Math.max(0, Math.min(1, normalizedValue))
-                return (safeNormalizedValue * 270) - 135
-            }
+            angle: gauge.startAngle + 90 + gauge.sweepAngle * Math.max(0, Math.min(1, gauge.displayedValue))
         }
     }
     
@@ -143,14 +154,13 @@ Item {
         text: safeValue.toFixed(1) + " PSI"
         font.pixelSize: 16
         font.bold: true
-        color: "#2C3E50"
+        color: labelColor
         horizontalAlignment: Text.AlignHCenter
     }
     
-    // Actualizar canvas cuando cambia el valor
-    onNormalizedValueChanged: {
-        if (progressArc) {
-            progressArc.requestPaint()
-        }
-    }
+    // Repintar la capa estática solo cuando cambia lo que dibuja
+    onMinValueChanged: dial.requestPaint()
+    onMaxValueChanged: dial.requestPaint()
+    onScaleColorChanged: dial.requestPaint()
+    onLabelColorChanged: dial.requestPaint()
 }
\ No newline at end of file
@@ -1,6 +1,7 @@
 import QtQuick 2.15
 import QtQuick.Controls 2.15
 import QtQuick.Layouts 1.15
+import PressureControl 1.0
 
 Dialog {
     id: executionDialog
@@ -195,9 +196,9 @@ Dialog {
             Rectangle {
                 Layout.fillWidth: true
                 Layout.preferredHeight: 60
-                color: alarmType === "red" ? "#FADBD8" : "#D5F4E6"
+                color: alarmType === "red" ? "#FADBD8" : (alarmType === "yellow" ? "#FFF3CD" : "#D5F4E6")
                 radius: 8
-                border.color: alarmType === "red" ? "#E74C3C" : "#27AE60"
+                border.color: alarmType === "red" ? "#E74C3C" : (alarmType === "yellow" ? "#F39C12" : "#27AE60")
                 border.width: 2
                 visible: hasAlarm
                 
@@ -215,7 +216,7 @@ Dialog {
                     text: alarmMessage
                     font.pixelSize: 14
                     font.bold: true
-                    color: alarmType === "red" ? "#C0392B" : "#27AE60"
+                    color: alarmType === "red" ? "#C0392B" : (alarmType === "yellow" ? "#D68910" : "#27AE60")
                     horizontalAlignment: Text.AlignHCenter
                     wrapMode: Text.WordWrap
                     width: parent.width - 20
@@ -291,6 +292,38 @@ Dialog {
                 }
             }
             
+            // Tendencia de presión (visible durante ejecución)
+            Rectangle {
+                Layout.fillWidth: true
+                Layout.preferredHeight: 140
+                color: "#FFFFFF"
+                radius: 10
+                border.color: "#BDC3C7"
+                border.width: 1
+                visible: isExecuting
+                
+                TrendChart {
+                    id: pressureTrend
+                    anchors.fill: parent
+                    anchors.margins: 10
+                    chamberId: 1
+                    source: executionController
+                    timeWindow: 600  // Últimos 10 minutos
+                    resolution: qualityGovernor ? qualityGovernor.chartResolution : 1
+                    minValue: 0
+                    maxValue: executionGauge.maxValue
+                    lineColor: currentPhase === "setup" ? "#F39C12" : "#3498DB"
+                }
+                
+                Text {
+                    anchors.centerIn: parent
+                    visible: pressureTrend.sampleCount === 0
+                    text: "Esperando muestras..."
+                    font.pixelSize: 11
+                    color: "#95A5A6"
+                }
+            }
+            
             // Botones de control
             RowLayout {
                 Layout.fillWidth: true
@@ -404,6 +437,7 @@ Dialog {
                     value: mainController ? mainController.currentPressure : 0
                     minValue: 0
                     maxValue: programData ? Math.max(100, programData.max_pressure * 1.2) : 100
+                    animated: (!qualityGovernor || qualityGovernor.animationsEnabled)
                     
                     // Mostrar zonas de presión del programa
                     property real programMinPressure: programData ? programData.min_pressure : 0
@@ -465,6 +499,7 @@ Dialog {
     function _getPhaseColor() {
         if (hasAlarm && alarmType === "red") return "#FADBD8"
         if (hasAlarm && alarmType === "green") return "#D5F4E6"
+        if (hasAlarm && alarmType === "yellow") return "#FFF3CD"
         
         switch(currentPhase) {
             case "setup": return "#FFF3CD"
@@ -477,6 +512,7 @@ Dialog {
     function _getPhaseBorderColor() {
         if (hasAlarm && alarmType === "red") return "#E74C3C"
         if (hasAlarm && alarmType === "green") return "#27AE60"
+        if (hasAlarm && alarmType === "yellow") return "#F39C12"
         
         switch(currentPhase) {
             case "setup": return "#F39C12"
@@ -489,6 +525,7 @@ Dialog {
     function _getPhaseTextColor() {
         if (hasAlarm && alarmType === "red") return "#C0392B"
         if (hasAlarm && alarmType === "green") return "#27AE60"
+        if (hasAlarm && alarmType === "yellow") return "#D68910"
         
         switch(currentPhase) {
             case "setup": return "#D68910"
@@ -501,6 +538,7 @@ Dialog {
     function _getPhaseIcon() {
         if (hasAlarm && alarmType === "red") return "⚠️"
         if (hasAlarm && alarmType === "green") return "✅"
+        if (hasAlarm && alarmType === "yellow") return "📉"
         
         switch(currentPhase) {
             case "setup": return "⏳"
@@ -513,6 +551,7 @@ Dialog {
     function _getPhaseTitle() {
         if (hasAlarm && alarmType === "red") return "ALARMA ACTIVADA"
         if (hasAlarm && alarmType === "green") return "PROGRAMA COMPLETADO"
+        if (hasAlarm && alarmType === "yellow") return "DESVIACIÓN DE LA CURVA"
         
         switch(currentPhase) {
             case "setup": return "FASE DE SETUP"
@@ -525,6 +564,7 @@ Dialog {
     function _getPhaseDescription() {
         if (hasAlarm && alarmType === "red") return "Revisar condiciones de presión"
         if (hasAlarm && alarmType === "green") return "Ejecución finalizada correctamente"
+        if (hasAlarm && alarmType === "yellow") return "La presión se aparta de las ejecuciones anteriores"
         
         switch(currentPhase) {
             case "setup": return "Subiendo a presión mínima..."
@@ -534,6 +574,29 @@ Dialog {
         }
     }
     
+    function _formatClock(seconds) {
+        var minutes = Math.floor(seconds / 60)
+        var rest = seconds % 60
+        return (minutes < 10 ? "0" : "") + minutes + ":" + (rest < 10 ? "0" : "") + rest
+    }
+    
+    function _formatPressure(value) {
+        return Number(value).toLocaleString(Qt.locale(), 'f', 1) + " PSI"
+    }
+    
+    function _formatTelemetry(telemetry) {
+        if (telemetry.phase === "setup") {
+            return "Subiendo presión: " + _formatPressure(telemetry.pressure) + " / " + _formatPressure(telemetry.min_pressure)
+                 + " | Tiempo: " + _formatClock(telemetry.elapsed_seconds)
+                 + " | Restante: " + _formatClock(telemetry.remaining_seconds)
+        }
+        
+        var text = "EJECUTANDO: " + _formatClock(telemetry.elapsed_seconds)
+                 + " / Restante: " + _formatClock(telemetry.remaining_seconds)
+                 + " / Presión: " + _formatPressure(telemetry.pressure)
+        return telemetry.alarm_active ? text + " ⚠️ ALARMA" : text
+    }
+    
     // Connections para manejar eventos de ejecución
     Connections {
         target: executionController
@@ -563,10 +626,13 @@ Dialog {
             console.log("Ejecución finalizada en diálogo:", executionId, status)
         }
         
-        function onProgressUpdated(elapsed, remaining, percentage) {
-            progressBar.value = percentage
-            progressText.text = `${percentage}%`
-            console.log("Progreso actualizado:", percentage + "%")
+        // Instantánea numérica coalescida al refresco: el formato se aplica aquí
+        function onTelemetryUpdated(telemetry) {
+            if (!telemetry || !telemetry.is_running) return
+            
+            progressBar.value = telemetry.progress
+            progressText.text = telemetry.progress + "%"
+            statusText.text = _formatTelemetry(telemetry)
         }
         
         function onStatusChanged(status) {
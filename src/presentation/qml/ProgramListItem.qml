@@ -62,7 +62,8 @@ Rectangle {
         
         // Animación de pulso
         SequentialAnimation on opacity {
-            running: parent.visible
+            running: parent.visible && (!qualityGovernor || qualityGovernor.animationsEnabled)
+            alwaysRunToEnd: true  // Al pararse termina opaco
             loops: Animation.Infinite
             NumberAnimation { to: 0.6; duration: 1000 }
             NumberAnimation { to: 1.0; duration: 1000 }
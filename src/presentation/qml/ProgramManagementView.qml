@@ -8,12 +8,17 @@ Rectangle {
     // Señales
     signal backToMain()
     
-    // Propiedades para estado de ejecución
-    property bool isExecuting: executionController ? executionController.isRunning : false
-    property string executingProgramName: executionController ? executionController.currentProgramName : ""
+    // Estado de ejecución (enlazado: se actualiza solo cuando cambia cada campo)
+    readonly property var currentExecution: executionController ? executionController.currentExecution : null
+    readonly property bool isExecuting: currentExecution ? currentExecution.running : false
+    readonly property string executingProgramName: currentExecution ? currentExecution.programName : ""
     
-    // Propiedad para acceso al dialog de ejecución (para uso externo)
-    property alias executionDialog: executionDialog
+    // Abre el diálogo de ejecución (se crea la primera vez que se usa; también para uso externo)
+    function openExecutionDialog(programData) {
+        executionDialogLoader.withItem(function(dialog) {
+            dialog.openForProgram(programData)
+        })
+    }
     
     gradient: Gradient {
         GradientStop { position: 0.0; color: "#2C3E50" }
@@ -26,49 +31,23 @@ Rectangle {
         if (programController) {
             programController.load_programs()
         }
-        
-        // Actualizar estado de ejecución
-        updateExecutionState()
-    }
-    
-    // Función para actualizar estado de ejecución
-    function updateExecutionState() {
-        isExecuting = executionController ? executionController.isRunning : false
-        executingProgramName = executionController ? executionController.currentProgramName : ""
-        console.log("Estado de ejecución actualizado:", isExecuting, executingProgramName)
     }
     
-    // Función SEGURA para obtener datos del programa en ejecución
+    // Datos del programa en ejecución para el diálogo (desde el estado ya publicado)
     function getCurrentExecutionProgramData() {
-        if (!executionController || !executionController.isRunning) {
+        if (!isExecuting) {
             console.log("No hay ejecución activa")
             return null
         }
         
-        try {
-            // Usar el slot del controller en lugar de acceso directo al servicio
-            var currentInfo = executionController.get_current_execution_info()
-            
-            if (!currentInfo || !currentInfo.is_running) {
-                console.log("No hay información de ejecución válida")
-                return null
-            }
-            
-            console.log("Información de ejecución obtenida:", JSON.stringify(currentInfo))
-            
-            // Crear objeto de datos del programa para el diálogo
-            return {
-                id: currentInfo.execution_id || 0,
-                name: currentInfo.program_name || "Programa Actual",
-                description: "Programa en ejecución",
-                min_pressure: currentInfo.min_pressure || 0,
-                max_pressure: currentInfo.max_pressure || 100,
-                program_duration: (currentInfo.program_duration || 0) / 60,
-                time_to_min_pressure: 5 // Valor por defecto
-            }
-        } catch (e) {
-            console.log("Error obteniendo datos de ejecución:", e)
-            return null
+        return {
+            id: currentExecution.executionId,
+            name: currentExecution.programName || "Programa Actual",
+            description: "Programa en ejecución",
+            min_pressure: currentExecution.minPressure,
+            max_pressure: currentExecution.maxPressure || 100,
+            program_duration: currentExecution.programDuration / 60,
+            time_to_min_pressure: 5 // Valor por defecto
         }
     }
     
@@ -134,7 +113,8 @@ Rectangle {
                     border.width: 1
                     
                     SequentialAnimation on opacity {
-                        running: parent.visible
+                        running: parent.visible && (!qualityGovernor || qualityGovernor.animationsEnabled)
+                        alwaysRunToEnd: true  // Al pararse termina opaco
                         loops: Animation.Infinite
                         NumberAnimation { to: 0.7; duration: 1000 }
                         NumberAnimation { to: 1.0; duration: 1000 }
@@ -156,7 +136,7 @@ Rectangle {
                         onClicked: {
                             var programData = getCurrentExecutionProgramData()
                             if (programData) {
-                                executionDialog.openForProgram(programData)
+                                openExecutionDialog(programData)
                             } else {
                                 console.log("No se pudieron obtener los datos del programa en ejecución")
                             }
@@ -215,7 +195,9 @@ Rectangle {
                     }
                     
                     onClicked: {
-                        programFormDialog.openForCreate()
+                        programFormLoader.withItem(function(dialog) {
+                            dialog.openForCreate()
+                        })
                     }
                 }
             }
@@ -337,7 +319,6 @@ Rectangle {
                         if (programController) {
                             programController.refresh_programs()
                         }
-                        updateExecutionState()
                     }
                 }
             }
@@ -358,12 +339,12 @@ Rectangle {
                 
                 ListView {
                     id: programListView
-                    model: programController ? programController.programs : []
+                    model: programController ? programController.programModel : null
                     spacing: 15
                     
                     delegate: ProgramListItem {
                         width: programListView.width
-                        programData: modelData
+                        programData: model.programData
                         canManage: programController ? programController.canManage : false
                         
                         // Pasar estado de ejecución
@@ -371,7 +352,9 @@ Rectangle {
                         executingProgramName: programManagementView.executingProgramName
                         
                         onEditRequested: {
-                            programFormDialog.openForEdit(programData)
+                            programFormLoader.withItem(function(dialog) {
+                                dialog.openForEdit(programData)
+                            })
                         }
                         
                         onDeleteRequested: {
@@ -380,13 +363,13 @@ Rectangle {
                         }
                         
                         onExecuteRequested: {
-                            executionDialog.openForProgram(programData)
+                            openExecutionDialog(programData)
                         }
                         
                         onViewExecutionRequested: {
                             var programData = getCurrentExecutionProgramData()
                             if (programData) {
-                                executionDialog.openForProgram(programData)
+                                openExecutionDialog(programData)
                             } else {
                                 console.log("No se pudieron obtener los datos del programa en ejecución")
                             }
@@ -396,7 +379,8 @@ Rectangle {
                     // Mensaje cuando no hay programas
                     Text {
                         anchors.centerIn: parent
-                        text: searchField.text !== "" ? "No se encontraron programas" : "No hay programas creados"
+                        text: programListView.model && programListView.model.loading ? "Cargando programas..." :
+                              (searchField.text !== "" ? "No se encontraron programas" : "No hay programas creados")
                         font.pixelSize: 18
                         color: "#7F8C8D"
                         visible: programListView.count === 0
@@ -503,26 +487,34 @@ Rectangle {
         }
     }
     
-    // Dialog para crear/editar programas
-    ProgramFormDialog {
-        id: programFormDialog
-        
-        onProgramSaved: {
-            // El controlador ya actualiza la lista automáticamente
-        }
+    // Dialog para crear/editar programas (carga diferida)
+    LazyLoader {
+        id: programFormLoader
+        anchors.fill: parent
+        name: "ProgramFormDialog"
+        source: "ProgramFormDialog.qml"
+        active: false
+    }
+    
+    // Dialog de ejecución de programas (carga diferida)
+    LazyLoader {
+        id: executionDialogLoader
+        anchors.fill: parent
+        name: "ProgramExecutionDialog"
+        source: "ProgramExecutionDialog.qml"
+        active: false
     }
     
-    // Dialog de ejecución de programas - AQUÍ ESTÁ LA REFERENCIA QUE FALTABA
-    ProgramExecutionDialog {
-        id: executionDialog
+    Connections {
+        target: executionDialogLoader.item
         
-        onExecutionRequested: function(programId) {
+        function onExecutionRequested(programId) {
             if (executionController) {
                 executionController.start_execution(programId)
             }
         }
         
-        onStopRequested: {
+        function onStopRequested() {
             if (executionController) {
                 executionController.stop_execution()
             }
@@ -649,19 +641,6 @@ Rectangle {
         function onOperationResult(success, message) {
             messageDialog.showMessage(message, !success)
         }
-        
-        // Actualizar estado cuando cambia la ejecución
-        function onExecutionStateChanged() {
-            updateExecutionState()
-        }
-        
-        function onExecutionStarted(executionId) {
-            updateExecutionState()
-        }
-        
-        function onExecutionFinished(executionId, status) {
-            updateExecutionState()
-        }
     }
     
     // Debug: Connections para monitorear cambios
@@ -669,7 +648,7 @@ Rectangle {
         target: programController
         
         function onProgramsChanged() {
-            console.log("Programas actualizados en QML, total:", programController ? programController.programs.length : 0)
+            console.log("Programas actualizados en QML, total:", programController ? programController.programModel.count : 0)
         }
     }
 }
\ No newline at end of file
@@ -54,24 +54,6 @@ ApplicationWindow {
             executionResumedDialog.open()
         }
         
-        // Función SEGURA para obtener información de ejecución
-        function getCurrentExecutionInfo() {
-            if (!executionController) {
-                console.log("executionController no disponible")
-                return null
-            }
-            
-            try {
-                // Usar el slot get_current_execution_info del controller
-                var info = executionController.get_current_execution_info()
-                console.log("Información obtenida:", JSON.stringify(info))
-                return info
-            } catch (e) {
-                console.log("Error obteniendo información de ejecución:", e)
-                return null
-            }
-        }
-        
         // Componente de Dashboard (vista principal)
         Component {
             id: dashboardComponent
@@ -140,7 +122,8 @@ ApplicationWindow {
                                 
                                 // Efecto de parpadeo
                                 SequentialAnimation on opacity {
-                                    running: parent.visible
+                                    running: parent.visible && (!qualityGovernor || qualityGovernor.animationsEnabled)
+                                    alwaysRunToEnd: true  // Al pararse termina opaco
                                     loops: Animation.Infinite
                                     NumberAnimation { to: 0.3; duration: 800 }
                                     NumberAnimation { to: 1.0; duration: 800 }
@@ -192,6 +175,67 @@ ApplicationWindow {
                                 }
                             }
                             
+                            // Botón historial de ejecuciones
+                            Button {
+                                text: "Historial"
+                                implicitWidth: 110
+                                implicitHeight: 40
+                                
+                                background: Rectangle {
+                                    color: parent.pressed ? "#2471A3" : "#2980B9"
+                                    radius: 8
+                                    border.color: "#1F618D"
+                                    border.width: 1
+                                }
+                                
+                                contentItem: Text {
+                                    text: parent.text
+                                    color: "white"
+                                    font.pixelSize: 14
+                                    font.bold: true
+                                    horizontalAlignment: Text.AlignHCenter
+                                    verticalAlignment: Text.AlignVCenter
+                                }
+                                
+                                onClicked: {
+                                    stackView.push(executionHistoryComponent)
+                                }
+                            }
+                            
+                            // Calidad de la interfaz (abre el panel de diagnóstico)
+                            Button {
+                                id: qualityButton
+                                
+                                readonly property int level: qualityGovernor ? qualityGovernor.level : 0
+                                
+                                text: qualityGovernor ? "Calidad " + qualityGovernor.levelName : "Diagnóstico"
+                                implicitWidth: 130
+                                implicitHeight: 40
+                                
+                                background: Rectangle {
+                                    color: qualityButton.level === 0 ? "#27AE60" : (qualityButton.level === 1 ? "#F39C12" : "#E74C3C")
+                                    opacity: parent.pressed ? 0.7 : 1.0
+                                    radius: 8
+                                    border.color: "#2C3E50"
+                                    border.width: 1
+                                }
+                                
+                                contentItem: Text {
+                                    text: parent.text
+                                    color: "white"
+                                    font.pixelSize: 13
+                                    font.bold: true
+                                    horizontalAlignment: Text.AlignHCenter
+                                    verticalAlignment: Text.AlignVCenter
+                                }
+                                
+                                onClicked: {
+                                    diagnosticsPanel.withItem(function(panel) {
+                                        panel.open()
+                                    })
+                                }
+                            }
+                            
                             // Botón logout
                             Button {
                                 text: "Salir"
@@ -238,6 +282,7 @@ ApplicationWindow {
                             value: mainController ? mainController.currentPressure : 0
                             minValue: 0
                             maxValue: 100
+                            animated: (!qualityGovernor || qualityGovernor.animationsEnabled)
                         }
                     }
                     
@@ -343,9 +388,36 @@ ApplicationWindow {
         Component {
             id: programManagementComponent
             
-            ProgramManagementView {
-                onBackToMain: {
-                    stackView.pop()
+            LazyLoader {
+                id: programManagementLoader
+                name: "ProgramManagementView"
+                source: "ProgramManagementView.qml"
+                
+                Connections {
+                    target: programManagementLoader.item
+                    
+                    function onBackToMain() {
+                        stackView.pop()
+                    }
+                }
+            }
+        }
+        
+        // Componente de Historial de Ejecuciones
+        Component {
+            id: executionHistoryComponent
+            
+            LazyLoader {
+                id: executionHistoryLoader
+                name: "ExecutionHistoryView"
+                source: "ExecutionHistoryView.qml"
+                
+                Connections {
+                    target: executionHistoryLoader.item
+                    
+                    function onBackToMain() {
+                        stackView.pop()
+                    }
                 }
             }
         }
@@ -357,19 +429,21 @@ ApplicationWindow {
             repeat: false
             onTriggered: {
                 var programManagement = stackView.currentItem
-                if (programManagement && programManagement.executionDialog && executionController && executionController.isRunning) {
-                    // Obtener información del programa actual de forma segura
-                    var currentInfo = getCurrentExecutionInfo()
-                    if (currentInfo && currentInfo.is_running && currentInfo.program_name) {
+                if (programManagement && programManagement.withItem && executionController && executionController.isRunning) {
+                    // Estado publicado por el controlador (sin consultar al servicio)
+                    var current = executionController.currentExecution
+                    if (current.running && current.programName) {
                         // Simular datos del programa para abrir el diálogo
                         var programData = {
-                            id: currentInfo.execution_id || 0,
-                            name: currentInfo.program_name || "Programa Actual",
-                            min_pressure: currentInfo.min_pressure || 0,
-                            max_pressure: currentInfo.max_pressure || 100,
-                            program_duration: (currentInfo.program_duration || 0) / 60
+                            id: current.executionId,
+                            name: current.programName,
+                            min_pressure: current.minPressure,
+                            max_pressure: current.maxPressure || 100,
+                            program_duration: current.programDuration / 60
                         }
-                        programManagement.executionDialog.openForProgram(programData)
+                        programManagement.withItem(function(view) {
+                            view.openExecutionDialog(programData)
+                        })
                     }
                 }
             }
@@ -495,13 +569,25 @@ ApplicationWindow {
             repeat: false
             onTriggered: {
                 var programManagement = stackView.currentItem
-                if (programManagement && programManagement.executionDialog && resumedProgramAfterLogin) {
-                    programManagement.executionDialog.openForProgram(resumedProgramAfterLogin)
+                if (programManagement && programManagement.withItem && resumedProgramAfterLogin) {
+                    var program = resumedProgramAfterLogin
+                    programManagement.withItem(function(view) {
+                        view.openExecutionDialog(program)
+                    })
                 }
             }
         }
     }
     
+    // Panel de diagnóstico del regulador de calidad (se crea al abrirlo)
+    LazyLoader {
+        id: diagnosticsPanel
+        anchors.fill: parent
+        name: "DiagnosticsPanel"
+        source: "DiagnosticsPanel.qml"
+        active: false
+    }
+    
     // Connections para manejar ejecución resumida
     Connections {
         target: executionController
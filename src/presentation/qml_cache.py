@@ -0,0 +1,57 @@
+"""
+Caché de compilación de QML
+Guarda los .qmlc junto a la aplicación y permite precompilarlos antes del despliegue
+"""
+
+import os
+import time
+from pathlib import Path
+from typing import Optional, Dict
+from PyQt6.QtCore import QUrl
+from PyQt6.QtQml import QQmlComponent, QQmlEngine
+
+QML_DIR = Path(__file__).parent / "qml"
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+
+def configure_qml_disk_cache(cache_dir: Optional[str]) -> Optional[Path]:
+    """Fija el directorio de la caché de disco de QML
+
+    Debe llamarse antes de crear la aplicación Qt. Una variable
+    QML_DISK_CACHE_PATH ya definida tiene prioridad.
+    """
+    if os.environ.get('QML_DISK_CACHE_PATH'):
+        return Path(os.environ['QML_DISK_CACHE_PATH'])
+    if not cache_dir:
+        return None
+
+    path = Path(cache_dir)
+    if not path.is_absolute():
+        path = PROJECT_ROOT / path
+    try:
+        path.mkdir(parents=True, exist_ok=True)
+    except OSError as e:
+        print(f"Warning: no se pudo crear la caché QML en {path}: {e}")
+        return None
+
+    os.environ['QML_DISK_CACHE_PATH'] = str(path)
+    return path
+
+
+def precompile_qml(engine: QQmlEngine) -> Dict[str, float]:
+    """Compila todos los archivos QML para que dejen sus .qmlc en la caché
+
+    Solo compila (no crea objetos), así que no necesita controladores ni base
+    de datos; sí necesita los tipos QML registrados. Devuelve los milisegundos
+    de compilación por archivo.
+    """
+    timings: Dict[str, float] = {}
+    for qml_file in sorted(QML_DIR.glob('*.qml')):
+        start = time.perf_counter()
+        component = QQmlComponent(engine, QUrl.fromLocalFile(str(qml_file)),
+                                  QQmlComponent.CompilationMode.PreferSynchronous)
+        timings[qml_file.name] = (time.perf_counter() - start) * 1000.0
+        if component.isError():
+            for error in component.errors():
+                print(f"Error compilando {qml_file.name}: {error.toString()}")
+    return timings
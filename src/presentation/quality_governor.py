@@ -0,0 +1,241 @@
+"""
+Regulador de calidad de la interfaz
+Reduce refresco, animaciones y resolución de gráficas cuando el equipo va cargado
+"""
+
+import os
+import time
+from typing import Optional, Dict, Any, List
+from PyQt6.QtCore import Qt, QObject, QTimer, pyqtSignal, pyqtProperty
+
+# Niveles por defecto: el 0 es la calidad completa (refresco de execution.ui_refresh_hz)
+DEFAULT_LEVELS = [
+    {'name': 'completa', 'animations': True, 'chart_resolution': 1},
+    {'name': 'reducida', 'refresh_hz': 10, 'animations': False, 'chart_resolution': 2},
+    {'name': 'mínima', 'refresh_hz': 4, 'animations': False, 'chart_resolution': 4},
+]
+
+
+class QualityGovernor(QObject):
+    """Ajusta la calidad de la interfaz a la carga del proceso
+
+    Un temporizador de sondeo mide cuánto se retrasa el bucle de eventos
+    respecto a su intervalo; en cada ventana de evaluación se comparan ese
+    retraso medio y el uso de CPU del proceso (en % de un núcleo) con sus
+    umbrales. Tras varias ventanas cargadas se baja un nivel: menos
+    refresco de telemetría hacia la interfaz, sin animaciones y gráficas
+    con menos columnas. Se sube de nivel solo tras más ventanas tranquilas
+    (histéresis) para no oscilar.
+
+    El lazo de control va primero: si el tick del planificador llega tarde
+    se baja de nivel en esa misma ventana, y no se recupera calidad
+    mientras siga llegando tarde. El regulador nunca toca el planificador.
+    """
+
+    levelChanged = pyqtSignal()
+    metricsChanged = pyqtSignal()
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, base_refresh_hz: float = 30.0,
+                 execution_manager=None, parent=None):
+        super().__init__(parent)
+        config = config or {}
+        self.enabled = bool(config.get('enabled', True))
+        self.execution_manager = execution_manager
+        self.base_refresh_hz = float(base_refresh_hz)
+        self.levels: List[Dict[str, Any]] = list(config.get('levels') or DEFAULT_LEVELS)
+
+        self.probe_interval_ms = max(10, int(config.get('probe_interval_ms', 250)))
+        self.window_probes = max(1, int(config.get('evaluate_interval_ms', 2000)) // self.probe_interval_ms)
+        self.latency_high_ms = float(config.get('loop_latency_high_ms', 40))
+        self.latency_low_ms = float(config.get('loop_latency_low_ms', 10))
+        self.cpu_high_percent = float(config.get('cpu_high_percent', 80))
+        self.cpu_low_percent = float(config.get('cpu_low_percent', 50))
+        self.control_lateness_ms = float(config.get('control_lateness_ms', 50))
+        self.degrade_after = max(1, int(config.get('degrade_after', 2)))
+        self.restore_after = max(1, int(config.get('restore_after', 5)))
+
+        self._level = 0
+        self._reason = ''
+        self._busy_windows = 0
+        self._calm_windows = 0
+        self.level_changes = 0
+        self._degraded_since: Optional[float] = None
+        self._degraded_seconds = 0.0
+
+        # Ventana en curso
+        self._probes = 0
+        self._latency_sum = 0.0
+        self._latency_max = 0.0
+        self._expected_at = 0.0
+        self._window_wall = 0.0
+        self._window_cpu = 0.0
+
+        # Última ventana evaluada (para el panel de diagnóstico)
+        self.loop_latency_ms = 0.0
+        self.loop_latency_max_ms = 0.0
+        self.cpu_percent = 0.0
+        self.control_lateness_peak_ms = 0.0
+
+        self.probe_timer = QTimer(self)
+        self.probe_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.probe_timer.setInterval(self.probe_interval_ms)
+        self.probe_timer.timeout.connect(self._probe)
+
+    def start(self):
+        """Empieza a vigilar la carga"""
+        if not self.enabled or self.probe_timer.isActive():
+            return
+        self._reset_window(time.monotonic())
+        self.probe_timer.start()
+        print(f"Regulador de calidad activo (sondeo cada {self.probe_interval_ms} ms, "
+              f"{len(self.levels)} niveles)")
+
+    def stop(self):
+        self.probe_timer.stop()
+
+    def _reset_window(self, now: float):
+        self._probes = 0
+        self._latency_sum = 0.0
+        self._latency_max = 0.0
+        self._expected_at = now + self.probe_interval_ms / 1000.0
+        self._window_wall = now
+        self._window_cpu = time.process_time()
+
+    def _probe(self):
+        now = time.monotonic()
+        latency = max(0.0, (now - self._expected_at) * 1000.0)
+        self._expected_at = now + self.probe_interval_ms / 1000.0
+        self._probes += 1
+        self._latency_sum += latency
+        if latency > self._latency_max:
+            self._latency_max = latency
+        if self._probes >= self.window_probes:
+            self._evaluate(now)
+
+    def _evaluate(self, now: float):
+        """Cierra la ventana de medida y decide el nivel"""
+        wall = now - self._window_wall
+        cpu = time.process_time() - self._window_cpu
+        self.cpu_percent = cpu / wall * 100.0 if wall > 0 else 0.0
+        self.loop_latency_ms = self._latency_sum / self._probes
+        self.loop_latency_max_ms = self._latency_max
+        self.control_lateness_peak_ms = (self.execution_manager.take_tick_lateness_ms()
+                                         if self.execution_manager is not None else 0.0)
+        self._reset_window(now)
+
+        control_late = self.control_lateness_peak_ms > self.control_lateness_ms
+        busy = []
+        if control_late:
+            busy.append(f"control con {self.control_lateness_peak_ms:.0f} ms de retraso")
+        if self.loop_latency_ms > self.latency_high_ms:
+            busy.append(f"bucle de eventos con {self.loop_latency_ms:.0f} ms de retraso")
+        if self.cpu_percent > self.cpu_high_percent:
+            busy.append(f"CPU al {self.cpu_percent:.0f} %")
+        calm = (not control_late and self.loop_latency_ms < self.latency_low_ms
+                and self.cpu_percent < self.cpu_low_percent)
+
+        if busy:
+            self._calm_windows = 0
+            self._busy_windows += 1
+            if control_late or self._busy_windows >= self.degrade_after:
+                self._busy_windows = 0
+                self._set_level(self._level + 1, ", ".join(busy))
+        elif calm:
+            self._busy_windows = 0
+            self._calm_windows += 1
+            if self._calm_windows >= self.restore_after:
+                self._calm_windows = 0
+                self._set_level(self._level - 1, "carga normal")
+        else:
+            # Entre umbrales: se mantiene el nivel actual
+            self._busy_windows = 0
+            self._calm_windows = 0
+
+        self.metricsChanged.emit()
+
+    def _set_level(self, level: int, reason: str):
+        level = max(0, min(len(self.levels) - 1, level))
+        if level == self._level:
+            return
+        now = time.monotonic()
+        if self._level == 0:
+            self._degraded_since = now
+        elif level == 0 and self._degraded_since is not None:
+            self._degraded_seconds += now - self._degraded_since
+            self._degraded_since = None
+
+        self._level = level
+        self._reason = reason
+        self.level_changes += 1
+        if self.execution_manager is not None:
+            self.execution_manager.set_ui_refresh_hz(self.get_ui_refresh_hz())
+        print(f"Calidad de interfaz: {self.get_level_name()} ({reason})")
+        self.levelChanged.emit()
+
+    def _level_config(self) -> Dict[str, Any]:
+        return self.levels[self._level]
+
+    # --- Propiedades para QML ---
+
+    def get_level(self) -> int:
+        return self._level
+
+    def get_level_name(self) -> str:
+        return self._level_config().get('name', str(self._level))
+
+    def get_reason(self) -> str:
+        return self._reason
+
+    def get_animations_enabled(self) -> bool:
+        return bool(self._level_config().get('animations', True))
+
+    def get_chart_resolution(self) -> int:
+        return max(1, int(self._level_config().get('chart_resolution', 1)))
+
+    def get_ui_refresh_hz(self) -> float:
+        return min(self.base_refresh_hz, float(self._level_config().get('refresh_hz', self.base_refresh_hz)))
+
+    def get_loop_latency_ms(self) -> float:
+        return round(self.loop_latency_ms, 1)
+
+    def get_cpu_percent(self) -> float:
+        return round(self.cpu_percent, 1)
+
+    def get_control_lateness_ms(self) -> float:
+        return round(self.control_lateness_peak_ms, 1)
+
+    def get_degraded_seconds(self) -> float:
+        """Tiempo total con la calidad reducida"""
+        seconds = self._degraded_seconds
+        if self._degraded_since is not None:
+            seconds += time.monotonic() - self._degraded_since
+        return round(seconds, 1)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            'level': self._level,
+            'level_name': self.get_level_name(),
+            'reason': self._reason,
+            'ui_refresh_hz': self.get_ui_refresh_hz(),
+            'animations': self.get_animations_enabled(),
+            'chart_resolution': self.get_chart_resolution(),
+            'loop_latency_ms': self.get_loop_latency_ms(),
+            'loop_latency_max_ms': round(self.loop_latency_max_ms, 1),
+            'cpu_percent': self.get_cpu_percent(),
+            'cpu_count': os.cpu_count() or 1,
+            'control_lateness_ms': self.get_control_lateness_ms(),
+            'level_changes': self.level_changes,
+            'degraded_seconds': self.get_degraded_seconds()
+        }
+
+    level = pyqtProperty(int, get_level, notify=levelChanged)
+    levelName = pyqtProperty(str, get_level_name, notify=levelChanged)
+    reason = pyqtProperty(str, get_reason, notify=levelChanged)
+    animationsEnabled = pyqtProperty(bool, get_animations_enabled, notify=levelChanged)
+    chartResolution = pyqtProperty(int, get_chart_resolution, notify=levelChanged)
+    uiRefreshHz = pyqtProperty(float, get_ui_refresh_hz, notify=levelChanged)
+    loopLatencyMs = pyqtProperty(float, get_loop_latency_ms, notify=metricsChanged)
+    cpuPercent = pyqtProperty(float, get_cpu_percent, notify=metricsChanged)
+    controlLatenessMs = pyqtProperty(float, get_control_lateness_ms, notify=metricsChanged)
+    degradedSeconds = pyqtProperty(float, get_degraded_seconds, notify=metricsChanged)
+    metrics = pyqtProperty('QVariant', get_metrics, notify=metricsChanged)
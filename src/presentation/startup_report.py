@@ -0,0 +1,134 @@
+"""
+Informe de arranque de la interfaz
+Tiempo de cada fase y de cada componente QML hasta el primer fotograma
+"""
+
+import json
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from statistics import median
+from typing import List, Tuple, Optional, Dict, Any
+from PyQt6.QtCore import QObject, pyqtSlot
+
+
+class StartupReport(QObject):
+    """Registra cuánto tarda en cargarse cada parte de la interfaz
+
+    Las fases del arranque en Python se miden con measure(); los LazyLoader
+    de QML informan con component_loaded() al terminar su carga diferida.
+    El informe se imprime al mostrarse el primer fotograma, cuyo tiempo se
+    guarda como métrica de regresión (ver set_regression_tracking).
+    """
+
+    def __init__(self, origin: Optional[float] = None, parent=None):
+        super().__init__(parent)
+        self._origin = origin if origin is not None else time.perf_counter()
+        self.entries: List[Tuple[str, float, float]] = []  # (componente, inicio ms, duración ms)
+        self.first_frame_ms: Optional[float] = None
+        self.ready_ms: Optional[float] = None
+
+        self.metrics_file: Optional[Path] = None
+        self.first_frame_budget_ms = 0.0
+        self.regression_ratio = 0.0
+        self.metrics_history = 30
+
+    def set_regression_tracking(self, config: Dict[str, Any], project_root: Path):
+        """Configura el historial de tiempos de arranque (sección 'startup')"""
+        metrics_file = config.get('metrics_file')
+        if metrics_file:
+            path = Path(metrics_file)
+            self.metrics_file = path if path.is_absolute() else project_root / path
+        self.first_frame_budget_ms = float(config.get('first_frame_budget_ms', 0) or 0)
+        self.regression_ratio = float(config.get('regression_ratio', 0) or 0)
+        self.metrics_history = max(1, int(config.get('metrics_history', 30)))
+
+    def elapsed_ms(self) -> float:
+        """Milisegundos desde el inicio del arranque"""
+        return (time.perf_counter() - self._origin) * 1000.0
+
+    @contextmanager
+    def measure(self, name: str):
+        """Mide una fase del arranque"""
+        start = self.elapsed_ms()
+        try:
+            yield
+        finally:
+            self.entries.append((name, start, self.elapsed_ms() - start))
+
+    @pyqtSlot(str, float)
+    def component_loaded(self, name: str, elapsed_ms: float):
+        """Registra la carga diferida de un componente - MÉTODO SLOT PARA QML"""
+        self.entries.append((name, self.elapsed_ms() - elapsed_ms, elapsed_ms))
+        print(f"Componente QML '{name}' cargado en {elapsed_ms:.0f} ms")
+
+    def mark_first_frame(self):
+        """Anota el primer fotograma, imprime el informe y registra la métrica"""
+        if self.first_frame_ms is not None:
+            return
+        self.first_frame_ms = self.elapsed_ms()
+        print(self.format_report())
+        self._track_regression()
+
+    def mark_ready(self):
+        """Anota el fin de la inicialización diferida"""
+        self.ready_ms = self.elapsed_ms()
+        print(f"Servicios listos a los {self.ready_ms:.0f} ms del arranque")
+
+    def format_report(self) -> str:
+        lines = ["Informe de arranque (inicio y duración en ms):"]
+        for name, start, duration in self.entries:
+            lines.append(f"  {start:8.1f} {duration:8.1f}  {name}")
+        if self.first_frame_ms is not None:
+            lines.append(f"  {self.first_frame_ms:8.1f} {'':8}  Primer fotograma")
+        return "\n".join(lines)
+
+    def _load_history(self) -> List[str]:
+        """Registros de los arranques anteriores (una línea JSON por arranque)"""
+        if not self.metrics_file or not self.metrics_file.exists():
+            return []
+        with open(self.metrics_file, 'r', encoding='utf-8') as f:
+            return [line for line in f.read().splitlines() if line.strip()]
+
+    @staticmethod
+    def _first_frame_times(records: List[str]) -> List[float]:
+        times = []
+        for line in records:
+            try:
+                times.append(float(json.loads(line)['first_frame_ms']))
+            except (ValueError, KeyError, TypeError):
+                continue
+        return times
+
+    def _track_regression(self):
+        """Compara el arranque con el objetivo y con la mediana reciente, y lo guarda"""
+        try:
+            first_frame = self.first_frame_ms
+            if self.first_frame_budget_ms and first_frame > self.first_frame_budget_ms:
+                print(f"Warning: primer fotograma a los {first_frame:.0f} ms "
+                      f"(objetivo {self.first_frame_budget_ms:.0f} ms)")
+
+            if not self.metrics_file:
+                return
+            records = self._load_history()[-(self.metrics_history - 1):] if self.metrics_history > 1 else []
+            history = self._first_frame_times(records)
+            if self.regression_ratio and len(history) >= 3:
+                reference = median(history)
+                if first_frame > reference * self.regression_ratio:
+                    print(f"Warning: posible regresión de arranque: {first_frame:.0f} ms "
+                          f"frente a una mediana de {reference:.0f} ms")
+
+            self.metrics_file.parent.mkdir(parents=True, exist_ok=True)
+            record = {
+                'date': datetime.now().isoformat(timespec='seconds'),
+                'first_frame_ms': round(first_frame, 1),
+                'phases': {name: round(duration, 1) for name, _start, duration in self.entries}
+            }
+            # Solo se conservan los últimos metrics_history arranques
+            records.append(json.dumps(record))
+            with open(self.metrics_file, 'w', encoding='utf-8') as f:
+                f.write("\n".join(records) + "\n")
+
+        except Exception as e:
+            print(f"Error registrando métricas de arranque: {e}")
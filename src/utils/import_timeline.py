@@ -0,0 +1,111 @@
+"""
+Línea de tiempo de importaciones
+Tiempo propio y acumulado de cada módulo importado, como python -X importtime
+"""
+
+import sys
+import time
+import threading
+from typing import List, Tuple, Optional
+
+
+class _TimedLoader:
+    """Envoltorio del cargador real que cronometra la ejecución del módulo"""
+
+    def __init__(self, timeline: 'ImportTimeline', loader):
+        self._timeline = timeline
+        self._loader = loader
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        # El módulo ve su cargador real (get_data, recursos...)
+        module.__loader__ = self._loader
+        if module.__spec__ is not None:
+            module.__spec__.loader = self._loader
+        self._timeline._enter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._timeline._leave(module.__name__)
+
+
+class ImportTimeline:
+    """Buscador de módulos que cronometra cada importación mientras está instalado
+
+    Se coloca al principio de sys.meta_path y delega la búsqueda en los demás
+    buscadores; solo envuelve el cargador para medir exec_module(). El
+    tiempo acumulado incluye los módulos importados desde el propio módulo.
+    """
+
+    def __init__(self):
+        self._origin = time.perf_counter()
+        # (módulo, profundidad, inicio ms, propio ms, acumulado ms)
+        self.entries: List[Tuple[str, int, float, float, float]] = []
+        self._local = threading.local()
+        self.installed = False
+
+    def install(self):
+        if not self.installed:
+            sys.meta_path.insert(0, self)
+            self.installed = True
+
+    def uninstall(self):
+        if self.installed:
+            try:
+                sys.meta_path.remove(self)
+            except ValueError:
+                pass
+            self.installed = False
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self:
+                continue
+            find_spec = getattr(finder, 'find_spec', None)
+            if find_spec is None:
+                continue
+            spec = find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                    spec.loader = _TimedLoader(self, spec.loader)
+                return spec
+        return None
+
+    def _stack(self) -> list:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _enter(self):
+        # [inicio, tiempo de los módulos hijos]
+        self._stack().append([time.perf_counter(), 0.0])
+
+    def _leave(self, name: str):
+        stack = self._stack()
+        start, children = stack.pop()
+        cumulative = time.perf_counter() - start
+        if stack:
+            stack[-1][1] += cumulative
+        self.entries.append((name, len(stack), (start - self._origin) * 1000.0,
+                             (cumulative - children) * 1000.0, cumulative * 1000.0))
+
+    def total_ms(self) -> float:
+        """Tiempo total de importación (solo módulos de primer nivel)"""
+        return sum(entry[4] for entry in self.entries if entry[1] == 0)
+
+    def format_report(self, limit: Optional[int] = 20) -> str:
+        """Módulos más costosos por tiempo acumulado"""
+        entries = sorted(self.entries, key=lambda entry: entry[4], reverse=True)
+        if limit:
+            entries = entries[:limit]
+        lines = [f"Importaciones: {len(self.entries)} módulos, {self.total_ms():.1f} ms",
+                 "  propio ms | acumulado ms | módulo"]
+        for name, depth, _start, self_ms, cumulative_ms in entries:
+            lines.append(f"  {self_ms:9.1f} | {cumulative_ms:12.1f} | {'  ' * depth}{name}")
+        return "\n".join(lines)
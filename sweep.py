@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Herramienta de barrido de parámetros de programas
+Simula variantes de un programa (o el catálogo completo) en paralelo
+
+Ejemplos:
+    python sweep.py --program-id 3 --min-pressure 10:30:5 --program-duration 30:120:30
+    python sweep.py --all --seeds 0,1,2 --csv catalogo.csv
+"""
+
+import sys
+import csv
+import time
+import argparse
+from pathlib import Path
+
+
+def _parse_range(text: str):
+    """Convierte 'inicio:fin:paso' o 'a,b,c' en una especificación de rango"""
+    if ':' in text:
+        parts = [float(part) for part in text.split(':')]
+        return {'start': parts[0], 'stop': parts[1], 'step': parts[2] if len(parts) > 2 else 1}
+    return [float(part) for part in text.split(',')]
+
+
+def main():
+    """Función principal de la herramienta de barrido"""
+    project_root = Path(__file__).parent
+    sys.path.insert(0, str(project_root / "src"))
+
+    from data.repositories.program_repository import ProgramRepository
+    from business.services.sweep_service import ParameterSweepService, SWEEP_FIELDS
+    from utils.config_loader import ConfigLoader
+
+    parser = argparse.ArgumentParser(description="Barrido de parámetros de programas")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--program-id', type=int, help="Programa base del barrido")
+    target.add_argument('--all', action='store_true', help="Validar todo el catálogo activo")
+    for field_name in SWEEP_FIELDS:
+        parser.add_argument(f"--{field_name.replace('_', '-')}", dest=field_name,
+                            help="Rango inicio:fin:paso o lista a,b,c")
+    parser.add_argument('--seeds', default='0', help="Semillas separadas por comas")
+    parser.add_argument('--processes', type=int, default=None, help="Procesos (por defecto, todos los núcleos)")
+    parser.add_argument('--csv', help="Guardar resultados en un archivo CSV")
+    args = parser.parse_args()
+
+    seeds = [int(seed) for seed in args.seeds.split(',')]
+    execution_config = ConfigLoader().load_config().get('execution', {}) or {}
+    service = ParameterSweepService(args.processes, execution_config)
+    repository = ProgramRepository()
+    started = time.perf_counter()
+
+    if args.all:
+        results = service.sweep_catalog(repository.get_all_programs(), seeds)
+    else:
+        program = repository.get_program_by_id(args.program_id)
+        if not program:
+            print(f"Programa no encontrado: {args.program_id}")
+            return 1
+        ranges = {name: _parse_range(getattr(args, name)) for name in SWEEP_FIELDS
+                  if getattr(args, name)}
+        try:
+            outcome = service.sweep(program, ranges, seeds)
+        except ValueError as e:
+            print(f"Barrido no válido: {e}")
+            return 1
+        results = outcome['results']
+        for rejected in outcome['rejected']:
+            print(f"Descartada: {rejected}")
+
+    elapsed = time.perf_counter() - started
+    print(f"{len(results)} simulaciones en {elapsed:.1f} s")
+
+    columns = ['program_id', 'program_name', 'seed', *SWEEP_FIELDS, 'final_status', 'setup_seconds',
+               'red_alarm_count', 'time_in_band_ratio', 'max_pressure_exceeded']
+    print(" | ".join(columns))
+    for row in results:
+        print(" | ".join(str(row.get(column, '')) for column in columns))
+
+    if args.csv:
+        with open(args.csv, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=columns, extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(results)
+        print(f"Resultados guardados en: {args.csv}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,11 @@
+"""
+Configuración común de las pruebas
+Añade src al path de importación, igual que main.py
+"""
+
+import sys
+from pathlib import Path
+
+src_path = Path(__file__).parent.parent / "src"
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
@@ -0,0 +1,87 @@
+"""
+Pruebas del acondicionamiento de señal
+El procesado por bloques debe coincidir con el procesado muestra a muestra
+"""
+
+import random
+
+import pytest
+
+from hardware import conditioning
+from hardware.conditioning import create_filter_chain
+
+CHAIN_CONFIG = {
+    'default': [
+        {'type': 'median', 'window': 5, 'threshold': 2.0},
+        {'type': 'moving_average', 'window': 4},
+        {'type': 'ewma', 'alpha': 0.3},
+        {'type': 'kalman', 'process_variance': 0.01, 'measurement_variance': 0.25},
+        {'type': 'calibration', 'points': [[0, 0.5], [10, 10.0], [40, 41.0]], 'resolution': 256},
+    ]
+}
+
+BLOCK_SIZES = [1, 3, 7, 64, 2, 200, 5]
+
+
+def _samples(count=800, seed=3):
+    """Rampa con ruido y picos aislados"""
+    rng = random.Random(seed)
+    values = []
+    for i in range(count):
+        value = min(30.0, i * 0.05) + rng.gauss(0.0, 0.3)
+        if rng.random() < 0.03:
+            value += rng.choice((-8.0, 8.0))
+        values.append(value)
+    return values
+
+
+def _per_sample(values):
+    chain = create_filter_chain(CHAIN_CONFIG)
+    return [chain.process(value) for value in values], chain
+
+
+def _in_blocks(values):
+    chain = create_filter_chain(CHAIN_CONFIG)
+    output = []
+    start = 0
+    for size in BLOCK_SIZES * 10:
+        if start >= len(values):
+            break
+        output.extend(float(value) for value in chain.process_block(values[start:start + size]))
+        start += size
+    return output, chain
+
+
+def test_numpy_blocks_match_per_sample():
+    pytest.importorskip('numpy')
+    values = _samples()
+
+    expected, sample_chain = _per_sample(values)
+    actual, block_chain = _in_blocks(values)
+
+    assert actual == pytest.approx(expected, rel=1e-9, abs=1e-9)
+    # El estado entre bloques también coincide (picos rechazados)
+    assert block_chain.stages[0].rejected == sample_chain.stages[0].rejected > 0
+
+
+def test_python_blocks_match_per_sample(monkeypatch):
+    monkeypatch.setattr(conditioning, 'np', None)
+    values = _samples()
+
+    expected, _ = _per_sample(values)
+    actual, _ = _in_blocks(values)
+
+    assert actual == expected
+
+
+def test_empty_block_keeps_state():
+    pytest.importorskip('numpy')
+    values = _samples(50)
+
+    expected, _ = _per_sample(values)
+    chain = create_filter_chain(CHAIN_CONFIG)
+    head = list(chain.process_block(values[:20]))
+    assert len(chain.process_block([])) == 0
+    tail = list(chain.process_block(values[20:]))
+
+    assert head + tail == pytest.approx(expected, rel=1e-9, abs=1e-9)
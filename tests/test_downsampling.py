@@ -0,0 +1,48 @@
+"""
+Pruebas de la reducción de series
+Las rutas de NumPy y de Python deben elegir exactamente los mismos índices
+"""
+
+import math
+import random
+
+import pytest
+
+from business.services import downsampling
+from business.services.downsampling import lttb_indices, minmax_indices
+
+
+def _series():
+    """Series con ruido, mesetas (empates) y picos"""
+    rng = random.Random(5)
+    noisy = [math.sin(i / 40.0) * 10.0 + rng.gauss(0.0, 0.5) for i in range(5000)]
+    plateaus = [float((i // 97) % 4) for i in range(3001)]
+    spikes = [50.0 if i % 211 == 0 else 1.0 for i in range(1777)]
+    quantized = [round(rng.uniform(0.0, 3.0), 1) for _ in range(999)]
+    return [noisy, plateaus, spikes, quantized, [2.0] * 640]
+
+
+def _both(function, values, size, monkeypatch):
+    numpy_result = function(values, size)
+    with monkeypatch.context() as patch:
+        patch.setattr(downsampling, 'np', None)
+        python_result = function(values, size)
+    return numpy_result, python_result
+
+
+@pytest.mark.parametrize('threshold', [3, 4, 17, 300, 1200])
+def test_lttb_numpy_matches_python(threshold, monkeypatch):
+    pytest.importorskip('numpy')
+    for values in _series():
+        numpy_result, python_result = _both(lttb_indices, values, threshold, monkeypatch)
+        assert numpy_result == python_result
+        assert numpy_result[0] == 0 and numpy_result[-1] == len(values) - 1
+
+
+@pytest.mark.parametrize('buckets', [1, 2, 13, 150, 319])
+def test_minmax_numpy_matches_python(buckets, monkeypatch):
+    pytest.importorskip('numpy')
+    for values in _series():
+        numpy_result, python_result = _both(minmax_indices, values, buckets, monkeypatch)
+        assert numpy_result == python_result
+        assert numpy_result == sorted(set(numpy_result))
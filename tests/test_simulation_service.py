@@ -0,0 +1,48 @@
+"""
+Pruebas del servicio de simulación
+La misma semilla debe reproducir la misma ejecución
+"""
+
+from business.services.simulation_service import SimulationService
+from data.entities.program_entity import ProgramEntity
+
+PROGRAM = ProgramEntity(id=1, name="Prueba", min_pressure=10.0, max_pressure=20.0,
+                        time_to_min_pressure=2, program_duration=5)
+
+CONDITIONED_PID = {
+    'pressure_model': 'pid',
+    'control': {'measurement_noise': 0.05},
+    'conditioning': {'default': [{'type': 'median', 'window': 5, 'threshold': 2.0},
+                                 {'type': 'ewma', 'alpha': 0.3}]},
+}
+
+
+def _run(config, seed):
+    return SimulationService(config).simulate(PROGRAM, seed=seed)
+
+
+def _assert_same(first, second):
+    assert list(first.readings) == list(second.readings)
+    assert first.alarms == second.alarms
+    assert first.phases == second.phases
+    assert first.to_dict() == second.to_dict()
+
+
+def test_same_seed_same_result():
+    first = _run({}, seed=7)
+    second = _run({}, seed=7)
+
+    assert len(first.readings) > 0
+    _assert_same(first, second)
+
+
+def test_different_seed_changes_readings():
+    assert list(_run({}, seed=7).readings) != list(_run({}, seed=8).readings)
+
+
+def test_same_seed_with_controller_and_conditioning():
+    first = _run(CONDITIONED_PID, seed=11)
+    second = _run(CONDITIONED_PID, seed=11)
+
+    assert len(first.readings) > 0
+    _assert_same(first, second)